@@ -3,19 +3,25 @@
 import threading
 import logging
 from gi.repository import GObject, GLib
-from concurrent.futures import ThreadPoolExecutor
 from data_providers import scanner
+from data_providers.library_watcher import LibraryWatcher
+import database
+from utils.priority_pool import PriorityThreadPool
 class BackgroundTaskManager(GObject.Object):
     """
     A class to manage background tasks like scanning libraries.
     It uses GObject signals to communicate with the UI thread.
     """
     __gsignals__ = {
-        "scan-finished": (GObject.SignalFlags.RUN_FIRST, None, ())
+        "scan-finished": (GObject.SignalFlags.RUN_FIRST, None, ()),
+        "scan-progress": (GObject.SignalFlags.RUN_FIRST, None, (int, object)),
+        "library-updated": (GObject.SignalFlags.RUN_FIRST, None, (int,))
     }
 
     def __init__(self):
         super().__init__()
+        self._scan_lock = threading.Lock()
+        self._watcher = None
 
     def start_library_scan(self):
         """Starts the library scanning process in a new thread."""
@@ -28,17 +34,73 @@ class BackgroundTaskManager(GObject.Object):
         Scans libraries and emits a signal when done.
         """
         logging.info("Background task: Starting library scan.")
-        scanner.scan_all_libraries()
-        logging.info("Background task: Scan finished.")
+        with self._scan_lock:
+            results = scanner.scan_all_libraries(progress_callback=self._on_scan_progress)
+        logging.info(f"Background task: Scan finished ({len(results)} libraries).")
         GLib.idle_add(self.emit, "scan-finished")
+        if self._watcher:
+            GLib.idle_add(self.start_library_watch)
+
+    def _on_scan_progress(self, library_id, stats):
+        """
+        Called from the scan thread. Forwards the per-library counters
+        (seen, skipped, processed, files_per_second, ...) to the UI thread.
+        """
+        GLib.idle_add(self.emit, "scan-progress", library_id, stats)
+
+    def start_library_watch(self):
+        """
+        Starts (or refreshes) watching the library directories for changes,
+        so new, renamed and deleted files are applied without a full rescan.
+        A refresh only walks libraries that were not watched yet. Must be
+        called from the main thread.
+        """
+        if self._watcher is None:
+            self._watcher = LibraryWatcher(self._on_watched_paths_changed)
+        libraries = [dict(row) for row in database.get_all_libraries()]
+        self._watcher.watch_libraries(libraries)
+        return False
+
+    def stop_library_watch(self):
+        """Cancels every directory monitor (on window close, restart and profile switch)."""
+        if self._watcher:
+            self._watcher.stop()
+            self._watcher = None
+
+    def _on_watched_paths_changed(self, changes):
+        thread = threading.Thread(target=self._apply_watch_task, args=(changes,), daemon=True)
+        thread.start()
+
+    def _apply_watch_task(self, changes):
+        """
+        Applies coalesced filesystem changes to the affected libraries only.
+        'scan-finished' is emitted when at least one library changed, and
+        'library-updated' once for each of them.
+        """
+        affected = []
+        with self._scan_lock:
+            for library_id, (library, paths) in changes.items():
+                stats = scanner.apply_path_changes(library, paths)
+                if stats["processed"] - stats["failed"] + stats["removed"] > 0:
+                    affected.append(library_id)
+                    logging.info(f"Library watcher: applied {len(paths)} changed paths to library {library_id} in {stats['elapsed'] * 1000:.0f} ms.")
+        if affected:
+            GLib.idle_add(self._emit_library_updates, affected)
+
+    def _emit_library_updates(self, library_ids):
+        for library_id in library_ids:
+            self.emit("library-updated", library_id)
+        self.emit("scan-finished")
+        return False
 
 task_manager = BackgroundTaskManager()
 logging.info("Initializing global image download ThreadPool (max_workers=8)...")
-image_download_pool = ThreadPoolExecutor(max_workers=8, thread_name_prefix='ImagePool')
+image_download_pool = PriorityThreadPool(max_workers=8, thread_name_prefix='ImagePool')
 
 import atexit
 def shutdown_image_pool():
     logging.info("Shutting down image download ThreadPool...")
-    image_download_pool.shutdown(wait=True)
+    logging.info(f"Image download queue stats: {image_download_pool.stats()}")
+    image_download_pool.shutdown(wait=True, cancel_futures=True)
     logging.info("Image download ThreadPool shut down.")
 atexit.register(shutdown_image_pool)
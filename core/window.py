@@ -7,6 +7,7 @@ gi.require_version("Adw", "1")
 gi.require_version("Gst", "1.0")
 from gi.repository import Gtk, Adw, Gio, GLib, Pango, Gst, Gdk, GObject
 from playback.recorder import Recorder
+from playback import recorder_control
 import gettext
 import logging
 import os
@@ -20,7 +21,6 @@ import shutil
 import tempfile
 import sqlite3
 import database
-import unicodedata
 from ui.navigation_sidebar import NavigationSidebar
 from ui.bouquet_list import BouquetList
 from ui.channel_list import ChannelList
@@ -32,28 +32,15 @@ from ui.password_prompt_dialog import PasswordPromptDialog
 from ui.favorites_view import FavoritesView
 from ui.detail_view import DetailView
 from data_providers import m3u_provider, tmdb_client, xtream_client
+from data_providers.playlist_cache import LIVE
 from playback.player import Player
 from core.config import get_fallback_tmdb_key
-try:
-    from thefuzz import fuzz, process
-    logging.info("Loaded 'thefuzz' library for smart searching.")
-    FUZZ_AVAILABLE = True
-except ImportError:
-    try:
-        from fuzzywuzzy import fuzz, process
-        logging.info("Loaded fallback 'fuzzywuzzy' library for smart searching.")
-        FUZZ_AVAILABLE = True
-    except ImportError:
-        logging.warning("Smart search library ('thefuzz' or 'fuzzywuzzy') not found!")
-        logging.warning("'Fuzzy' search will be skipped for Logo/EPG/TMDb matching.")
-        logging.warning("For better results, install 'python3-thefuzz' (Debian/Ubuntu) or 'python3-fuzzywuzzy' (Fedora) package.")
-        fuzz = None
-        process = None
-        FUZZ_AVAILABLE = False
 from background import task_manager
 from background import image_download_pool
 from utils.theme_utils import get_icon_theme_folder
 from utils import title_parser
+from utils import epg_matcher
+from utils import name_normalizer
 from utils.sleep_inhibitor import SleepInhibitor
 from datetime import datetime, timezone, timedelta
 from ui.epg_detail_dialog import EPGDetailDialog
@@ -68,6 +55,7 @@ from ui.equalizer_window import EqualizerWindow
 from ui.catchup_dialog import CatchupDialog
 from ui.subtitle_results_dialog import SubtitleResultsDialog
 from utils import subtitle_searcher
+from utils import image_loader
 from data_providers import trakt_client
 from core.config import VERSION
 from ui.media_info_dialog import MediaInfoDialog
@@ -81,6 +69,7 @@ from ui.category_manager_dialog import CategoryManagerDialog
 import urllib.request
 
 _ = gettext.gettext
+EPG_LOOKAHEAD_SECONDS = 7 * 86400
 
 class MainWindow(Adw.ApplicationWindow):
     def __init__(self, profile, channels, vod, epg_data, **kwargs):
@@ -101,6 +90,7 @@ class MainWindow(Adw.ApplicationWindow):
         self.subtitle_delay_ms = 0
         self.all_channels_map = {}
         self.active_recorder = None
+        self.daemon_recording = None
         self.current_playing_channel_data = None
         self.slider_visibility_determined = False
         self.slider_check_attempts = 0
@@ -142,15 +132,19 @@ class MainWindow(Adw.ApplicationWindow):
         self.logo_map = self._build_logo_map(self.icon_path)
         self.bouquets_data = channels
         self.vod_data = vod
+        playlist = getattr(channels, "cache", None)
+        if playlist is not None:
+            self.all_channels_map = playlist.url_map()
         self.epg_data = epg_data
         self.trakt_watched_movies = set()
         self.trakt_watched_episodes = set()
-        logging.info(f"Converting EPG data ({len(epg_data)} channels) to clean key map...")
-        self.epg_clean_map = {self._clean_key(epg_id): programs for epg_id, programs in epg_data.items() if self._clean_key(epg_id)}
-        logging.info(f"EPG clean key map created ({len(self.epg_clean_map)} unique keys).")
-        logging.debug(f"MainWindow received EPG data for {len(self.epg_data)} channels.")
+        epg_channel_ids = epg_data.get_channel_ids() if epg_data else []
+        self.epg_matcher = epg_matcher.EpgMatcher(epg_channel_ids)
+        self.epg_channel_map = {}
+        logging.info(f"EPG matcher prepared for {len(epg_channel_ids)} channels ({len(self.epg_matcher.clean_map)} unique keys).")
         self.connect("destroy", self.on_destroy)
         task_manager.connect("scan-finished", self.on_scan_finished)
+        task_manager.start_library_watch()
         self.header = Adw.HeaderBar()
         self.header.set_show_start_title_buttons(False)
         self.header.set_decoration_layout(":minimize,maximize,close")
@@ -255,6 +249,30 @@ class MainWindow(Adw.ApplicationWindow):
         duration_spin.set_valign(Gtk.Align.CENTER)
         duration_row.add_suffix(duration_spin)
         notif_list.append(duration_row)
+        popover_box.append(Gtk.Label(label=_("Recording"), css_classes=["caption-heading"], xalign=0, margin_start=6, margin_top=6))
+        recording_list = Gtk.ListBox(); recording_list.add_css_class("boxed-list")
+        popover_box.append(recording_list)
+        max_total_row = Adw.ActionRow(title=_("Simultaneous Recordings"), subtitle=_("0 = no limit"))
+        max_total_spin = Gtk.SpinButton.new_with_range(0, 16, 1)
+        max_total_spin.set_value(database.get_max_concurrent_recordings())
+        max_total_spin.connect("value-changed", self._on_recording_limit_changed, 'max_concurrent_recordings')
+        max_total_spin.set_valign(Gtk.Align.CENTER)
+        max_total_row.add_suffix(max_total_spin)
+        recording_list.append(max_total_row)
+        max_host_row = Adw.ActionRow(title=_("Recordings per Provider"), subtitle=_("0 = no limit"))
+        max_host_spin = Gtk.SpinButton.new_with_range(0, 8, 1)
+        max_host_spin.set_value(database.get_max_recordings_per_host())
+        max_host_spin.connect("value-changed", self._on_recording_limit_changed, 'max_recordings_per_host')
+        max_host_spin.set_valign(Gtk.Align.CENTER)
+        max_host_row.add_suffix(max_host_spin)
+        recording_list.append(max_host_row)
+        instant_hours_row = Adw.ActionRow(title=_("Record Button Length (Hours)"), subtitle=_("Can be extended from the scheduler"))
+        instant_hours_spin = Gtk.SpinButton.new_with_range(1, 24, 1)
+        instant_hours_spin.set_value(database.get_instant_recording_hours())
+        instant_hours_spin.connect("value-changed", self._on_instant_recording_hours_changed)
+        instant_hours_spin.set_valign(Gtk.Align.CENTER)
+        instant_hours_row.add_suffix(instant_hours_spin)
+        recording_list.append(instant_hours_row)
         popover_box.append(Gtk.Label(label=_("System"), css_classes=["caption-heading"], xalign=0, margin_start=6, margin_top=6))
         system_list = Gtk.ListBox(); system_list.add_css_class("boxed-list")
         popover_box.append(system_list)       
@@ -477,8 +495,8 @@ class MainWindow(Adw.ApplicationWindow):
         self.subtitle_manager = SubtitleManager(self.player, self.video_view.subtitle_label)
         self.bouquet_list.bouquet_listbox.connect("row-activated", self.on_bouquet_selected)
         self.vod_category_list.bouquet_listbox.connect("row-activated", self.on_vod_category_selected)
-        self.channel_list.channel_listbox.connect("row-activated", self.on_channel_selected)
-        self.favorites_view.get_favorite_channels_list_widget().connect("row-activated", self.on_channel_selected)
+        self.channel_list.connect("channel-activated", self.on_channel_selected)
+        self.favorites_view.get_favorite_channels_list_widget().connect("channel-activated", self.on_channel_selected)
         self.favorites_view.connect("favorites-changed", self.on_favorites_changed)
         self.collection_grid_view.connect("collection-right-clicked", self.on_collection_item_right_clicked)
         self.media_grid_view.connect("item-right-clicked", self.on_media_item_right_clicked)
@@ -540,9 +558,11 @@ class MainWindow(Adw.ApplicationWindow):
         GLib.timeout_add(200, self._update_stream_info)
         thread = threading.Thread(target=self._process_data_thread, daemon=True)
         thread.start()
+        if self.epg_data:
+            threading.Thread(target=self._resolve_epg_channels_thread, daemon=True).start()
         self.video_view.connect("video-area-clicked", self._on_video_area_clicked)
         self.video_view.fullscreen_channel_list.connect("back-clicked", self.on_fullscreen_back_clicked)
-        self.video_view.fullscreen_channel_list.channel_listbox.connect("row-activated", self.on_fullscreen_list_item_activated)
+        self.video_view.fullscreen_channel_list.connect("channel-activated", self.on_fullscreen_list_item_activated)
         key_controller = Gtk.EventControllerKey()
         key_controller.set_propagation_phase(Gtk.PropagationPhase.CAPTURE)
         key_controller.connect("key-pressed", self._on_key_pressed)
@@ -1318,15 +1338,46 @@ class MainWindow(Adw.ApplicationWindow):
 
     def _process_data_thread(self):
         logging.info("Starting to process channel and VOD data in background...")
-        if self.bouquets_data:
+        if isinstance(self.all_channels_map, dict) and self.bouquets_data:
             for bouquet in self.bouquets_data.values():
                 for channel in bouquet: self.all_channels_map[channel['url']] = channel
-        if self.vod_data:
+        if isinstance(self.all_channels_map, dict) and self.vod_data:
             for category in self.vod_data.values():
                  for item in category: self.all_channels_map[item['url']] = item
         logging.info("Data processing finished. Updating UI.")
         GLib.idle_add(self._on_data_processed)
 
+    def _iter_live_channels(self):
+        playlist = getattr(self.bouquets_data, "cache", None)
+        if playlist is not None:
+            yield from playlist.iter_channels(LIVE)
+        elif self.bouquets_data:
+            for bouquet in self.bouquets_data.values():
+                yield from bouquet
+
+    def _resolve_epg_channels_thread(self):
+        """
+        Resolves every live channel to its EPG channel ID once per profile load.
+        Results are persisted in the profile database and reused until the
+        EPG store is rebuilt.
+        """
+        signature = self.epg_data.signature
+        channel_map = database.get_epg_channel_map(signature)
+        logging.info(f"Loaded {len(channel_map)} persisted EPG channel mappings.")
+        search_keys = (epg_matcher.channel_search_key(channel) for channel in self._iter_live_channels())
+        resolved = self.epg_matcher.resolve_all((key for key in search_keys if key), known=channel_map)
+        if resolved:
+            database.save_epg_channel_map(signature, resolved)
+            channel_map.update(resolved)
+        GLib.idle_add(self._on_epg_channels_resolved, channel_map)
+
+    def _on_epg_channels_resolved(self, channel_map):
+        self.epg_channel_map.update(channel_map)
+        self._failed_active_epg_searches.clear()
+        for channel_list in (self.channel_list, self.favorites_view.favorite_channels_list, self.video_view.fullscreen_channel_list):
+            channel_list.refresh_epg()
+        return False
+
     def _on_data_processed(self):
         logging.info("Populating UI with pre-loaded data...")
         hidden_bouquets = database.get_hidden_bouquets()       
@@ -1696,25 +1747,74 @@ class MainWindow(Adw.ApplicationWindow):
         if self.is_stopping_recording:
             logging.warning("Recording is already being stopped, no new action.")
             return
-        if self.active_recorder:
+        if self.active_recorder or self.daemon_recording:
             logging.info("Stop recording request received...")
             self.is_stopping_recording = True
-            record_button = self.video_view.controls.buttons.get("record")
-            if record_button:
-                record_button.set_sensitive(False)
+            self._set_record_button_sensitive(False)
             self.show_toast(_("Stopping recording... Saving file."))
-            recorder_to_stop = self.active_recorder
-            stop_thread = threading.Thread(
-                 target=recorder_to_stop.stop,
-                args=(self._on_recording_stopped,)
-            )
+            if self.daemon_recording:
+                stop_thread = threading.Thread(
+                    target=self._stop_daemon_recording_thread,
+                    args=self.daemon_recording,
+                    daemon=True
+                )
+            else:
+                recorder_to_stop = self.active_recorder
+                stop_thread = threading.Thread(
+                     target=recorder_to_stop.stop,
+                    args=(self._on_recording_stopped,)
+                )
             stop_thread.start()
             return
         if not self.current_playing_channel_data:
             self.show_toast(_("No channel found to record!"))
             return
-        channel_name = self.current_playing_channel_data.get("name", "recording").replace(" ", "_").replace("/", "-")
-        channel_url = self.current_playing_channel_data.get("url")
+        self._set_record_button_sensitive(False)
+        channel_data = self.current_playing_channel_data
+        threading.Thread(
+            target=self._start_daemon_recording_thread,
+            args=(database.CURRENT_PROFILE_DB_FILE, self.profile_data['id'], channel_data),
+            daemon=True
+        ).start()
+
+    def _set_record_button_sensitive(self, sensitive):
+        record_button = self.video_view.controls.buttons.get("record")
+        if record_button:
+            record_button.set_sensitive(sensitive)
+
+    def _start_daemon_recording_thread(self, profile_db, profile_id, channel_data):
+        """
+        Asks the recorder daemon to record the channel. The recording is not
+        stopped when the player is closed; it can be stopped from the
+        scheduler window. The daemon needs an end time, so the recording runs
+        for the "Record Button Length" setting unless it is extended there.
+        """
+        end_time = int(time.time()) + database.get_instant_recording_hours() * 3600
+        info = recorder_control.start_recording_now(
+            profile_db, profile_id, channel_data.get("name", "recording"), channel_data.get("url"), end_time
+        )
+        GLib.idle_add(self._on_daemon_recording_started, profile_db, channel_data, info)
+
+    def _on_daemon_recording_started(self, profile_db, channel_data, info):
+        self._set_record_button_sensitive(True)
+        if info and info.get("status") != "recording":
+            logging.warning(f"Recorder daemon refused the recording: {info.get('status_detail')}")
+            self.show_toast(_("Recording not started: {}").format(info.get("status_detail")))
+            return False
+        if info:
+            self.daemon_recording = (profile_db, info["id"])
+            logging.info(f"Recording started by the recorder daemon (ID: {info['id']}): {info['output_path']}")
+            self.show_toast(_("Recording started: {} (stops at {} unless extended)").format(
+                os.path.basename(info["output_path"]), datetime.fromtimestamp(info["end_time"]).strftime("%H:%M")))
+            self.video_view.controls.set_recording_state(True)
+            return False
+        logging.info("Recorder daemon not available, recording in the player process.")
+        self._start_local_recording(channel_data)
+        return False
+
+    def _start_local_recording(self, channel_data):
+        channel_name = channel_data.get("name", "recording").replace(" ", "_").replace("/", "-")
+        channel_url = channel_data.get("url")
         recordings_dir = database.get_recordings_path()
         os.makedirs(recordings_dir, exist_ok=True)
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -1729,6 +1829,11 @@ class MainWindow(Adw.ApplicationWindow):
             logging.error(f"Could not start recording: {e}")
             self.show_toast(_("Error: Could not start recording!"))
             self.active_recorder = None
+
+    def _stop_daemon_recording_thread(self, profile_db, job_id):
+        final_status = recorder_control.stop_recording(profile_db, job_id)
+        logging.info(f"Recorder daemon stopped recording {job_id}. Final Status: {final_status}")
+        GLib.idle_add(self._on_recording_stopped)
             
     def on_info_button_clicked(self, button):
         """Opens the technical information dialog for the current stream."""
@@ -1749,6 +1854,8 @@ class MainWindow(Adw.ApplicationWindow):
             return
         channel_id = self.current_playing_channel_data.get("tvg-id")
         archive_days = self.current_channel_archive_duration
+        if channel_id:
+            channel_id = self.resolve_epg_channel_id(channel_id) or channel_id
         if not channel_id:
             logging.error("Channel tvg-id not found for catch-up!")
             self.show_toast(
@@ -1760,7 +1867,7 @@ class MainWindow(Adw.ApplicationWindow):
             parent=self,
             channel_id=channel_id,
             archive_duration_days=archive_days,
-            all_epg_data=self.epg_data
+            epg_store=self.epg_data
         )
         dialog.connect('program-selected', self.on_catchup_program_selected)
         dialog.present()
@@ -2096,13 +2203,11 @@ class MainWindow(Adw.ApplicationWindow):
 
     def on_open_scheduler_clicked(self, button):
         logging.info("Opening recording scheduler window.")
-        live_channels = {
-            url: data for url, data in self.all_channels_map.items()
-            if not any(url.lower().endswith(ext) for ext in ['.mkv', '.mp4', '.avi'])
-        }
         dialog = SchedulerWindow(self, self.bouquets_data)
         dialog.connect("schedule-saved", self.on_schedule_saved)
         dialog.connect("schedule-deleted", self.on_schedule_deleted)
+        dialog.connect("recording-stop-requested", self.on_schedule_stop_requested)
+        dialog.connect("recording-extend-requested", self.on_schedule_extend_requested)
         dialog.present()
 
     def on_schedule_saved(self, dialog, profile_id, channel_name, channel_url, start_time, end_time, program_name):
@@ -2110,16 +2215,81 @@ class MainWindow(Adw.ApplicationWindow):
             profile_id, channel_name, channel_url, start_time, end_time, program_name
         )
         if success:
+            recorder_control.notify_schedule_changed()
             self.show_toast(_("Recording scheduled successfully!"))
             dialog.refresh_tasks_list()
         else:
             self.show_toast(_("Error: Could not schedule recording."))
             
     def on_schedule_deleted(self, window, task_id):
+        if any(job['id'] == task_id for job in database.get_active_recordings()):
+            threading.Thread(
+                target=self._stop_scheduled_recording_thread,
+                args=(window, database.CURRENT_PROFILE_DB_FILE, task_id, True),
+                daemon=True
+            ).start()
+            return
         database.delete_scheduled_recording(task_id)
+        recorder_control.notify_schedule_changed()
         self.show_toast(_("Scheduled recording deleted."))
         window.refresh_tasks_list()
 
+    def on_schedule_stop_requested(self, window, task_id):
+        self.show_toast(_("Stopping recording... Saving file."))
+        threading.Thread(
+            target=self._stop_scheduled_recording_thread,
+            args=(window, database.CURRENT_PROFILE_DB_FILE, task_id, False),
+            daemon=True
+        ).start()
+
+    def _stop_scheduled_recording_thread(self, window, profile_db, task_id, delete_after):
+        final_status = recorder_control.stop_recording(profile_db, task_id)
+        GLib.idle_add(self._on_scheduled_recording_stopped, window, profile_db, task_id, final_status, delete_after)
+
+    def _on_scheduled_recording_stopped(self, window, profile_db, task_id, final_status, delete_after):
+        if self.daemon_recording == (profile_db, task_id):
+            self._on_recording_stopped()
+        if delete_after:
+            database.delete_scheduled_recording(task_id)
+            recorder_control.notify_schedule_changed()
+            self.show_toast(_("Scheduled recording deleted."))
+        elif final_status == 'completed':
+            self.show_toast(_("Recording stopped."))
+        else:
+            self.show_toast(_("Error: Could not stop recording!"))
+        window.refresh_tasks_list()
+        return False
+
+    def on_schedule_extend_requested(self, window, task_id, end_time):
+        threading.Thread(
+            target=self._extend_scheduled_recording_thread,
+            args=(window, database.CURRENT_PROFILE_DB_FILE, task_id, end_time),
+            daemon=True
+        ).start()
+
+    def _extend_scheduled_recording_thread(self, window, profile_db, task_id, end_time):
+        try:
+            recorder_control.extend_recording(profile_db, task_id, end_time)
+            error = None
+        except (recorder_control.RecorderUnavailableError, recorder_control.RecorderCallError) as e:
+            error = e
+        GLib.idle_add(self._on_scheduled_recording_extended, window, profile_db, task_id, end_time, error)
+
+    def _on_scheduled_recording_extended(self, window, profile_db, task_id, end_time, error):
+        # Only write the row directly when no daemon is running to check the new end time.
+        if isinstance(error, recorder_control.RecorderUnavailableError) and \
+                profile_db == database.CURRENT_PROFILE_DB_FILE and \
+                database.update_recording_end_time(task_id, end_time):
+            error = None
+        if error is None:
+            self.show_toast(_("Recording extended until {}").format(datetime.fromtimestamp(end_time).strftime('%H:%M')))
+        elif isinstance(error, recorder_control.RecorderCallError):
+            self.show_toast(_("Error: Could not extend recording: {}").format(error))
+        else:
+            self.show_toast(_("Error: Could not extend recording."))
+        window.refresh_tasks_list()
+        return False
+
     def on_subtitle_toggled(self, dialog, is_active):
         database.set_config_value('subtitles_enabled_global', '1' if is_active else '0')
         if is_active and self.is_external_subtitle_active:
@@ -2253,75 +2423,19 @@ class MainWindow(Adw.ApplicationWindow):
                 database.set_config_value('preferred_subtitle_lang', t['name'])
                 break
                 
-    def _check_digits_match(self, str1, str2):
-        d1 = "".join(re.findall(r'\d', str1))
-        d2 = "".join(re.findall(r'\d', str2))
-        return d1 == d2  
-        
-    def _check_country_match(self, key1, key2):
-        if "." in key1 and "." in key2:
-            return key1.split(".")[-1] == key2.split(".")[-1]
-        if "." in key2:
-            epg_suffix = key2.split(".")[-1].lower()
-            if 2 <= len(epg_suffix) <= 3:
-                channel_prefix = key1[:len(epg_suffix)].lower()               
-                if channel_prefix != epg_suffix:
-                    common_iso_codes = [
-                        "tr", "us", "uk", "fr", "de", "it", "es", "pt", "nl", "be", 
-                        "ru", "gr", "az", "de", "ch", "at", "pl", "ro", "bg", "hu", 
-                        "cz", "sk", "al", "rs", "hr", "ba", "mk", "se", "no", "dk", 
-                        "fi", "ie", "ca", "au", "nz", "br", "ar", "mx", "ae", "sa", 
-                        "eg", "in", "cn", "jp", "kr", "za",
-                        "tur", "usa", "gbr", "fra", "deu", "ita", "esp", "prt", "nld", "bel",
-                        "rus", "grc", "aze", "che", "aut", "pol", "rou", "bgr", "hun", "cze",
-                        "svk", "alb", "srb", "hrv", "bih", "mkd", "swe", "nor", "dnk", "fin",
-                        "irl", "can", "aus", "nzl", "bra", "arg", "mex", "are", "sau", "egy"
-                    ]
-                    if channel_prefix in common_iso_codes:
-                        return False               
-        return True                   
-
-    def _find_epg_data_for_channel(self, provider_tvg_id):
+    def resolve_epg_channel_id(self, search_key):
         """
-        Performs a 4-step (direct, clean, fuzzy) search in the EPG data
-        using the provider's TVG-ID.
+        Returns the EPG channel ID for a channel search key. The table built
+        after profile load answers most lookups; misses are resolved once
+        and remembered.
         """
-        if not provider_tvg_id:
+        if not search_key or not self.epg_data:
             return None
-        if provider_tvg_id in self.epg_data:
-            logging.debug(f"EPG Found (Step 1: Direct): '{provider_tvg_id}'")
-            return self.epg_data[provider_tvg_id]
-        clean_key = self._clean_key(provider_tvg_id)
-        if not clean_key:
-            return None          
-        if clean_key in self.epg_clean_map:
-            logging.debug(f"EPG Found (Step 2: Clean Key): '{provider_tvg_id}' -> '{clean_key}'")
-            return self.epg_clean_map[clean_key]
-        if FUZZ_AVAILABLE and process:
-            if not self.epg_clean_map:
-                logging.debug("Fuzzy EPG search skipped (EPG map is empty).")
-            else:
-                best_match_tuple = process.extractOne(clean_key, self.epg_clean_map.keys())
-                if best_match_tuple:
-                    best_match, score = best_match_tuple
-                    if score >= 80 and \
-                       self._check_digits_match(clean_key, best_match) and \
-                       self._check_country_match(clean_key, best_match):
-                        len1, len2 = len(clean_key), len(best_match)
-                        ratio = max(len1, len2) / min(len1, len2) if min(len1, len2) > 0 else 0
-                        first_char_match = clean_key[0] == best_match[0] if clean_key and best_match else False                       
-                        if ratio <= 2.0 and first_char_match:
-                            logging.debug(f"EPG Found (Step 3: Fuzzy %{score}): '{provider_tvg_id}' -> '{best_match}'")
-                            return self.epg_clean_map[best_match]
-                        else:
-                            reject_reason = "Ratio" if ratio > 2.0 else "First Char"
-                            logging.debug(f"EPG Rejected ({reject_reason}): '{clean_key}' vs '{best_match}' (Ratio: {ratio:.2f})")
-                soft_key = clean_key.replace("tv.", ".")
-                if soft_key in self.epg_clean_map:
-                    logging.debug(f"EPG Found (Step 3.5: Soft Match): '{provider_tvg_id}' as '{soft_key}'")
-                    return self.epg_clean_map[soft_key]
-        logging.debug(f"EPG Not Found (Step 4): No match for '{provider_tvg_id}'.")
-        return None
+        if search_key in self.epg_channel_map:
+            return self.epg_channel_map[search_key]
+        epg_channel_id = self.epg_matcher.resolve(search_key)
+        self.epg_channel_map[search_key] = epg_channel_id
+        return epg_channel_id
 
     def _update_epg_for_channel(self, channel_data):
         if not channel_data:
@@ -2348,27 +2462,22 @@ class MainWindow(Adw.ApplicationWindow):
             logging.debug("EPG Search: All identification tags are empty! Skipping.")
             self.video_view.update_epg([])
             return
-        channel_programs = self._find_epg_data_for_channel(search_key)       
+        epg_channel_id = self.resolve_epg_channel_id(search_key)
+        now_ts = int(time.time())
+        channel_programs = self.epg_data.get_programs(epg_channel_id, now_ts, now_ts + EPG_LOOKAHEAD_SECONDS, limit=10) if epg_channel_id else []
         if not channel_programs:
             self._failed_active_epg_searches.add(search_key) 
             self.video_view.update_epg([])
             return
         programs_to_display = []
-        now = datetime.now(timezone.utc)
         found_current = False
-        program_count = 0
         for program in channel_programs:
-            if program["stop"] < now:
-                continue          
             is_current = False
-            if not found_current and program["start"] <= now < program["stop"]:
+            if not found_current and program["start_ts"] <= now_ts < program["stop_ts"]:
                 is_current = True
                 found_current = True
                 self.current_epg_program = program          
             programs_to_display.append({"data": program, "is_current": is_current})
-            program_count += 1
-            if program_count >= 10:
-                break
         self.video_view.update_epg(programs_to_display)
 
     def _update_player_ui_for_media_type(self, media_type):
@@ -2971,18 +3080,15 @@ class MainWindow(Adw.ApplicationWindow):
         self._play_channel(channel_data, correct_logo) 
         
     def _sync_fullscreen_list_selection(self, playing_url):
-        listbox = self.video_view.fullscreen_channel_list.channel_listbox
-        row = listbox.get_first_child()       
-        while row:
-            if hasattr(row, 'channel_data') and row.channel_data.get('url') == playing_url:
-                listbox.select_row(row)
-                row.grab_focus() 
-                break
-            row = row.get_next_sibling() 
+        self.video_view.fullscreen_channel_list.select_channel(
+            lambda channel_data: channel_data.get('url') == playing_url, grab_focus=True
+        )
             
     def _find_bouquet_name_by_url(self, url):
         if not self.bouquets_data:
             return None
+        if hasattr(self.bouquets_data, "bouquet_name_for_url"):
+            return self.bouquets_data.bouquet_name_for_url(url)
         for bouquet_name, channels in self.bouquets_data.items():
             for channel in channels:
                 if channel.get('url') == url:
@@ -2993,29 +3099,24 @@ class MainWindow(Adw.ApplicationWindow):
         active_sidebar = self.sidebar.list_stack.get_visible_child_name()      
         if active_sidebar not in ["iptv", "favorites"]:
             return
-        target_listbox = None
+        target_list = None
         if active_sidebar == "iptv":
-            target_listbox = self.channel_list.channel_listbox
+            target_list = self.channel_list
             if hasattr(self.channel_list, 'search_entry'):
                 self.channel_list.search_entry.set_text("")              
         elif active_sidebar == "favorites":
-            target_listbox = self.favorites_view.get_favorite_channels_list_widget()
+            target_list = self.favorites_view.get_favorite_channels_list_widget()
             if hasattr(self.favorites_view, 'fav_list_search_entry'):
                 self.favorites_view.fav_list_search_entry.set_text("")
             if hasattr(self.favorites_view, 'favorite_channels_list') and hasattr(self.favorites_view.favorite_channels_list, 'search_entry'):
                 self.favorites_view.favorite_channels_list.search_entry.set_text("")
-        if not target_listbox:
+        if not target_list:
+            return
+        if target_list.select_channel(
+            lambda channel_data: channel_data.get('url') == playing_url,
+            grab_focus=not self.is_immersive_fullscreen
+        ):
             return
-        row = target_listbox.get_first_child()
-        while row:
-            if hasattr(row, 'channel_data'):
-                row_url = row.channel_data.get('url')
-                if row_url == playing_url:
-                    target_listbox.select_row(row)
-                    if not self.is_immersive_fullscreen:
-                        row.grab_focus()
-                    return 
-            row = row.get_next_sibling()
         if active_sidebar == "iptv":
             found_bouquet = self._find_bouquet_name_by_url(playing_url)
             if found_bouquet:
@@ -3043,25 +3144,20 @@ class MainWindow(Adw.ApplicationWindow):
                     row = row.get_next_sibling()
 
     def _sync_sidebar_list_selection_delayed(self, playing_url, attempt):
-        target_listbox = None
+        target_list = None
         active_sidebar = self.sidebar.list_stack.get_visible_child_name()      
         if active_sidebar == "iptv":
-            target_listbox = self.channel_list.channel_listbox
+            target_list = self.channel_list
         elif active_sidebar == "favorites":
-            target_listbox = self.favorites_view.get_favorite_channels_list_widget()          
-        if not target_listbox:
+            target_list = self.favorites_view.get_favorite_channels_list_widget()          
+        if not target_list:
             return False
-        row = target_listbox.get_first_child()
         target_url_clean = playing_url.strip()
-        while row:
-            if hasattr(row, 'channel_data'):
-                raw_url = row.channel_data.get('url', '')
-                if raw_url.strip() == target_url_clean:
-                    target_listbox.select_row(row)
-                    if not self.is_immersive_fullscreen:
-                        row.grab_focus()
-                    return False
-            row = row.get_next_sibling()
+        if target_list.select_channel(
+            lambda channel_data: channel_data.get('url', '').strip() == target_url_clean,
+            grab_focus=not self.is_immersive_fullscreen
+        ):
+            return False
         if attempt < 10:
             GLib.timeout_add(500, lambda: self._sync_sidebar_list_selection_delayed(playing_url, attempt + 1))          
         return False                 
@@ -3070,6 +3166,7 @@ class MainWindow(Adw.ApplicationWindow):
         self.player.set_volume(scale.get_value())
 
     def on_destroy(self, widget):
+        task_manager.stop_library_watch()
         self._hide_next_episode_prompt()
         if self.active_recorder:
             self.active_recorder.stop()
@@ -3278,6 +3375,7 @@ class MainWindow(Adw.ApplicationWindow):
         """Called (on main thread) when the recording stop process (background) is finished."""
         logging.info("Recording stop process finished. Updating UI.")
         self.active_recorder = None
+        self.daemon_recording = None
         self.is_stopping_recording = False
         record_button = self.video_view.controls.buttons.get("record")
         if record_button:
@@ -3305,28 +3403,18 @@ class MainWindow(Adw.ApplicationWindow):
         else:
             scale.set_value(self.last_volume_before_mute)
 
+    def _get_active_channel_list(self):
+        if self.is_immersive_fullscreen and hasattr(self.video_view, 'fullscreen_channel_list'):
+            return self.video_view.fullscreen_channel_list
+        if self.sidebar.list_stack.get_visible_child_name() == "favorites":
+            return self.favorites_view.get_favorite_channels_list_widget()
+        return self.channel_list
+
     def _play_next_channel(self):
         """Plays the next channel in the current list."""
-        if self.is_immersive_fullscreen and hasattr(self.video_view, 'fullscreen_channel_list'):
-            active_listbox = self.video_view.fullscreen_channel_list.channel_listbox
-        else:
-            active_listbox = self.channel_list.channel_listbox
-            if self.sidebar.list_stack.get_visible_child_name() == "favorites":
-                 active_listbox = self.favorites_view.get_favorite_channels_list_widget()
-        selected_row = active_listbox.get_selected_row()
-        if not selected_row: return
-        current_index = selected_row.get_index()
-        total_items = 0
-        current_row = active_listbox.get_first_child()
-        while current_row:
-            total_items += 1
-            current_row = current_row.get_next_sibling()
-        if total_items == 0: return
-        next_index = (current_index + 1) % total_items
-        next_row = active_listbox.get_row_at_index(next_index)
-        if next_row:
-            active_listbox.select_row(next_row)
-            channel_data = getattr(next_row, 'channel_data', None)
+        next_item = self._get_active_channel_list().select_relative(1)
+        if next_item:
+            channel_data = getattr(next_item, 'channel_data', None)
             if channel_data:
                  self._play_channel(channel_data)
             else:
@@ -3334,26 +3422,9 @@ class MainWindow(Adw.ApplicationWindow):
 
     def _play_previous_channel(self):
         """Plays the previous channel in the current list."""
-        if self.is_immersive_fullscreen and hasattr(self.video_view, 'fullscreen_channel_list'):
-            active_listbox = self.video_view.fullscreen_channel_list.channel_listbox
-        else:
-            active_listbox = self.channel_list.channel_listbox
-            if self.sidebar.list_stack.get_visible_child_name() == "favorites":
-                active_listbox = self.favorites_view.get_favorite_channels_list_widget()
-        selected_row = active_listbox.get_selected_row()
-        if not selected_row: return
-        current_index = selected_row.get_index()
-        total_items = 0
-        current_row = active_listbox.get_first_child()
-        while current_row:
-            total_items += 1
-            current_row = current_row.get_next_sibling()
-        if total_items == 0: return
-        prev_index = (current_index - 1 + total_items) % total_items
-        prev_row = active_listbox.get_row_at_index(prev_index)
-        if prev_row:
-            active_listbox.select_row(prev_row)
-            channel_data = getattr(prev_row, 'channel_data', None)
+        prev_item = self._get_active_channel_list().select_relative(-1)
+        if prev_item:
+            channel_data = getattr(prev_item, 'channel_data', None)
             if channel_data:
                 self._play_channel(channel_data)
             else:
@@ -3403,6 +3474,7 @@ class MainWindow(Adw.ApplicationWindow):
         if os.path.isdir(cache_dir):
             try:
                 shutil.rmtree(cache_dir)
+                image_loader.reset_caches()
                 logging.info(f"Cache folder successfully deleted: {cache_dir}")
                 self.show_toast(
                     _("Cache cleared successfully!")
@@ -3673,6 +3745,7 @@ class MainWindow(Adw.ApplicationWindow):
         (Background Thread) Physically moves the cache folder.
         """
         try:
+            image_loader.reset_caches(flush=True)
             shutil.move(old_path, new_path)
             GLib.idle_add(self._on_move_cache_success, new_path)
         except Exception as e:
@@ -4019,6 +4092,7 @@ class MainWindow(Adw.ApplicationWindow):
             logging.info(f"User confirmed library removal (ID: {library_id})...")
             if database.delete_library(library_id):
                 self.show_toast(_("Library successfully removed."))
+                task_manager.start_library_watch()
                 active_button_key = self.media_sidebar.buttons["videos"]
                 for key, btn in self.media_sidebar.buttons.items():
                     if btn.has_css_class("active-nav-button"):
@@ -4150,35 +4224,6 @@ class MainWindow(Adw.ApplicationWindow):
                 logging.error(f"Error while removing recording from list: {e}")
                 self.show_toast(_("Error: Recording was not removed from list."))
 
-    def _clean_key(self, text):
-        if not text:
-            return None
-        name = text.lower().strip()
-        match = re.match(r'^([a-z]{2,3})[| \-_]+(.*)', name)
-        if match:
-            lang_code = match.group(1)
-            rest_of_name = match.group(2)
-            common_codes = [
-                "tr", "us", "uk", "fr", "de", "it", "es", "pt", "nl", "be", 
-                "ru", "gr", "az", "ch", "at", "pl", "ro", "bg", "hu", "cz", 
-                "sk", "al", "rs", "hr", "ba", "mk", "se", "no", "dk", "fi", 
-                "ie", "ca", "au", "nz", "br", "ar", "mx", "ae", "sa", "eg",
-                "tur", "usa", "gbr", "fra", "deu", "ita", "esp", "prt", "nld", "bel",
-                "rus", "grc", "aze", "che", "aut", "pol", "rou", "bgr", "hun", "cze"
-            ]           
-            if lang_code in common_codes:
-                name = f"{rest_of_name}.{lang_code}"
-        try:
-            name = unicodedata.normalize("NFKD", name)
-            name = "".join([c for c in name if not unicodedata.combining(c)])
-        except Exception:
-             pass
-        name = re.sub(r'(\(.*\))|(\[.*?\])|(".*?")|(\=.*)', ' ', name)
-        name = re.sub(r'\b(HD|FHD|UHD|4K|8K|SD)\b', ' ', name, flags=re.IGNORECASE)
-        name = re.sub(r'[^\w\d\s.]+', ' ', name)
-        name = re.sub(r'\s+', '', name)       
-        return name.strip().lower()
-
     def _build_logo_map(self, folder_path):
         if not folder_path or not os.path.isdir(folder_path):
             logging.warning(f"Could not build logo map: Invalid folder path: {folder_path}")
@@ -4191,7 +4236,7 @@ class MainWindow(Adw.ApplicationWindow):
                     if not filename.lower().endswith(('.png', '.svg')):
                         continue
                     name_raw = os.path.splitext(filename)[0]
-                    clean_name_key = self._clean_key(name_raw)
+                    clean_name_key = name_normalizer.clean_key(name_raw)
                     if clean_name_key:
                         full_path = os.path.join(root, filename)
                         if clean_name_key not in logo_map:
@@ -4275,6 +4320,13 @@ class MainWindow(Adw.ApplicationWindow):
         seconds = int(spin_button.get_value())
         database.set_config_value('notification_timeout', str(seconds))
 
+    def _on_instant_recording_hours_changed(self, spin_button):
+        database.set_config_value('instant_recording_hours', str(int(spin_button.get_value())))
+
+    def _on_recording_limit_changed(self, spin_button, config_key):
+        database.set_config_value(config_key, str(int(spin_button.get_value())))
+        recorder_control.notify_schedule_changed()
+
     def on_media_item_watched_toggled(self, grid_view, item, is_watched):
         path_or_id = item.props.path_or_url
         if not path_or_id: return
@@ -4783,7 +4835,7 @@ class MainWindow(Adw.ApplicationWindow):
                 })         
             display_items = sorted(visible_bouquets, key=lambda x: x['name'])           
         target_list.populate_channels_async(display_items)
-        target_list.channel_listbox.grab_focus()      
+        target_list.channel_view.grab_focus()      
         if not hasattr(self, 'last_fullscreen_category_id') or not self.last_fullscreen_category_id:           
             if is_favorites_mode:
                  if hasattr(self.favorites_view.favorite_channels_list, 'active_list_id'):
@@ -4801,19 +4853,11 @@ class MainWindow(Adw.ApplicationWindow):
     def _restore_fullscreen_category_selection(self):
         if not hasattr(self, 'last_fullscreen_category_id') or self.last_fullscreen_category_id is None:
             return False
-        target_list = self.video_view.fullscreen_channel_list.channel_listbox
-        row = target_list.get_first_child()       
-        found = False
         target_id_str = str(self.last_fullscreen_category_id)
-        while row:
-            if hasattr(row, 'channel_data'):
-                row_id = row.channel_data.get('id')
-                if row_id is not None and str(row_id) == target_id_str:
-                    target_list.select_row(row)
-                    row.grab_focus()
-                    found = True
-                    break
-            row = row.get_next_sibling()
+        found = self.video_view.fullscreen_channel_list.select_channel(
+            lambda channel_data: channel_data.get('id') is not None and str(channel_data.get('id')) == target_id_str,
+            grab_focus=True
+        )
         if found:
             self.last_fullscreen_category_id = None           
         return False
@@ -3,131 +3,161 @@
 import requests
 import logging
 import os
+import shutil
+import calendar
 from xml.etree import ElementTree as ET
-from datetime import datetime, timezone, timedelta
+from functools import lru_cache
+from utils import http_client
 import gettext
 _ = gettext.gettext
 
-def parse_epg_data(xml_content):
+# Encodings a guide is read with, in order, until it parses to the end.
+# None keeps the document's own declaration (UTF-8 without one); cp1254
+# comes before iso-8859-9 because it matches it from 0xA0 up and also
+# decodes 0x80-0x9F (euro sign, quotes), while iso-8859-9 accepts any byte.
+EPG_ENCODINGS = (None, 'cp1254', 'iso-8859-9')
+
+@lru_cache(maxsize=1024)
+def _days_since_epoch(date_part):
     """
-    Parses XMLTV format content and returns a dictionary
-    containing program lists, keyed by channel ID.
-    (Now includes past programs)
+    Converts a 'YYYYMMDD' string to days since 1970-01-01 (proleptic
+    Gregorian). Dates strptime would reject (year 0, February 29 outside
+    leap years, April 31, ...) raise ValueError.
     """
-    epg_data = {}
-    try:
-        root = ET.fromstring(xml_content)
+    year = int(date_part[0:4])
+    month = int(date_part[4:6])
+    day = int(date_part[6:8])
+    if year < 1 or not 1 <= month <= 12 or not 1 <= day <= calendar.monthrange(year, month)[1]:
+        raise ValueError(f"Invalid XMLTV date: {date_part}")
+    if month <= 2:
+        year -= 1
+    era = year // 400
+    year_of_era = year - era * 400
+    day_of_year = (153 * (month + (-3 if month > 2 else 9)) + 2) // 5 + day - 1
+    day_of_era = year_of_era * 365 + year_of_era // 4 - year_of_era // 100 + day_of_year
+    return era * 146097 + day_of_era - 719468
+
+@lru_cache(maxsize=256)
+def _offset_seconds(tz_part):
+    """Converts a '+HHMM' / '-HHMM' offset to seconds east of UTC."""
+    if len(tz_part) != 5 or tz_part[0] not in '+-' or not tz_part[1:].isdigit():
+        raise ValueError(f"Invalid XMLTV timezone offset: {tz_part}")
+    seconds = int(tz_part[1:3]) * 3600 + int(tz_part[3:5]) * 60
+    if seconds >= 86400:
+        raise ValueError(f"Invalid XMLTV timezone offset: {tz_part}")
+    return -seconds if tz_part[0] == '-' else seconds
+
+def parse_timestamp(time_str):
+    """
+    Decodes a fixed-width XMLTV timestamp ('YYYYMMDDHHMMSS +HHMM') into
+    integer epoch seconds. Dates and offsets repeat across a guide, so both
+    are cached; the time of day is computed arithmetically.
+    A missing offset is treated as UTC.
+    """
+    if len(time_str) < 14 or not time_str[:14].isdigit():
+        raise ValueError(f"Invalid XMLTV time: {time_str}")
+    hour = int(time_str[8:10])
+    minute = int(time_str[10:12])
+    second = int(time_str[12:14])
+    if hour > 23 or minute > 59 or second > 59:
+        raise ValueError(f"Invalid XMLTV time: {time_str}")
+    tz_part = time_str[14:].strip()
+    offset = _offset_seconds(tz_part) if tz_part else 0
+    return _days_since_epoch(time_str[0:8]) * 86400 + hour * 3600 + minute * 60 + second - offset
 
-        def parse_time(time_str):
-            dt_part = time_str[:-6]
-            tz_part = time_str[-5:]
-            dt_obj = datetime.strptime(dt_part, '%Y%m%d%H%M%S')
-            offset_hours = int(tz_part[1:3])
-            offset_minutes = int(tz_part[3:5])
-            sign = -1 if tz_part[0] == '-' else 1
-            tz_offset = timezone(timedelta(hours=sign * offset_hours, minutes=sign * offset_minutes))
-            return dt_obj.replace(tzinfo=tz_offset)
-        program_count = 0
-        for programme in root.findall('programme'):
-            channel_id = programme.get('channel')
-            if not channel_id:
-                continue
-            title_elem = programme.find('title')
-            desc_elem = programme.find('desc')
-            title = title_elem.text if title_elem is not None else _("No Title")
-            desc = desc_elem.text if desc_elem is not None else ""
-            start_time_str = programme.get('start')
-            stop_time_str = programme.get('stop')
-            try:
-                 start_time = parse_time(start_time_str)
-                 stop_time = parse_time(stop_time_str)
-            except (ValueError, TypeError) as e:
-                 logging.warning(f"Invalid time format for EPG program: {start_time_str} / {stop_time_str}. Skipping. Error: {e}")
-                 continue
-            if channel_id not in epg_data:
-                epg_data[channel_id] = []
-            epg_data[channel_id].append({
-                "title": title,
-                "desc": desc,
-                "start": start_time,
-                "stop": stop_time
-            })
-            program_count += 1
-        for channel_id in epg_data:
-            epg_data[channel_id].sort(key=lambda x: x['start'])
-        logging.info(f"Successfully parsed {program_count} EPG programs for {len(epg_data)} channels (including past programs).")
-        return epg_data
-    except ET.ParseError as e:
-        logging.error(f"Failed to parse EPG XML content: {e}")
-        return {}
-    except Exception as e:
-        logging.error(f"An unexpected error occurred during EPG parsing: {e}")
-        return {}
+def iter_epg_programmes(source, encoding=None):
+    """
+    Streams <programme> elements out of an XMLTV document with iterparse.
+    'source' is a file path or a binary file object. Every processed element
+    is cleared immediately, so memory stays bounded regardless of guide size.
+    Yields (channel_id, program) tuples with epoch start_ts/stop_ts values.
+    """
+    parser = ET.XMLParser(encoding=encoding) if encoding else None
+    context = ET.iterparse(source, events=("start", "end"), parser=parser)
+    root = None
+    for event, elem in context:
+        if event == "start":
+            if root is None:
+                root = elem
+            continue
+        if elem.tag == 'programme':
+            channel_id = elem.get('channel')
+            if channel_id:
+                title_elem = elem.find('title')
+                desc_elem = elem.find('desc')
+                start_time_str = elem.get('start')
+                stop_time_str = elem.get('stop')
+                try:
+                    start_ts = parse_timestamp(start_time_str)
+                    stop_ts = parse_timestamp(stop_time_str)
+                except (ValueError, TypeError) as e:
+                    logging.warning(f"Invalid time format for EPG program: {start_time_str} / {stop_time_str}. Skipping. Error: {e}")
+                else:
+                    yield channel_id, {
+                        "title": title_elem.text if title_elem is not None else _("No Title"),
+                        "desc": desc_elem.text if desc_elem is not None else "",
+                        "start_ts": start_ts,
+                        "stop_ts": stop_ts
+                    }
+            root.clear()
+        elif elem.tag == 'channel':
+            root.clear()
+
+def iter_epg_file(file_path, encoding=None):
+    """
+    Streams (channel_id, program) tuples from an XMLTV file on disk. With an
+    encoding, it overrides the document's declaration. Raises ET.ParseError
+    if the document cannot be parsed to the end.
+    """
+    with open(file_path, 'rb') as source:
+        yield from iter_epg_programmes(source, encoding)
 
-def _load_from_url(url):
-    """(HELPER FUNCTION) Downloads EPG data from the given URL."""
+def _download_to_file(url, target_path):
+    """(HELPER FUNCTION) Streams EPG data from the given URL into target_path."""
     try:
         headers = {
             "User-Agent": "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/108.0.0.0 Safari/537.36"
         }
-        response = requests.get(url, timeout=60, headers=headers)
-        response.raise_for_status()
-        try:
-            xml_content = response.content.decode('utf-8')
-        except UnicodeDecodeError:
-            try:
-                xml_content = response.content.decode('iso-8859-9')
-            except UnicodeDecodeError:
-                 xml_content = response.content.decode(response.apparent_encoding, errors='ignore')
-        return xml_content
-    except requests.exceptions.RequestException as e:
+        with http_client.get(url, timeout=60, headers=headers, stream=True) as response:
+            response.raise_for_status()
+            with open(target_path, 'wb') as f:
+                for chunk in response.iter_content(chunk_size=262144):
+                    f.write(chunk)
+        return True
+    except (requests.exceptions.RequestException, OSError) as e:
         logging.error(f"Failed to download EPG data from URL: {e}")
-        return None
+        return False
 
-def _load_from_file(file_path):
-    """(HELPER FUNCTION) Reads EPG data from the given local file."""
+def _copy_local_file(file_path, target_path):
+    """(HELPER FUNCTION) Copies a local EPG file to target_path."""
     try:
-        if not os.path.exists(file_path):
-            logging.error(f"EPG file not found at local path: {file_path}")
-            return None
-        encodings_to_try = ['utf-8', 'iso-8859-9', 'cp1254']
-        xml_content = None
-        for enc in encodings_to_try:
-             try:
-                 with open(file_path, 'r', encoding=enc) as f:
-                     xml_content = f.read()
-                 logging.info(f"Local EPG file read successfully with encoding: {enc}")
-                 break
-             except UnicodeDecodeError:
-                 logging.warning(f"Failed to read local EPG file with encoding {enc}. Trying next...")
-             except Exception as e:
-                 logging.error(f"Failed to read local EPG file '{file_path}': {e}")
-                 return None
-        if xml_content is None:
-             logging.error(f"Could not decode local EPG file with any known encoding: {file_path}")
-             return None
-        return xml_content
-    except IOError as e:
-        logging.error(f"Failed to open local EPG file '{file_path}': {e}")
-        return None
+        shutil.copyfile(file_path, target_path)
+        return True
+    except OSError as e:
+        logging.error(f"Failed to read local EPG file '{file_path}': {e}")
+        return False
 
-def load_epg_data(path_or_url):
+def fetch_epg_to_file(path_or_url, target_path):
     """
-    (MAIN FUNCTION) Detects if the given path is a URL or local file,
-    loads the data, and returns the RAW CONTENT (Parsing is not done here).
+    (MAIN FUNCTION) Detects if the given path is a URL or local file and
+    stores the raw XMLTV bytes at target_path without decoding them into
+    memory (Parsing is not done here). Returns True on success.
     """
     if not path_or_url:
-        return None
+        return False
     logging.info(f"Loading EPG content from: {path_or_url}")
-    xml_content = None
+    partial_path = f"{target_path}.part"
     if path_or_url.lower().startswith("http://") or path_or_url.lower().startswith("https://"):
-        xml_content = _load_from_url(path_or_url)
+        success = _download_to_file(path_or_url, partial_path)
     else:
         if not os.path.exists(path_or_url):
              logging.error(f"EPG file path does not exist: {path_or_url}")
-             return None
-        xml_content = _load_from_file(path_or_url)
-    if not xml_content:
-        logging.warning("EPG content is empty or could not be loaded.")
-        return None
-    return xml_content
+             return False
+        success = _copy_local_file(path_or_url, partial_path)
+    if success and os.path.getsize(partial_path) > 0:
+        os.replace(partial_path, target_path)
+        return True
+    if os.path.exists(partial_path):
+        os.remove(partial_path)
+    logging.warning("EPG content is empty or could not be loaded.")
+    return False
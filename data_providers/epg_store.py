@@ -0,0 +1,153 @@
+# data_providers/epg_store.py
+
+import os
+import sqlite3
+import logging
+import threading
+from xml.etree import ElementTree as ET
+from datetime import datetime, timezone
+from data_providers import epg_provider
+
+STORE_VERSION = 1
+_WRITE_BATCH_SIZE = 10000
+
+def _build_store(partial_path, xmltv_path, encoding):
+    """Writes every programme of the guide into a new database at partial_path. Returns the programme count."""
+    if os.path.exists(partial_path):
+        os.remove(partial_path)
+    conn = sqlite3.connect(partial_path)
+    imported = 0
+    max_duration = 0
+    try:
+        conn.execute("PRAGMA journal_mode = OFF")
+        conn.execute("PRAGMA synchronous = OFF")
+        conn.execute("""
+            CREATE TABLE programmes (
+                channel TEXT NOT NULL,
+                start INTEGER NOT NULL,
+                stop INTEGER NOT NULL,
+                title TEXT,
+                description TEXT
+            )
+        """)
+        conn.execute("CREATE TABLE meta (key TEXT PRIMARY KEY, value INTEGER NOT NULL)")
+        batch = []
+        for channel_id, program in epg_provider.iter_epg_file(xmltv_path, encoding):
+            start_ts = program["start_ts"]
+            stop_ts = program["stop_ts"]
+            max_duration = max(max_duration, stop_ts - start_ts)
+            batch.append((channel_id, start_ts, stop_ts, program["title"], program["desc"]))
+            if len(batch) >= _WRITE_BATCH_SIZE:
+                conn.executemany("INSERT INTO programmes VALUES (?, ?, ?, ?, ?)", batch)
+                imported += len(batch)
+                batch = []
+        if batch:
+            conn.executemany("INSERT INTO programmes VALUES (?, ?, ?, ?, ?)", batch)
+            imported += len(batch)
+        conn.execute("CREATE INDEX idx_programmes_channel_start ON programmes (channel, start)")
+        conn.execute("INSERT INTO meta (key, value) VALUES ('max_duration', ?)", (max_duration,))
+        conn.execute(f"PRAGMA user_version = {STORE_VERSION}")
+        conn.commit()
+        return imported
+    finally:
+        conn.close()
+
+def import_xmltv(db_path, xmltv_path):
+    """
+    Imports an XMLTV file into a fresh EPG database at db_path.
+    Programmes are streamed from the guide and written in batches into a
+    temporary database next to it. If the guide cannot be parsed to the
+    end, the import starts over with the next of epg_provider.EPG_ENCODINGS.
+    The temporary database only replaces the previous one if the whole
+    guide was parsed and at least one programme was read; otherwise the
+    previous one is kept and 0 is returned.
+    Returns the number of imported programmes.
+    """
+    partial_path = f"{db_path}.part"
+    try:
+        for encoding in epg_provider.EPG_ENCODINGS:
+            try:
+                imported = _build_store(partial_path, xmltv_path, encoding)
+            except ET.ParseError as e:
+                logging.warning(f"Failed to parse EPG XML content with encoding '{encoding or 'declared'}' ({e}).")
+                continue
+            if imported:
+                os.replace(partial_path, db_path)
+                logging.info(f"EPG store built: {imported} programmes imported into '{db_path}'.")
+            return imported
+        logging.error("EPG guide could not be parsed with any known encoding. Keeping the previous EPG store.")
+        return 0
+    finally:
+        if os.path.exists(partial_path):
+            os.remove(partial_path)
+
+def _to_program(row):
+    start_ts, stop_ts, title, description = row
+    return {
+        "title": title,
+        "desc": description or "",
+        "start": datetime.fromtimestamp(start_ts, timezone.utc),
+        "stop": datetime.fromtimestamp(stop_ts, timezone.utc),
+        "start_ts": start_ts,
+        "stop_ts": stop_ts
+    }
+
+class EpgStore:
+    """
+    Read-only access to a per-profile EPG database. Programmes are kept
+    with integer epoch start/stop columns and looked up by time window
+    through the (channel, start) index.
+    """
+
+    def __init__(self, db_path, conn):
+        self.db_path = db_path
+        self._conn = conn
+        self._lock = threading.Lock()
+        stat = os.stat(db_path)
+        self.signature = f"{stat.st_mtime_ns}:{stat.st_size}"
+        self._max_duration = self._query("SELECT value FROM meta WHERE key = 'max_duration'")[0][0]
+        self._channel_ids = [row[0] for row in self._query("SELECT DISTINCT channel FROM programmes")]
+        self._channel_id_set = set(self._channel_ids)
+
+    @classmethod
+    def open(cls, db_path):
+        """Opens an EPG database, returns None if it is missing or outdated."""
+        if not os.path.exists(db_path):
+            return None
+        try:
+            conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True, check_same_thread=False)
+            version = conn.execute("PRAGMA user_version").fetchone()[0]
+            if version != STORE_VERSION:
+                logging.info(f"EPG store '{db_path}' has version {version}, expected {STORE_VERSION}. Ignoring it.")
+                conn.close()
+                return None
+            return cls(db_path, conn)
+        except sqlite3.Error as e:
+            logging.error(f"Could not open EPG store '{db_path}': {e}")
+            return None
+
+    def _query(self, sql, params=()):
+        with self._lock:
+            return self._conn.execute(sql, params).fetchall()
+
+    def __len__(self):
+        return len(self._channel_ids)
+
+    def __contains__(self, channel_id):
+        return channel_id in self._channel_id_set
+
+    def get_channel_ids(self):
+        return list(self._channel_ids)
+
+    def get_programs(self, channel_id, start_ts, end_ts, limit=-1):
+        """Returns the programmes of a channel overlapping [start_ts, end_ts), ordered by start."""
+        if channel_id not in self._channel_id_set:
+            return []
+        rows = self._query("""
+            SELECT start, stop, title, description FROM programmes
+            WHERE channel = ? AND start > ? AND start < ? AND stop > ?
+            ORDER BY start
+            LIMIT ?
+        """, (channel_id, start_ts - self._max_duration, end_ts, start_ts, limit))
+        return [_to_program(row) for row in rows]
+
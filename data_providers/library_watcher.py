@@ -0,0 +1,140 @@
+# data_providers/library_watcher.py
+
+import os
+import threading
+import logging
+from gi.repository import Gio, GLib
+
+COALESCE_MILLISECONDS = 1500
+_PATH_EVENTS = {
+    Gio.FileMonitorEvent.CREATED,
+    Gio.FileMonitorEvent.CHANGES_DONE_HINT,
+    Gio.FileMonitorEvent.DELETED,
+    Gio.FileMonitorEvent.MOVED_IN,
+    Gio.FileMonitorEvent.MOVED_OUT,
+    Gio.FileMonitorEvent.RENAMED,
+}
+_REMOVAL_EVENTS = {
+    Gio.FileMonitorEvent.DELETED,
+    Gio.FileMonitorEvent.MOVED_OUT,
+    Gio.FileMonitorEvent.RENAMED,
+}
+
+class LibraryWatcher:
+    """
+    Watches the directories of the media libraries with Gio.FileMonitor
+    (inotify is not recursive, so every sub-directory gets its own monitor).
+    Bursts of events are coalesced into one set of changed paths per
+    library, which is handed to on_paths_changed({library_id: (library, paths)})
+    on the main thread. Must be used from the main thread.
+    """
+
+    def __init__(self, on_paths_changed):
+        self._on_paths_changed = on_paths_changed
+        self._libraries = []
+        self._monitors = {}
+        self._pending = set()
+        self._flush_source_id = None
+        self._generation = 0
+
+    def watch_libraries(self, libraries):
+        """
+        Replaces the watched set with the given library rows (dicts with id,
+        path, type). Only the trees of newly added libraries are walked; the
+        monitors of libraries that are still watched are kept, and those no
+        remaining library covers are cancelled.
+        """
+        watched_roots = {lib["path"] for lib in self._libraries}
+        self._libraries = [lib for lib in libraries if os.path.isdir(lib["path"])]
+        roots = {lib["path"] for lib in self._libraries}
+        for path in list(self._monitors):
+            if self._library_for_path(path) is None:
+                self._monitors.pop(path).cancel()
+        new_roots = roots - watched_roots
+        for root_path in new_roots:
+            self._watch_tree(root_path)
+        logging.info(f"Library watcher: watching {len(self._libraries)} libraries ({len(new_roots)} new).")
+
+    def stop(self):
+        self._generation += 1
+        self._libraries = []
+        for monitor in self._monitors.values():
+            monitor.cancel()
+        self._monitors = {}
+        self._pending.clear()
+        if self._flush_source_id:
+            GLib.source_remove(self._flush_source_id)
+            self._flush_source_id = None
+
+    def _watch_tree(self, root_path):
+        """Collects the directories below root_path in a thread and adds their monitors on the main thread."""
+        generation = self._generation
+
+        def collect():
+            directories = [root_path]
+            for current, dirs, _files in os.walk(root_path):
+                directories.extend(os.path.join(current, name) for name in dirs)
+            GLib.idle_add(self._add_monitors, directories, generation)
+
+        threading.Thread(target=collect, daemon=True).start()
+
+    def _add_monitors(self, directories, generation):
+        if generation != self._generation:
+            return False
+        for path in directories:
+            if path in self._monitors or self._library_for_path(path) is None:
+                continue
+            try:
+                monitor = Gio.File.new_for_path(path).monitor_directory(Gio.FileMonitorFlags.WATCH_MOVES, None)
+            except GLib.Error as e:
+                logging.warning(f"Library watcher: could not watch '{path}': {e.message}")
+                continue
+            monitor.connect("changed", self._on_monitor_changed)
+            self._monitors[path] = monitor
+        return False
+
+    def _remove_monitors(self, path):
+        prefix = path.rstrip(os.sep) + os.sep
+        for watched in [p for p in self._monitors if p == path or p.startswith(prefix)]:
+            self._monitors.pop(watched).cancel()
+
+    def _on_monitor_changed(self, monitor, file, other_file, event_type):
+        if event_type not in _PATH_EVENTS:
+            return
+        path = file.get_path()
+        if not path:
+            return
+        if event_type in _REMOVAL_EVENTS:
+            self._remove_monitors(path)
+        self._pending.add(path)
+        if event_type == Gio.FileMonitorEvent.RENAMED and other_file is not None:
+            path = other_file.get_path()
+            if path:
+                self._pending.add(path)
+        if event_type in (Gio.FileMonitorEvent.CREATED, Gio.FileMonitorEvent.MOVED_IN,
+                          Gio.FileMonitorEvent.RENAMED) and path and os.path.isdir(path):
+            self._watch_tree(path)
+        if self._flush_source_id is None:
+            self._flush_source_id = GLib.timeout_add(COALESCE_MILLISECONDS, self._flush)
+
+    def _library_for_path(self, path):
+        best = None
+        for lib in self._libraries:
+            root = lib["path"].rstrip(os.sep)
+            if path == root or path.startswith(root + os.sep):
+                if best is None or len(root) > len(best["path"].rstrip(os.sep)):
+                    best = lib
+        return best
+
+    def _flush(self):
+        self._flush_source_id = None
+        pending, self._pending = self._pending, set()
+        changes = {}
+        for path in pending:
+            lib = self._library_for_path(path)
+            if lib:
+                changes.setdefault(lib["id"], (lib, set()))[1].add(path)
+        if changes:
+            logging.debug(f"Library watcher: {len(pending)} changed paths in {len(changes)} libraries.")
+            self._on_paths_changed(changes)
+        return False
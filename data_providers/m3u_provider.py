@@ -1,78 +1,53 @@
 # data_providers/m3u_provider.py
 
 import re
-from collections import defaultdict
-import logging
 
 import gettext
 _ = gettext.gettext
 
-def parse_m3u_content(lines):
-    """
-    Parses a list of M3U lines and returns channels/VODs.
-    """
-    bouquets = defaultdict(list)
-    vods = defaultdict(list)
-    VOD_EXTENSIONS = {'.mkv', '.mp4', '.avi', '.mov'}
-    try:
-        line_num = 0
-        while line_num < len(lines):
-            line = lines[line_num].strip()
-            if line.startswith("#EXTINF:"):
-                channel_info = line
-                next_line_num = line_num + 1
-                url_line = None
-                while next_line_num < len(lines):
-                    potential_url = lines[next_line_num].strip()
-                    if potential_url and not potential_url.startswith("#"):
-                        url_line = potential_url
-                        break
-                    next_line_num += 1
-                if url_line:
-                    channel_name = channel_info.split(",")[-1].strip()
-                    group_match = re.search(r'group-title="([^"]+)"', channel_info, re.IGNORECASE)
-                    group_title = group_match.group(1) if group_match else _("Others")
-                    logo_match = re.search(r'tvg-logo="([^"]+)"', channel_info, re.IGNORECASE)
-                    logo_url = logo_match.group(1) if logo_match else None
-                    tvg_id_match = re.search(r'tvg-id="([^"]+)"', channel_info, re.IGNORECASE)
-                    tvg_id = tvg_id_match.group(1) if tvg_id_match else None
-                    is_vod = any(url_line.lower().endswith(ext) for ext in VOD_EXTENSIONS)
-                    archive_match = re.search(r'tv_archive="([^"]+)"', channel_info, re.IGNORECASE)
-                    duration_match = re.search(r'tv_archive_duration="([^"]+)"', channel_info, re.IGNORECASE)
-                    item_data = {
-                        "name": channel_name,
-                        "url": url_line,
-                        "logo": logo_url,
-                        "tvg-id": tvg_id
-                    }
-                    if archive_match:
-                        item_data["tv_archive"] = archive_match.group(1)
-                    if duration_match:
-                         item_data["tv_archive_duration"] = duration_match.group(1)
-                    if is_vod:
-                        vods[group_title].append(item_data)
-                    else:
-                        bouquets[group_title].append(item_data)
-                    line_num = next_line_num
-                else:
-                    line_num += 1
-            else:
-                line_num += 1
-        logging.info(f"Successfully parsed {len(bouquets)} bouquets and {len(vods)} VOD categories.")
-        return dict(bouquets), dict(vods)
-    except Exception as e:
-        logging.error(f"An error occurred while parsing M3U content: {e}")
-        return {}, {}
+VOD_EXTENSIONS = ('.mkv', '.mp4', '.avi', '.mov')
+_EXTINF_ATTR_RE = re.compile(r'([A-Za-z0-9_-]+)="([^"]*)"')
 
-def load_from_file(filepath):
+def _parse_extinf_attributes(channel_info):
+    """Tokenizes every key="value" pair of an #EXTINF line in a single pass."""
+    attributes = {}
+    for key, value in _EXTINF_ATTR_RE.findall(channel_info):
+        key = key.lower()
+        if value and key not in attributes:
+            attributes[key] = value
+    return attributes
+
+def iter_m3u_entries(lines):
     """
-    Loads an M3U file from a path and parses its content.
+    Lazily parses M3U lines from any iterable (a list, an open file or a
+    streamed HTTP response) and yields (group_title, item_data, is_vod)
+    tuples one entry at a time.
     """
-    try:
-        with open(filepath, 'r', encoding='utf-8', errors='ignore') as f:
-            lines = f.readlines()
-        return parse_m3u_content(lines)
-    except Exception as e:
-        logging.error(f"Error loading M3U from file '{filepath}': {e}")
-        return {}, {}
-
+    channel_info = None
+    for raw_line in lines:
+        if isinstance(raw_line, bytes):
+            raw_line = raw_line.decode('utf-8', errors='ignore')
+        line = raw_line.strip()
+        if not line:
+            continue
+        if line.startswith("#EXTINF:"):
+            if channel_info is None:
+                channel_info = line
+            continue
+        if line.startswith("#") or channel_info is None:
+            continue
+        url_line = line
+        attributes = _parse_extinf_attributes(channel_info)
+        item_data = {
+            "name": channel_info.split(",")[-1].strip(),
+            "url": url_line,
+            "logo": attributes.get("tvg-logo"),
+            "tvg-id": attributes.get("tvg-id")
+        }
+        if "tv_archive" in attributes:
+            item_data["tv_archive"] = attributes["tv_archive"]
+        if "tv_archive_duration" in attributes:
+            item_data["tv_archive_duration"] = attributes["tv_archive_duration"]
+        is_vod = url_line.lower().endswith(VOD_EXTENSIONS)
+        yield attributes.get("group-title") or _("Others"), item_data, is_vod
+        channel_info = None
@@ -0,0 +1,252 @@
+# data_providers/playlist_cache.py
+
+import os
+import json
+import sqlite3
+import logging
+import threading
+from collections.abc import Mapping
+
+LIVE = "live"
+VOD = "vod"
+CACHE_VERSION = 1
+_WRITE_BATCH_SIZE = 5000
+_READ_BATCH_SIZE = 1000
+
+def write_playlist_cache(db_path, entries):
+    """
+    Compiles (kind, bouquet_name, item_data) entries into an indexed SQLite
+    playlist file. Entries are consumed incrementally and written in batches.
+    The previous cache is only replaced if at least one entry was written.
+    Returns the number of written entries.
+    """
+    partial_path = f"{db_path}.part"
+    if os.path.exists(partial_path):
+        os.remove(partial_path)
+    conn = sqlite3.connect(partial_path)
+    written = 0
+    try:
+        conn.execute("PRAGMA journal_mode = OFF")
+        conn.execute("PRAGMA synchronous = OFF")
+        conn.execute("""
+            CREATE TABLE bouquets (
+                id INTEGER PRIMARY KEY,
+                kind TEXT NOT NULL,
+                name TEXT NOT NULL,
+                position INTEGER NOT NULL
+            )
+        """)
+        conn.execute("""
+            CREATE TABLE channels (
+                bouquet_id INTEGER NOT NULL,
+                position INTEGER NOT NULL,
+                url TEXT,
+                data TEXT NOT NULL
+            )
+        """)
+        bouquet_ids = {}
+        bouquet_sizes = {}
+        batch = []
+        for kind, bouquet_name, item_data in entries:
+            key = (kind, bouquet_name)
+            bouquet_id = bouquet_ids.get(key)
+            if bouquet_id is None:
+                bouquet_id = len(bouquet_ids) + 1
+                bouquet_ids[key] = bouquet_id
+                bouquet_sizes[bouquet_id] = 0
+                conn.execute(
+                    "INSERT INTO bouquets (id, kind, name, position) VALUES (?, ?, ?, ?)",
+                    (bouquet_id, kind, bouquet_name, bouquet_id)
+                )
+            batch.append((bouquet_id, bouquet_sizes[bouquet_id], item_data.get("url"), json.dumps(item_data, ensure_ascii=False)))
+            bouquet_sizes[bouquet_id] += 1
+            if len(batch) >= _WRITE_BATCH_SIZE:
+                conn.executemany("INSERT INTO channels (bouquet_id, position, url, data) VALUES (?, ?, ?, ?)", batch)
+                written += len(batch)
+                batch = []
+        if batch:
+            conn.executemany("INSERT INTO channels (bouquet_id, position, url, data) VALUES (?, ?, ?, ?)", batch)
+            written += len(batch)
+        conn.execute("CREATE INDEX idx_channels_bouquet ON channels (bouquet_id, position)")
+        conn.execute("CREATE INDEX idx_channels_url ON channels (url)")
+        conn.execute(f"PRAGMA user_version = {CACHE_VERSION}")
+        conn.commit()
+        conn.close()
+        if written:
+            os.replace(partial_path, db_path)
+            logging.info(f"Playlist cache compiled: {written} entries in {len(bouquet_ids)} bouquets -> '{db_path}'.")
+        return written
+    except Exception:
+        conn.close()
+        raise
+    finally:
+        if os.path.exists(partial_path):
+            os.remove(partial_path)
+
+class PlaylistCache:
+    """
+    Read-only view on a compiled playlist file. Bouquet names are available
+    immediately, channel rows are loaded per bouquet on first access.
+    """
+
+    def __init__(self, db_path, conn):
+        self.db_path = db_path
+        self._conn = conn
+        self._lock = threading.Lock()
+
+    @classmethod
+    def open(cls, db_path):
+        """Opens a compiled cache, returns None if it is missing or outdated."""
+        if not os.path.exists(db_path):
+            return None
+        try:
+            conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True, check_same_thread=False)
+            version = conn.execute("PRAGMA user_version").fetchone()[0]
+            if version != CACHE_VERSION:
+                logging.info(f"Playlist cache '{db_path}' has version {version}, expected {CACHE_VERSION}. Ignoring it.")
+                conn.close()
+                return None
+            return cls(db_path, conn)
+        except sqlite3.Error as e:
+            logging.error(f"Could not open playlist cache '{db_path}': {e}")
+            return None
+
+    def _query(self, sql, params=()):
+        with self._lock:
+            return self._conn.execute(sql, params).fetchall()
+
+    def _iter_query(self, sql, params=()):
+        """Yields the rows of a query, fetching _READ_BATCH_SIZE of them at a time."""
+        with self._lock:
+            cursor = self._conn.execute(sql, params)
+        while True:
+            with self._lock:
+                rows = cursor.fetchmany(_READ_BATCH_SIZE)
+            if not rows:
+                return
+            yield from rows
+
+    def get_bouquet_names(self, kind):
+        rows = self._query("SELECT name FROM bouquets WHERE kind = ? ORDER BY position", (kind,))
+        return [row[0] for row in rows]
+
+    def get_channels(self, kind, bouquet_name):
+        rows = self._query("""
+            SELECT c.data FROM channels c
+            JOIN bouquets b ON c.bouquet_id = b.id
+            WHERE b.kind = ? AND b.name = ?
+            ORDER BY c.position
+        """, (kind, bouquet_name))
+        return [json.loads(row[0]) for row in rows]
+
+    def iter_channels(self, kind):
+        """
+        Yields the data of every entry of the given kind without loading
+        bouquets. Rows are read from the cursor in batches, not all at once.
+        """
+        rows = self._iter_query("""
+            SELECT c.data FROM channels c
+            JOIN bouquets b ON c.bouquet_id = b.id
+            WHERE b.kind = ?
+        """, (kind,))
+        return (json.loads(row[0]) for row in rows)
+
+    def iter_entries(self, kind):
+        """
+        Yields (kind, bouquet_name, item_data) in playlist order, in the form
+        write_playlist_cache() takes. Rows are read from the cursor in batches.
+        """
+        rows = self._iter_query("""
+            SELECT b.name, c.data FROM channels c
+            JOIN bouquets b ON c.bouquet_id = b.id
+            WHERE b.kind = ?
+            ORDER BY b.position, c.position
+        """, (kind,))
+        return ((kind, bouquet_name, json.loads(data)) for bouquet_name, data in rows)
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def find_by_url(self, url):
+        """Returns (kind, bouquet_name, item_data) for the first entry with this URL."""
+        rows = self._query("""
+            SELECT b.kind, b.name, c.data FROM channels c
+            JOIN bouquets b ON c.bouquet_id = b.id
+            WHERE c.url = ?
+            ORDER BY b.position, c.position
+            LIMIT 1
+        """, (url,))
+        if not rows:
+            return None
+        kind, bouquet_name, data = rows[0]
+        return kind, bouquet_name, json.loads(data)
+
+    def iter_urls(self):
+        return (row[0] for row in self._iter_query("SELECT DISTINCT url FROM channels WHERE url IS NOT NULL"))
+
+    def count_urls(self):
+        return self._query("SELECT COUNT(DISTINCT url) FROM channels")[0][0]
+
+    def bouquets(self, kind):
+        return CachedBouquets(self, kind)
+
+    def url_map(self):
+        return ChannelUrlMap(self)
+
+class CachedBouquets(Mapping):
+    """Maps bouquet name -> channel list, loading each bouquet lazily from the cache."""
+
+    def __init__(self, cache, kind):
+        self.cache = cache
+        self.kind = kind
+        self._names = cache.get_bouquet_names(kind)
+        self._name_set = set(self._names)
+        self._loaded = {}
+
+    def __getitem__(self, bouquet_name):
+        if bouquet_name not in self._name_set:
+            raise KeyError(bouquet_name)
+        channels = self._loaded.get(bouquet_name)
+        if channels is None:
+            channels = self.cache.get_channels(self.kind, bouquet_name)
+            self._loaded[bouquet_name] = channels
+        return channels
+
+    def __iter__(self):
+        return iter(self._names)
+
+    def __len__(self):
+        return len(self._names)
+
+    def __contains__(self, bouquet_name):
+        return bouquet_name in self._name_set
+
+    def bouquet_name_for_url(self, url):
+        found = self.cache.find_by_url(url)
+        if found and found[0] == self.kind:
+            return found[1]
+        return None
+
+class ChannelUrlMap(Mapping):
+    """Maps channel URL -> channel data for every entry of the cache, resolved on demand."""
+
+    def __init__(self, cache):
+        self.cache = cache
+        self._resolved = {}
+
+    def __getitem__(self, url):
+        item = self._resolved.get(url)
+        if item is None:
+            found = self.cache.find_by_url(url)
+            if not found:
+                raise KeyError(url)
+            item = found[2]
+            self._resolved[url] = item
+        return item
+
+    def __iter__(self):
+        return self.cache.iter_urls()
+
+    def __len__(self):
+        return self.cache.count_urls()
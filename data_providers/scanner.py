@@ -1,19 +1,27 @@
 # data_providers/scanner.py
 
 import os
+import time
+import hashlib
+import sqlite3
 import logging
 import gettext
-from database import get_library_db_connection, get_cache_path
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from database import get_library_db_connection, get_cache_path, cleanup_orphan_albums
+from data_providers.tag_reader import read_music_tags
 from mutagen import File as MutagenFile
 from mutagen.id3 import APIC
 from gi.repository import GLib
 
-import gettext
 _ = gettext.gettext
 
 VIDEO_EXTENSIONS = {".mp4", ".mkv", ".avi", ".mov", ".webm", ".flv"}
 PICTURE_EXTENSIONS = {".jpg", ".jpeg", ".png", ".gif", ".bmp", ".webp"}
 MUSIC_EXTENSIONS = {".mp3", ".flac", ".ogg", ".wav", ".m4a"}
+WRITE_BATCH_SIZE = 500
+PROCESS_POOL_THRESHOLD = 64
+PROGRESS_INTERVAL = 0.5
 
 def get_album_art_cache_dir():
     base_cache_dir = get_cache_path()
@@ -21,37 +29,424 @@ def get_album_art_cache_dir():
     os.makedirs(cache_dir, exist_ok=True)
     return cache_dir
 
-def _extract_album_art(audio_file, artist, album):
+def _extract_album_art(audio_file):
+    """
+    Stores the embedded cover of an audio file in the album art cache and
+    returns its path. Files are named by the content hash, so albums that
+    share a cover share one file and an existing copy is never rewritten.
+    """
     try:
-        safe_name = f"{artist}_{album}".encode('utf-8').hex()
-        cache_dir = get_album_art_cache_dir()
-        art_path = os.path.join(cache_dir, f"{safe_name}.jpg")
-        if os.path.exists(art_path):
-            return art_path
         art_data = None
         if 'APIC:' in audio_file:
             art_data = audio_file['APIC:'].data
         elif hasattr(audio_file, 'pictures') and audio_file.pictures:
             art_data = audio_file.pictures[0].data
-        if art_data:
-            with open(art_path, 'wb') as f:
-                f.write(art_data)
+        if not art_data:
+            return None
+        art_path = os.path.join(get_album_art_cache_dir(), f"{hashlib.sha1(art_data).hexdigest()}.jpg")
+        if os.path.exists(art_path):
+            os.utime(art_path)
             return art_path
+        partial_path = f"{art_path}.part"
+        with open(partial_path, 'wb') as f:
+            f.write(art_data)
+        os.replace(partial_path, art_path)
+        return art_path
     except Exception as e:
         logging.warning(_("Could not extract album art: {}").format(e))
     return None
 
-def scan_all_libraries():
+def _read_album_art(full_path):
+    try:
+        audio = MutagenFile(full_path)
+    except Exception as e:
+        logging.warning(_("Could not extract album art: {}").format(e))
+        return None
+    return _extract_album_art(audio) if audio else None
+
+def _iter_library_files(path, extensions):
+    """
+    Walks a library with os.scandir and yields (full_path, stat_result) for
+    every file with a matching extension. Directory symlinks are not
+    followed, like os.walk.
+    """
+    pending_dirs = [path]
+    while pending_dirs:
+        current = pending_dirs.pop()
+        try:
+            with os.scandir(current) as entries:
+                for entry in entries:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            pending_dirs.append(entry.path)
+                        elif os.path.splitext(entry.name)[1].lower() in extensions:
+                            yield entry.path, entry.stat()
+                    except OSError as e:
+                        logging.warning(_("Could not read file info for {}: {}").format(entry.path, e))
+        except OSError as e:
+            logging.warning(_("Could not read directory {}: {}").format(current, e))
+
+def _file_signature(stat_result):
+    return stat_result.st_size, stat_result.st_mtime_ns, stat_result.st_ino
+
+def _is_unchanged(known_signature, signature):
+    if known_signature is None:
+        return False
+    size, mtime, inode = known_signature
+    if size != signature[0] or mtime != signature[1]:
+        return False
+    return inode is None or inode == signature[2]
+
+def _load_known_signatures(cursor, table, library_id):
+    rows = cursor.execute(
+        f"SELECT file_path, file_size, file_mtime, file_inode FROM {table} WHERE library_id = ?",
+        (library_id,)
+    ).fetchall()
+    return {row["file_path"]: (row["file_size"], row["file_mtime"], row["file_inode"]) for row in rows}
+
+class _ScanProgress:
+    """Per-library counters, reported through the progress callback at most every PROGRESS_INTERVAL seconds."""
+
+    def __init__(self, library_id, callback):
+        self.library_id = library_id
+        self._callback = callback
+        self._started = time.monotonic()
+        self._last_report = 0.0
+        self.stats = {"seen": 0, "skipped": 0, "pending": 0, "processed": 0, "failed": 0,
+                      "removed": 0, "files_per_second": 0.0, "elapsed": 0.0, "finished": False}
+
+    def report(self, force=False):
+        now = time.monotonic()
+        if not force and now - self._last_report < PROGRESS_INTERVAL:
+            return
+        self._last_report = now
+        elapsed = now - self._started
+        self.stats["elapsed"] = elapsed
+        self.stats["files_per_second"] = self.stats["seen"] / elapsed if elapsed > 0 else 0.0
+        if self._callback:
+            self._callback(self.library_id, dict(self.stats))
+
+    def finish(self):
+        self.stats["finished"] = True
+        self.report(force=True)
+
+def _iter_music_tags(paths):
+    """
+    Yields (full_path, tags, error) for the given files. Larger batches are
+    parsed in a process pool, small ones in this thread.
+    """
+    if len(paths) < PROCESS_POOL_THRESHOLD:
+        for full_path in paths:
+            yield read_music_tags(full_path)
+        return
+    workers = min(os.cpu_count() or 1, 8)
+    try:
+        executor = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+    except (OSError, ValueError) as e:
+        logging.warning(_("Could not start tag reader processes, reading tags serially: {}").format(e))
+        for full_path in paths:
+            yield read_music_tags(full_path)
+        return
+    with executor:
+        yield from executor.map(read_music_tags, paths, chunksize=32)
+
+def _select_in_chunks(cursor, sql, values):
+    """Runs a 'WHERE column IN ({})' query over values in chunks and yields the rows."""
+    values = list(values)
+    for start in range(0, len(values), WRITE_BATCH_SIZE):
+        chunk = values[start:start + WRITE_BATCH_SIZE]
+        yield from cursor.execute(sql.format(",".join("?" * len(chunk))), chunk).fetchall()
+
+class _MusicIdCache:
+    """
+    Artist and album ids for one scan session. A large scan prefills both
+    maps from the database in two queries; otherwise unknown names are
+    looked up per batch. New artists and albums are inserted with
+    executemany, and album art is only extracted for albums that are new.
+    """
+
+    def __init__(self):
+        self.artists = {}
+        self.albums = {}
+        self.prefilled = False
+
+    def prefill(self, cursor):
+        if self.prefilled:
+            return
+        self.artists = {row["name"]: row["id"] for row in cursor.execute("SELECT id, name FROM artists")}
+        self.albums = {(row["artist_id"], row["name"]): row["id"]
+                       for row in cursor.execute("SELECT id, artist_id, name FROM albums")}
+        self.prefilled = True
+
+    def reset(self):
+        self.artists = {}
+        self.albums = {}
+        self.prefilled = False
+
+    def forget(self, cursor, album_ids, artist_ids):
+        """Drops the cached ids among album_ids/artist_ids that no longer exist in the database."""
+        kept_albums = {row["id"] for row in _select_in_chunks(cursor, "SELECT id FROM albums WHERE id IN ({})", album_ids)}
+        kept_artists = {row["id"] for row in _select_in_chunks(cursor, "SELECT id FROM artists WHERE id IN ({})", artist_ids)}
+        self.albums = {key: album_id for key, album_id in self.albums.items()
+                       if album_id not in album_ids or album_id in kept_albums}
+        self.artists = {name: artist_id for name, artist_id in self.artists.items()
+                        if artist_id not in artist_ids or artist_id in kept_artists}
+
+    def _load_artists(self, cursor, names):
+        for row in _select_in_chunks(cursor, "SELECT id, name FROM artists WHERE name IN ({})", names):
+            self.artists[row["name"]] = row["id"]
+
+    def resolve_artists(self, cursor, names):
+        missing = {name for name in names if name not in self.artists}
+        if missing and not self.prefilled:
+            self._load_artists(cursor, missing)
+            missing = {name for name in missing if name not in self.artists}
+        if missing:
+            cursor.executemany("INSERT OR IGNORE INTO artists (name) VALUES (?)", [(name,) for name in missing])
+            self._load_artists(cursor, missing)
+
+    def resolve_albums(self, cursor, entries):
+        """entries: (full_path, artist_name, album_name). Adds the missing albums, with art from their first track."""
+        new_albums = {}
+        for full_path, artist_name, album_name in entries:
+            key = (self.artists[artist_name], album_name)
+            if key not in self.albums and key not in new_albums:
+                new_albums[key] = full_path
+        if new_albums and not self.prefilled:
+            artist_ids = {artist_id for artist_id, album_name in new_albums}
+            for row in _select_in_chunks(cursor, "SELECT id, artist_id, name FROM albums WHERE artist_id IN ({})", artist_ids):
+                self.albums[(row["artist_id"], row["name"])] = row["id"]
+            new_albums = {key: path for key, path in new_albums.items() if key not in self.albums}
+        if not new_albums:
+            return
+        last_id = cursor.execute("SELECT COALESCE(MAX(id), 0) FROM albums").fetchone()[0]
+        cursor.executemany(
+            "INSERT INTO albums (name, artist_id, album_art_path) VALUES (?, ?, ?)",
+            [(album_name, artist_id, _read_album_art(full_path))
+             for (artist_id, album_name), full_path in new_albums.items()]
+        )
+        for row in cursor.execute("SELECT id, artist_id, name FROM albums WHERE id > ?", (last_id,)):
+            self.albums[(row["artist_id"], row["name"])] = row["id"]
+
+def _write_music_batch(conn, library_id, batch, ids):
+    """
+    Resolves artist/album ids through the session cache and upserts a batch
+    of parsed tracks in one transaction. Albums that rescanned tracks moved
+    away from are removed in the same transaction once they have no tracks.
+    """
+    with conn:
+        cursor = conn.cursor()
+        previous_albums = {row["file_path"]: row["album_id"] for row in _select_in_chunks(
+            cursor, "SELECT file_path, album_id FROM tracks WHERE file_path IN ({})",
+            [full_path for full_path, signature, tags in batch])}
+        entries = [(full_path, tags["artist"] or _('Unknown Artist'), tags["album"]) for full_path, signature, tags in batch]
+        ids.resolve_artists(cursor, {artist_name for full_path, artist_name, album_name in entries})
+        ids.resolve_albums(cursor, entries)
+        rows = []
+        replaced_albums = set()
+        for (full_path, signature, tags), (entry_path, artist_name, album_name) in zip(batch, entries):
+            album_id = ids.albums[(ids.artists[artist_name], album_name)]
+            if previous_albums.get(full_path, album_id) != album_id:
+                replaced_albums.add(previous_albums[full_path])
+            rows.append((album_id, library_id, tags["title"], tags["track_number"], tags["duration"],
+                         full_path) + signature)
+        cursor.executemany("""
+            INSERT INTO tracks (album_id, library_id, title, track_number, duration, file_path, file_size, file_mtime, file_inode)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT(file_path) DO UPDATE SET
+                album_id = excluded.album_id, library_id = excluded.library_id, title = excluded.title,
+                track_number = excluded.track_number, duration = excluded.duration,
+                file_size = excluded.file_size, file_mtime = excluded.file_mtime, file_inode = excluded.file_inode
+        """, rows)
+        if replaced_albums:
+            replaced_artists = {row["artist_id"] for row in _select_in_chunks(
+                cursor, "SELECT artist_id FROM albums WHERE id IN ({})", replaced_albums)}
+            if any(cleanup_orphan_albums(cursor, replaced_albums)):
+                ids.forget(cursor, replaced_albums, replaced_artists)
+
+def _remove_missing_files(conn, table, removed_paths, subtrees=False):
+    """
+    Deletes the records of removed files. With subtrees=True every path is
+    also treated as a directory and the records below it are removed too.
+    Returns the number of deleted records.
+    """
+    if not removed_paths:
+        return 0
+    removed = 0
+    album_ids = []
+    with conn:
+        cursor = conn.cursor()
+        for path in removed_paths:
+            if subtrees:
+                prefix = path.rstrip(os.sep) + os.sep
+                upper_bound = prefix[:-1] + chr(ord(os.sep) + 1)
+                condition = "file_path = ? OR (file_path >= ? AND file_path < ?)"
+                params = (path, prefix, upper_bound)
+            else:
+                condition = "file_path = ?"
+                params = (path,)
+            if table == "tracks":
+                album_ids.extend(row[0] for row in cursor.execute(
+                    f"SELECT DISTINCT album_id FROM tracks WHERE {condition}", params))
+            cursor.execute(f"DELETE FROM {table} WHERE {condition}", params)
+            removed += cursor.rowcount
+        cleanup_orphan_albums(cursor, album_ids)
+    return removed
+
+def _update_music_files(conn, library_id, changed, progress, ids):
+    """Parses the tags of the changed music files ({path: signature}) and writes them in batches."""
+    if len(changed) >= PROCESS_POOL_THRESHOLD:
+        ids.prefill(conn.cursor())
+    batch = []
+    for full_path, tags, error in _iter_music_tags(list(changed)):
+        if tags is None:
+            progress.stats["failed"] += 1
+            if error:
+                logging.warning(_("Could not process music file {}: {}").format(full_path, error))
+            else:
+                logging.warning(_("Could not read metadata from: {}").format(os.path.basename(full_path)))
+        else:
+            batch.append((full_path, changed[full_path], tags))
+            if len(batch) >= WRITE_BATCH_SIZE:
+                _write_music_batch(conn, library_id, batch, ids)
+                batch = []
+        progress.stats["processed"] += 1
+        progress.report()
+    if batch:
+        _write_music_batch(conn, library_id, batch, ids)
+
+def _update_media_files(conn, library_id, changed, progress):
+    """Writes the signatures of new or changed video/picture files in batches."""
+    rows = [(library_id, full_path) + signature for full_path, signature in changed.items()]
+    for start in range(0, len(rows), WRITE_BATCH_SIZE):
+        batch = rows[start:start + WRITE_BATCH_SIZE]
+        _write_file_batch(conn, batch)
+        progress.stats["processed"] += len(batch)
+        progress.report()
+
+def _write_file_batch(conn, batch):
+    with conn:
+        conn.executemany("""
+            INSERT INTO media_files (library_id, file_path, file_size, file_mtime, file_inode)
+            VALUES (?, ?, ?, ?, ?)
+            ON CONFLICT(file_path) DO UPDATE SET
+                file_size = excluded.file_size, file_mtime = excluded.file_mtime, file_inode = excluded.file_inode
+        """, batch)
+
+def _library_table(lib_type):
+    return "tracks" if lib_type == "music" else "media_files"
+
+def _library_extensions(lib_type):
+    if lib_type == "music": return MUSIC_EXTENSIONS
+    if lib_type == "video": return VIDEO_EXTENSIONS
+    if lib_type == "picture": return PICTURE_EXTENSIONS
+    return set()
+
+def _update_library_files(conn, lib, changed, progress, ids):
+    if lib["type"] == "music":
+        _update_music_files(conn, lib["id"], changed, progress, ids)
+    else:
+        _update_media_files(conn, lib["id"], changed, progress)
+
+def _scan_library(conn, lib, progress, ids):
+    table = _library_table(lib["type"])
+    known = _load_known_signatures(conn.cursor(), table, lib["id"])
+    changed = {}
+    for full_path, stat_result in _iter_library_files(lib["path"], _library_extensions(lib["type"])):
+        progress.stats["seen"] += 1
+        signature = _file_signature(stat_result)
+        if _is_unchanged(known.pop(full_path, None), signature):
+            progress.stats["skipped"] += 1
+        else:
+            changed[full_path] = signature
+            progress.stats["pending"] += 1
+        progress.report()
+    _update_library_files(conn, lib, changed, progress, ids)
+    progress.stats["removed"] = _remove_missing_files(conn, table, list(known))
+    if progress.stats["removed"] and table == "tracks":
+        ids.reset()
+
+def _load_signatures_for_paths(cursor, table, paths):
+    known = {}
+    paths = list(paths)
+    for start in range(0, len(paths), WRITE_BATCH_SIZE):
+        chunk = paths[start:start + WRITE_BATCH_SIZE]
+        placeholders = ",".join("?" * len(chunk))
+        rows = cursor.execute(
+            f"SELECT file_path, file_size, file_mtime, file_inode FROM {table} WHERE file_path IN ({placeholders})",
+            chunk
+        ).fetchall()
+        for row in rows:
+            known[row["file_path"]] = (row["file_size"], row["file_mtime"], row["file_inode"])
+    return known
+
+def apply_path_changes(lib, paths):
+    """
+    Applies filesystem changes below one library without walking all of it.
+    'paths' are files or directories that were created, modified, moved
+    or deleted: existing ones are (re)scanned, missing ones are removed
+    together with everything recorded below them.
+    Returns the per-library stats.
+    """
+    table = _library_table(lib["type"])
+    extensions = _library_extensions(lib["type"])
+    progress = _ScanProgress(lib["id"], None)
+    found = {}
+    missing = []
+    for path in paths:
+        try:
+            stat_result = os.stat(path)
+        except FileNotFoundError:
+            missing.append(path)
+            continue
+        except OSError as e:
+            logging.warning(_("Could not read file info for {}: {}").format(path, e))
+            continue
+        if os.path.isdir(path):
+            for full_path, file_stat in _iter_library_files(path, extensions):
+                found[full_path] = _file_signature(file_stat)
+        elif os.path.splitext(path)[1].lower() in extensions:
+            found[path] = _file_signature(stat_result)
+    conn = get_library_db_connection()
+    try:
+        known = _load_signatures_for_paths(conn.cursor(), table, found)
+        changed = {}
+        for full_path, signature in found.items():
+            progress.stats["seen"] += 1
+            if _is_unchanged(known.get(full_path), signature):
+                progress.stats["skipped"] += 1
+            else:
+                changed[full_path] = signature
+                progress.stats["pending"] += 1
+        _update_library_files(conn, lib, changed, progress, _MusicIdCache())
+        progress.stats["removed"] = _remove_missing_files(conn, table, missing, subtrees=True)
+    except sqlite3.Error as e:
+        logging.error(_("Could not apply library changes for {}: {}").format(lib["path"], e))
+    finally:
+        conn.close()
+    progress.finish()
+    return progress.stats
+
+def scan_all_libraries(progress_callback=None):
+    """
+    Incrementally scans every library. Files whose size, mtime and inode
+    match the stored values are skipped, new or changed music files are
+    parsed in a process pool and all writes go out in batches. Records of
+    files that disappeared are removed.
+    progress_callback(library_id, stats) receives the per-library counters
+    while scanning. Returns {library_id: stats}.
+    """
     logging.info(_("Starting library scan..."))
     conn = get_library_db_connection()
     cursor = conn.cursor()
+    results = {}
+    ids = _MusicIdCache()
     try:
         cursor.execute("SELECT * FROM libraries")
         libraries = cursor.fetchall()
         if not libraries:
             logging.info(_("No libraries in the database to scan."))
-            conn.close()
-            return
+            return results
         for lib in libraries:
             path = lib["path"]
             if not os.path.isdir(path):
@@ -59,62 +454,20 @@ def scan_all_libraries():
                 continue
             lib_type = lib["type"]
             logging.info(_("Scanning {} library at: {}").format(lib_type, path))
-            if lib_type == "music":
-                for root, dirs, files in os.walk(path):
-                    for filename in files:
-                        if any(filename.lower().endswith(ext) for ext in MUSIC_EXTENSIONS):
-                            full_path = os.path.join(root, filename)
-                            try:
-                                audio = MutagenFile(full_path)
-                                if not audio:
-                                    logging.warning(_("Could not read metadata from: {}").format(filename))
-                                    continue
-                                album_artist_name = _('Unknown Artist')
-                                if audio.get('albumartist'):
-                                    album_artist_name = audio.get('albumartist')[0]
-                                elif audio.get('artist'):
-                                    album_artist_name = audio.get('artist')[0]
-                                album_name_tag = audio.get('album', [''])[0].strip()
-                                if album_name_tag:
-                                    album_name = album_name_tag
-                                else:
-                                    album_name = os.path.basename(os.path.dirname(full_path))
-                                track_title = audio.get('title', [os.path.splitext(filename)[0]])[0] if audio.get('title') else os.path.splitext(filename)[0]
-                                track_number_tags = audio.get('tracknumber', ['0'])
-                                track_number_str = track_number_tags[0].split('/')[0] if track_number_tags else '0'
-                                track_number = int(track_number_str) if track_number_str.isdigit() else 0
-                                duration = int(audio.info.length)
-                                cursor.execute("INSERT OR IGNORE INTO artists (name) VALUES (?)", (album_artist_name,))
-                                artist_id = cursor.execute("SELECT id FROM artists WHERE name = ?", (album_artist_name,)).fetchone()['id']
-                                album_id_row = cursor.execute("SELECT id FROM albums WHERE name = ? AND artist_id = ?", (album_name, artist_id)).fetchone()
-                                if not album_id_row:
-                                    album_art_path = _extract_album_art(audio, album_artist_name, album_name)
-                                    cursor.execute("INSERT INTO albums (name, artist_id, album_art_path) VALUES (?, ?, ?)",
-                                                   (album_name, artist_id, album_art_path))
-                                    album_id = cursor.lastrowid
-                                else:
-                                    album_id = album_id_row['id']
-                                cursor.execute("""
-                                    INSERT OR IGNORE INTO tracks (album_id, library_id, title, track_number, duration, file_path)
-                                    VALUES (?, ?, ?, ?, ?, ?)
-                                """, (album_id, lib["id"], track_title, track_number, duration, full_path))
-                            except Exception as e:
-                                logging.warning(_("Could not process music file {}: {}").format(full_path, e))
-            else:
-                extensions_to_scan = set()
-                if lib_type == "video": extensions_to_scan = VIDEO_EXTENSIONS
-                elif lib_type == "picture": extensions_to_scan = PICTURE_EXTENSIONS
-                for root, dirs, files in os.walk(path):
-                    for filename in files:
-                        if any(filename.lower().endswith(ext) for ext in extensions_to_scan):
-                            full_path = os.path.join(root, filename)
-                            cursor.execute(
-                                "INSERT OR IGNORE INTO media_files (library_id, file_path) VALUES (?, ?)",
-                                (lib["id"], full_path)
-                            )
+            progress = _ScanProgress(lib["id"], progress_callback)
+            try:
+                _scan_library(conn, lib, progress, ids)
+            finally:
+                progress.finish()
+            stats = progress.stats
+            results[lib["id"]] = stats
+            logging.info(_("Scanned {}: {} files, {} unchanged, {} updated, {} failed, {} removed in {:.1f}s ({:.0f} files/s).").format(
+                path, stats["seen"], stats["skipped"], stats["processed"] - stats["failed"],
+                stats["failed"], stats["removed"], stats["elapsed"], stats["files_per_second"]))
     except Exception as e:
         logging.error(_("An error occurred during library scan: {}").format(e), exc_info=True)
     finally:
         conn.commit()
         conn.close()
         logging.info(_("Library scan finished."))
+    return results
@@ -0,0 +1,40 @@
+# data_providers/tag_reader.py
+
+import os
+from mutagen import File as MutagenFile
+
+def read_music_tags(full_path):
+    """
+    Reads the tags the music library needs from one audio file.
+    Runs inside the scanner's worker processes, so it only depends on
+    mutagen and returns plain data: (full_path, tags, error).
+    A missing artist is returned as None and filled in by the caller.
+    """
+    try:
+        audio = MutagenFile(full_path)
+        if not audio:
+            return full_path, None, None
+        album_artist_name = None
+        if audio.get('albumartist'):
+            album_artist_name = audio.get('albumartist')[0]
+        elif audio.get('artist'):
+            album_artist_name = audio.get('artist')[0]
+        album_name_tag = audio.get('album', [''])[0].strip()
+        if album_name_tag:
+            album_name = album_name_tag
+        else:
+            album_name = os.path.basename(os.path.dirname(full_path))
+        default_title = os.path.splitext(os.path.basename(full_path))[0]
+        track_title = audio.get('title', [default_title])[0] if audio.get('title') else default_title
+        track_number_tags = audio.get('tracknumber', ['0'])
+        track_number_str = track_number_tags[0].split('/')[0] if track_number_tags else '0'
+        track_number = int(track_number_str) if track_number_str.isdigit() else 0
+        return full_path, {
+            "artist": album_artist_name,
+            "album": album_name,
+            "title": track_title,
+            "track_number": track_number,
+            "duration": int(audio.info.length)
+        }, None
+    except Exception as e:
+        return full_path, None, str(e)
@@ -2,6 +2,7 @@
 
 import requests
 import logging
+from utils import http_client
 import locale
 import json
 import re
@@ -72,7 +73,7 @@ def _perform_tmdb_search(api_key, query, endpoint, language=None, year=None):
     try:
         logging.debug(f"TMDb API request ({lang_for_log}): Query='{query}', Lang='{language}', Year='{year or '?'}'")
         logging.debug(f"🚀 OUTGOING HEADERS: {HEADERS}")
-        response = requests.get(search_url, params=params, headers=HEADERS, timeout=10)
+        response = http_client.get(search_url, params=params, headers=HEADERS, timeout=10)
         response.raise_for_status()
         results = response.json().get("results", [])
         logging.debug(f"TMDb API response ({lang_for_log}): {len(results)} results found.")
@@ -161,7 +162,7 @@ def get_media_details(api_key, media_id, media_type):
     logging.debug(f"Fetching TMDb details (Primary: {primary_language}, including videos) for {media_type} ID {media_id}")
     primary_request_successful = False
     try:
-        response = requests.get(details_url, params=params, headers=HEADERS, timeout=10)
+        response = http_client.get(details_url, params=params, headers=HEADERS, timeout=10)
         if response.status_code == 404 and primary_language != "en":
              logging.warning(f"Details not found in {primary_language} (404), will fallback to English.")
         else:
@@ -195,7 +196,7 @@ def get_media_details(api_key, media_id, media_type):
         try:
             params_en = {"api_key": api_key, "language": "en-US", "append_to_response": "credits,videos"}
             logging.debug(f"Fetching TMDb details (English Fallback, including videos) for {media_type} ID {media_id}")
-            response_en = requests.get(details_url, params=params_en, headers=HEADERS, timeout=10)
+            response_en = http_client.get(details_url, params=params_en, headers=HEADERS, timeout=10)
             response_en.raise_for_status()
             data_en = response_en.json()
             if not merged_data:
@@ -295,7 +296,7 @@ def get_season_details(api_key, tv_id, season_number):
     data_primary = None
     try:
         logging.debug(f"Fetching season details (Primary: {SYSTEM_LANGUAGE}): TV ID {tv_id}, Season {season_number}")
-        response = requests.get(url, params=params, headers=HEADERS, timeout=10)
+        response = http_client.get(url, params=params, headers=HEADERS, timeout=10)
         if response.status_code == 200:
             data_primary = response.json()
     except requests.exceptions.RequestException as e:
@@ -313,7 +314,7 @@ def get_season_details(api_key, tv_id, season_number):
         try:
             params["language"] = "en"
             logging.debug(f"Fetching season details (English Fallback): TV ID {tv_id}, Season {season_number}")
-            response_en = requests.get(url, params=params, headers=HEADERS, timeout=10)
+            response_en = http_client.get(url, params=params, headers=HEADERS, timeout=10)
             if response_en.status_code == 200:
                 data_en = response_en.json()
         except Exception as e:
@@ -1,6 +1,5 @@
 # data_providers/trakt_client.py
 
-import requests
 import logging
 import time
 import threading
@@ -13,6 +12,7 @@ import re
 from gi.repository import GLib
 import database
 from core.config import get_trakt_client_id
+from utils import http_client
 
 import gettext
 _ = gettext.gettext
@@ -102,7 +102,7 @@ def _exchange_code_for_token(code, verifier, final_callback_on_main):
         "grant_type": "authorization_code"
     }
     try:
-        response = requests.post(url, json=payload, headers=HEADERS, timeout=10)
+        response = http_client.post(url, json=payload, headers=HEADERS, timeout=10)
         response.raise_for_status()
         token_data = response.json()
         logging.info("PKCE: Token successfully received and being saved to database.")
@@ -170,7 +170,7 @@ def _refresh_token(refresh_token):
         "grant_type": "refresh_token"
     }
     try:
-        response = requests.post(url, json=payload, headers=HEADERS, timeout=10)
+        response = http_client.post(url, json=payload, headers=HEADERS, timeout=10)
         response.raise_for_status()
         new_token_data = response.json()
         database.save_trakt_token(new_token_data)
@@ -221,7 +221,7 @@ def add_to_history(tmdb_id, media_type, callback_on_main=None):
     url = f"{TRAKT_API_URL}/sync/history"
     headers = _get_api_headers(token_data['access_token'])
     try:
-        response = requests.post(url, json=payload, headers=headers, timeout=10)
+        response = http_client.post(url, json=payload, headers=headers, timeout=10)
         if response.status_code == 401:
             logging.warning("Trakt: 401 Authorization Error received. Forcing token refresh...")
             database.clear_trakt_token()
@@ -229,7 +229,7 @@ def add_to_history(tmdb_id, media_type, callback_on_main=None):
             if new_token_data:
                 logging.info("Trakt: Retrying with new token...")
                 headers = _get_api_headers(new_token_data['access_token'])
-                response = requests.post(url, json=payload, headers=headers, timeout=10)
+                response = http_client.post(url, json=payload, headers=headers, timeout=10)
         response.raise_for_status()
         logging.info(f"Trakt: Success! Content with ID {tmdb_id} added to history. Response: {response.json()}")
         if callback_on_main: GLib.idle_add(callback_on_main, response.json(), None)
@@ -251,7 +251,7 @@ def get_watched_history(media_type, callback_on_main):
     url = f"{TRAKT_API_URL}/sync/history/{media_type}"
     headers = _get_api_headers(token_data['access_token'])
     try:
-        response = requests.get(url, headers=headers, timeout=15)
+        response = http_client.get(url, headers=headers, timeout=15)
         if response.status_code == 401:
             logging.warning("Trakt (History): 401 Authorization Error. Forcing token refresh...")
             database.clear_trakt_token()
@@ -259,7 +259,7 @@ def get_watched_history(media_type, callback_on_main):
             if new_token_data:
                 logging.info("Trakt (History): Retrying with new token...")
                 headers = _get_api_headers(new_token_data['access_token'])
-                response = requests.get(url, headers=headers, timeout=15)
+                response = http_client.get(url, headers=headers, timeout=15)
         response.raise_for_status()
         watched_data = response.json()
         logging.info(f"Trakt: Found {len(watched_data)} watched '{media_type}' items.")
@@ -2,6 +2,7 @@
 
 import requests
 import logging
+from utils import http_client
 
 def _get_api_data(profile_info, action):
     """A helper function to make requests to the Xtream Codes player API."""
@@ -17,7 +18,7 @@ def _get_api_data(profile_info, action):
         else:
             url = f"{host}/player_api.php?username={username}&password={password}"
         headers = {"User-Agent": "EngPlayer/1.0"}
-        response = requests.get(url, headers=headers, timeout=20)
+        response = http_client.get(url, headers=headers, timeout=20)
         response.raise_for_status()
         json_response = response.json()
         user_info = None
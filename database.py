@@ -6,9 +6,16 @@ import os
 import hashlib
 import secrets
 import time
+import threading
 from gi.repository import GLib
 import json
 _MEMORY_CACHE_PATH = None
+STATEMENT_CACHE_SIZE = 256
+DEFAULT_MAX_CONCURRENT_RECORDINGS = 4
+DEFAULT_MAX_RECORDINGS_PER_HOST = 2
+DEFAULT_MIN_FREE_RECORDING_SPACE_MB = 1024
+DEFAULT_INSTANT_RECORDING_HOURS = 6
+DEFAULT_POSTER_CACHE_LIMIT_MB = 512
 
 user_config_dir = GLib.get_user_config_dir()
 APP_CONFIG_DIR = os.path.join(user_config_dir, "EngPlayer")
@@ -17,31 +24,156 @@ CONFIG_DB_FILE = os.path.join(APP_CONFIG_DIR, "config.db")
 LIBRARY_DB_FILE = os.path.join(APP_CONFIG_DIR, "library.db")
 CURRENT_PROFILE_DB_FILE = None
 
-def get_config_db_connection():
-    """Connects to the global CONFIG database ('config.db')."""
-    conn = sqlite3.connect(CONFIG_DB_FILE, timeout=10)
+class _PooledConnection(sqlite3.Connection):
+    """
+    A connection that stays open for its thread. close() hands it back; when
+    the outermost user closes it, whatever was left uncommitted is rolled
+    back like a real close would, so the helpers below keep their
+    open/close pattern.
+    """
+    users = 0
+
+    def close(self):
+        self.users = max(0, self.users - 1)
+        if self.users == 0 and self.in_transaction:
+            self.rollback()
+
+    def release(self):
+        super().close()
+
+_pool = threading.local()
+_pool_generations = {}
+
+def _get_pooled_connection(db_path, foreign_keys=False):
+    """
+    Returns this thread's connection to db_path, opening it on first use with
+    WAL journaling, synchronous=NORMAL and a prepared statement cache.
+    """
+    connections = getattr(_pool, "connections", None)
+    if connections is None:
+        connections = _pool.connections = {}
+    generation = _pool_generations.get(db_path, 0)
+    entry = connections.get(db_path)
+    if entry and entry[1] == generation:
+        entry[0].users += 1
+        return entry[0]
+    if entry:
+        entry[0].release()
+    conn = sqlite3.connect(db_path, timeout=10, factory=_PooledConnection, cached_statements=STATEMENT_CACHE_SIZE)
     conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode = WAL")
+    conn.execute("PRAGMA synchronous = NORMAL")
+    if foreign_keys:
+        conn.execute("PRAGMA foreign_keys = ON")
+    conn.users = 1
+    connections[db_path] = (conn, generation)
     return conn
 
+def discard_pooled_connections(db_path):
+    """
+    Makes every thread reopen its connection to db_path on next use. Must be
+    called before a database file is deleted or replaced. The current
+    thread's connection is closed right away.
+    """
+    _pool_generations[db_path] = _pool_generations.get(db_path, 0) + 1
+    entry = getattr(_pool, "connections", {}).pop(db_path, None)
+    if entry:
+        entry[0].release()
+
+def get_config_db_connection():
+    """Returns this thread's connection to the global CONFIG database ('config.db')."""
+    return _get_pooled_connection(CONFIG_DB_FILE)
+
 def get_library_db_connection():
-    """Connects to the global LIBRARY database ('library.db')."""
-    conn = sqlite3.connect(LIBRARY_DB_FILE, timeout=10)
-    conn.row_factory = sqlite3.Row
-    conn.execute("PRAGMA foreign_keys = ON")
-    return conn
+    """Returns this thread's connection to the global LIBRARY database ('library.db')."""
+    return _get_pooled_connection(LIBRARY_DB_FILE, foreign_keys=True)
 
 def get_profile_db_connection():
-    """Connects to the active PROFILE's database ('profile_HASH.db')."""
+    """Returns this thread's connection to the active PROFILE's database ('profile_HASH.db')."""
     if CURRENT_PROFILE_DB_FILE is None:
         logging.error("CRITICAL ERROR: Profile database path is not set. set_active_profile_db must be called first.")
         raise Exception("Database path not set. Call set_active_profile_db first.")
-    conn = sqlite3.connect(CURRENT_PROFILE_DB_FILE, timeout=10)
-    conn.row_factory = sqlite3.Row
-    conn.execute("PRAGMA foreign_keys = ON")
-    return conn
+    return _get_pooled_connection(CURRENT_PROFILE_DB_FILE, foreign_keys=True)
+
+def _column_exists(cursor, table, column):
+    return any(row[1] == column for row in cursor.execute(f"PRAGMA table_info({table})").fetchall())
+
+def _add_column(cursor, table, column, definition):
+    if not _column_exists(cursor, table, column):
+        logging.info(f"Migrating '{table}': adding '{column}' column.")
+        cursor.execute(f"ALTER TABLE {table} ADD COLUMN {column} {definition}")
+
+def _library_migration_1(cursor):
+    """Columns that used to be added with try/except ALTER TABLE at startup."""
+    _add_column(cursor, "podcasts", "sort_order", "INTEGER DEFAULT 0")
+    _add_column(cursor, "podcasts", "image_url", "TEXT")
+    _add_column(cursor, "media_metadata", "seasons_json", "TEXT")
+    for table in ("media_files", "tracks"):
+        for column in ("file_size", "file_mtime", "file_inode"):
+            _add_column(cursor, table, column, "INTEGER")
+
+def _library_migration_2(cursor):
+    """Indexes for the lookups by library, album, artist and TMDb id."""
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_libraries_type ON libraries (type, name)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_media_files_library_id ON media_files (library_id)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_media_metadata_tmdb_id ON media_metadata (tmdb_id)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_albums_artist_id ON albums (artist_id, name)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_tracks_album_id ON tracks (album_id, track_number)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_tracks_library_id ON tracks (library_id)")
+
+def _profile_migration_1(cursor):
+    """Columns that used to be added with try/except ALTER TABLE at startup."""
+    _add_column(cursor, "favorite_lists", "sort_order", "INTEGER DEFAULT 0")
+    _add_column(cursor, "bouquet_properties", "is_hidden", "INTEGER DEFAULT 0")
+    _add_column(cursor, "scheduled_recordings", "program_name", "TEXT")
+
+def _profile_migration_2(cursor):
+    """Indexes for favorites, schedules, EPG mappings and the lock/hidden flags."""
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_favorite_channels_list ON favorite_channels (list_id, sort_order)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_scheduled_recordings_status ON scheduled_recordings (status, start_time)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_channel_properties_locked ON channel_properties (is_locked)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_bouquet_properties_hidden ON bouquet_properties (is_hidden)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_epg_channel_map_signature ON epg_channel_map (epg_signature)")
+
+def _profile_migration_3(cursor):
+    """Reason shown next to queued or failed recordings (written by the recorder daemon)."""
+    _add_column(cursor, "scheduled_recordings", "status_detail", "TEXT")
+
+# (user_version, migration) pairs, applied in order to databases with a lower PRAGMA user_version.
+LIBRARY_MIGRATIONS = [
+    (1, _library_migration_1),
+    (2, _library_migration_2),
+]
+PROFILE_MIGRATIONS = [
+    (1, _profile_migration_1),
+    (2, _profile_migration_2),
+    (3, _profile_migration_3),
+]
+
+def _run_migrations(conn, migrations, label):
+    """
+    Brings a database up to the latest schema version. Every migration runs
+    in its own transaction together with the PRAGMA user_version update,
+    so an interrupted upgrade resumes at the failed step.
+    """
+    version = conn.execute("PRAGMA user_version").fetchone()[0]
+    for target_version, migration in migrations:
+        if target_version <= version:
+            continue
+        cursor = conn.cursor()
+        cursor.execute("BEGIN")
+        try:
+            migration(cursor)
+            cursor.execute(f"PRAGMA user_version = {int(target_version)}")
+            conn.commit()
+        except sqlite3.Error:
+            conn.rollback()
+            raise
+        logging.info(f"Migrated {label} database to schema version {target_version}.")
 
 def _initialize_config_db():
     """Creates the global 'config.db' file and its tables."""
+    conn = None
     try:
         conn = get_config_db_connection()
         cursor = conn.cursor()
@@ -52,13 +184,16 @@ def _initialize_config_db():
             )
         """)
         conn.commit()
-        conn.close()
         logging.info(f"Global config database ('{CONFIG_DB_FILE}') initialized successfully.")
     except sqlite3.Error as e:
         logging.error(f"Error initializing global config database: {e}")
+    finally:
+        if conn is not None:
+            conn.close()
 
 def _initialize_library_db():
     """Creates the global 'library.db' file and its tables."""
+    conn = None
     try:
         conn = get_library_db_connection()
         cursor = conn.cursor()
@@ -77,6 +212,9 @@ def _initialize_library_db():
                 file_path TEXT NOT NULL UNIQUE,
                 title TEXT,
                 thumbnail_path TEXT,
+                file_size INTEGER,
+                file_mtime INTEGER,
+                file_inode INTEGER,
                 FOREIGN KEY (library_id) REFERENCES libraries (id) ON DELETE CASCADE
             )
         """)
@@ -120,6 +258,9 @@ def _initialize_library_db():
             track_number INTEGER,
             duration INTEGER,
             file_path TEXT NOT NULL UNIQUE,
+            file_size INTEGER,
+            file_mtime INTEGER,
+            file_inode INTEGER,
             FOREIGN KEY (album_id) REFERENCES albums (id) ON DELETE CASCADE
             )
         """)
@@ -131,27 +272,21 @@ def _initialize_library_db():
                 added_at INTEGER
             )
         """)
-        try:
-            cursor.execute("SELECT sort_order FROM podcasts LIMIT 1")
-        except sqlite3.OperationalError:
-            logging.info("Migrating 'podcasts' table: adding 'sort_order' column.")
-            cursor.execute("ALTER TABLE podcasts ADD COLUMN sort_order INTEGER DEFAULT 0")
-        try:
-            cursor.execute("SELECT seasons_json FROM media_metadata LIMIT 1")
-        except sqlite3.OperationalError:
-            logging.info("Migrating 'media_metadata': adding 'seasons_json' column.")
-            cursor.execute("ALTER TABLE media_metadata ADD COLUMN seasons_json TEXT")
         conn.commit()
-        conn.close()
+        _run_migrations(conn, LIBRARY_MIGRATIONS, "library")
         logging.info(f"Global library database ('{LIBRARY_DB_FILE}') initialized successfully.")
     except sqlite3.Error as e:
         logging.error(f"Error initializing global library database: {e}")
+    finally:
+        if conn is not None:
+            conn.close()
 
 def _initialize_profile_db():
     """Creates the active profile's 'profile_HASH.db' file and its tables."""
     if CURRENT_PROFILE_DB_FILE is None:
         logging.error("Failed to initialize profile database (path not set).")
         return
+    conn = None
     try:
         conn = get_profile_db_connection()
         cursor = conn.cursor()
@@ -168,12 +303,6 @@ def _initialize_profile_db():
                 sort_order INTEGER DEFAULT 0
             )
         """)
-        try:
-            cursor.execute("SELECT sort_order FROM favorite_lists LIMIT 1")
-        except sqlite3.OperationalError:
-            logging.info("Migrating 'favorite_lists' table: adding 'sort_order' column.")
-            cursor.execute("ALTER TABLE favorite_lists ADD COLUMN sort_order INTEGER DEFAULT 0")
-
         cursor.execute("""
             CREATE TABLE IF NOT EXISTS favorite_channels (
                 channel_url TEXT NOT NULL,
@@ -189,11 +318,6 @@ def _initialize_profile_db():
                 is_locked INTEGER DEFAULT 0
             )
         """)
-        try:
-            cursor.execute("SELECT is_hidden FROM bouquet_properties LIMIT 1")
-        except sqlite3.OperationalError:
-            logging.info("Migrating 'bouquet_properties': adding 'is_hidden' column.")
-            cursor.execute("ALTER TABLE bouquet_properties ADD COLUMN is_hidden INTEGER DEFAULT 0")
         cursor.execute("""
             CREATE TABLE IF NOT EXISTS favorite_list_properties (
                 list_id INTEGER PRIMARY KEY,
@@ -212,11 +336,6 @@ def _initialize_profile_db():
                 created_at INTEGER NOT NULL
             )
         """)
-        try:
-            cursor.execute("SELECT program_name FROM scheduled_recordings LIMIT 1")
-        except sqlite3.OperationalError:
-            logging.info("Migrating 'scheduled_recordings': adding 'program_name' column.")
-            cursor.execute("ALTER TABLE scheduled_recordings ADD COLUMN program_name TEXT")
         cursor.execute("""
         CREATE TABLE IF NOT EXISTS playback_progress (
             media_path TEXT PRIMARY KEY,
@@ -226,6 +345,13 @@ def _initialize_profile_db():
         )
         """)
         cursor.execute("""
+        CREATE TABLE IF NOT EXISTS epg_channel_map (
+            search_key TEXT PRIMARY KEY,
+            epg_channel_id TEXT,
+            epg_signature TEXT NOT NULL
+        )
+        """)
+        cursor.execute("""
         CREATE TABLE IF NOT EXISTS trakt_auth (
             id INTEGER PRIMARY KEY,
             access_token TEXT NOT NULL,
@@ -235,10 +361,13 @@ def _initialize_profile_db():
         )
         """)
         conn.commit()
-        conn.close()
+        _run_migrations(conn, PROFILE_MIGRATIONS, "profile")
         logging.info(f"Profile database ('{CURRENT_PROFILE_DB_FILE}') initialized successfully.")
     except sqlite3.Error as e:
         logging.error(f"Error initializing profile database: {e}")
+    finally:
+        if conn is not None:
+            conn.close()
 
 def initialize_database():
     """
@@ -262,21 +391,77 @@ def set_active_profile_db(profile_id):
     logging.info(f"Active profile database path set to: {CURRENT_PROFILE_DB_FILE}")
     _initialize_profile_db()
 
+_config_cache = None
+_config_lock = threading.Lock()
+_config_listeners = {}
+_next_config_listener_id = 1
+
+def _get_config_cache():
+    """Returns the in-memory copy of the 'config' table, loading it on first use."""
+    global _config_cache
+    cache = _config_cache
+    if cache is not None:
+        return cache
+    with _config_lock:
+        if _config_cache is None:
+            conn = get_config_db_connection()
+            try:
+                rows = conn.execute("SELECT key, value FROM config").fetchall()
+            finally:
+                conn.close()
+            _config_cache = {row["key"]: row["value"] for row in rows}
+        return _config_cache
+
+def invalidate_config_cache():
+    """Drops the in-memory config so the next read reloads it (for processes that do not write it themselves)."""
+    global _config_cache
+    with _config_lock:
+        _config_cache = None
+
+def connect_config_changed(callback, keys=None):
+    """
+    Registers callback(key, value), called after set_config_value changed a
+    value (for all keys, or only the given ones). It runs on the thread that
+    wrote the value. Returns an id for disconnect_config_changed.
+    """
+    global _next_config_listener_id
+    with _config_lock:
+        listener_id = _next_config_listener_id
+        _next_config_listener_id += 1
+        _config_listeners[listener_id] = (callback, frozenset(keys) if keys else None)
+    return listener_id
+
+def disconnect_config_changed(listener_id):
+    with _config_lock:
+        _config_listeners.pop(listener_id, None)
+
 def set_config_value(key, value):
+    value = str(value)
+    cache = _get_config_cache()
+    previous = cache.get(key)
     conn = get_config_db_connection()
     try:
-        conn.execute("INSERT INTO config (key, value) VALUES (?, ?) ON CONFLICT(key) DO UPDATE SET value=excluded.value", (key, str(value)))
+        conn.execute("INSERT INTO config (key, value) VALUES (?, ?) ON CONFLICT(key) DO UPDATE SET value=excluded.value", (key, value))
         conn.commit()
     except sqlite3.Error as e:
         logging.error(f"Failed to set config value for key '{key}': {e}")
+        return
     finally:
         conn.close()
+    cache[key] = value
+    if previous == value:
+        return
+    with _config_lock:
+        listeners = list(_config_listeners.values())
+    for callback, keys in listeners:
+        if keys is None or key in keys:
+            try:
+                callback(key, value)
+            except Exception as e:
+                logging.error(f"Config change listener failed for key '{key}': {e}")
 
 def get_config_value(key):
-    conn = get_config_db_connection()
-    value = conn.cursor().execute("SELECT value FROM config WHERE key = ?", (key,)).fetchone()
-    conn.close()
-    return value[0] if value else None
+    return _get_config_cache().get(key)
 
 def set_password(password):
     salt = secrets.token_hex(16)
@@ -321,6 +506,13 @@ def get_use_poster_disk_cache_status():
     value = get_config_value('use_poster_disk_cache')
     return value == '1'
 
+def get_poster_cache_limit_mb():
+    """Returns the size limit of the poster disk cache in MB (default: 512, 0 = no limit)."""
+    value = get_config_value('poster_cache_limit_mb')
+    if value and value.isdigit():
+        return int(value)
+    return DEFAULT_POSTER_CACHE_LIMIT_MB
+
 def get_show_locked_bouquets_status():
     value = get_config_value('show_locked_bouquets')
     if value is None:
@@ -348,24 +540,30 @@ def add_library(path, library_type, name):
 
 def get_all_libraries():
     conn = get_library_db_connection()
-    cursor = conn.cursor()
-    cursor.execute("SELECT * FROM libraries")
-    libraries = cursor.fetchall()
-    conn.close()
-    return libraries
+    try:
+        cursor = conn.cursor()
+        cursor.execute("SELECT * FROM libraries")
+        libraries = cursor.fetchall()
+        return libraries
+    finally:
+        conn.close()
+
+SQL_MEDIA_FILES_BY_TYPE = """
+    SELECT mf.file_path, mf.title
+    FROM media_files mf
+    JOIN libraries l ON mf.library_id = l.id
+    WHERE l.type = ?
+"""
 
 def get_media_files_by_type(library_type):
     conn = get_library_db_connection()
-    cursor = conn.cursor()
-    cursor.execute("""
-        SELECT mf.file_path, mf.title
-        FROM media_files mf
-        JOIN libraries l ON mf.library_id = l.id
-        WHERE l.type = ?
-    """, (library_type,))
-    media_files = cursor.fetchall()
-    conn.close()
-    return media_files
+    try:
+        cursor = conn.cursor()
+        cursor.execute(SQL_MEDIA_FILES_BY_TYPE, (library_type,))
+        media_files = cursor.fetchall()
+        return media_files
+    finally:
+        conn.close()
 
 def add_media_file(library_id, file_path):
     conn = get_library_db_connection()
@@ -382,13 +580,15 @@ def add_media_file(library_id, file_path):
 
 def media_library_is_empty(library_type):
     conn = get_library_db_connection()
-    result = conn.execute("""
-        SELECT EXISTS (
-            SELECT 1 FROM media_files mf JOIN libraries l ON mf.library_id = l.id WHERE l.type = ?
-        )
-    """, (library_type,)).fetchone()
-    conn.close()
-    return result[0] == 0 
+    try:
+        result = conn.execute("""
+            SELECT EXISTS (
+                SELECT 1 FROM media_files mf JOIN libraries l ON mf.library_id = l.id WHERE l.type = ?
+            )
+        """, (library_type,)).fetchone()
+        return result[0] == 0 
+    finally:
+        conn.close()
 
 def save_metadata(media_path, metadata):
     if not metadata: return
@@ -426,30 +626,36 @@ def save_metadata(media_path, metadata):
     finally:
         conn.close()
 
+SQL_METADATA_BY_PATH = "SELECT * FROM media_metadata WHERE media_path = ?"
+
 def get_metadata(media_path):
     conn = get_library_db_connection()
-    cursor = conn.cursor()
-    cursor.execute("SELECT * FROM media_metadata WHERE media_path = ?", (media_path,))
-    data = cursor.fetchone()
-    conn.close()
-    return data
+    try:
+        cursor = conn.cursor()
+        cursor.execute(SQL_METADATA_BY_PATH, (media_path,))
+        data = cursor.fetchone()
+        return data
+    finally:
+        conn.close()
 
 def get_media_files_with_metadata_by_type(library_type):
     conn = get_library_db_connection()
-    cursor = conn.cursor()
-    cursor.execute("""
-        SELECT
-            mf.file_path,
-            mf.title,
-            meta.poster_path
-        FROM media_files mf
-        JOIN libraries l ON mf.library_id = l.id
-        LEFT JOIN media_metadata meta ON mf.file_path = meta.media_path
-        WHERE l.type = ?
-    """, (library_type,))
-    media_files = cursor.fetchall()
-    conn.close()
-    return media_files
+    try:
+        cursor = conn.cursor()
+        cursor.execute("""
+            SELECT
+                mf.file_path,
+                mf.title,
+                meta.poster_path
+            FROM media_files mf
+            JOIN libraries l ON mf.library_id = l.id
+            LEFT JOIN media_metadata meta ON mf.file_path = meta.media_path
+            WHERE l.type = ?
+        """, (library_type,))
+        media_files = cursor.fetchall()
+        return media_files
+    finally:
+        conn.close()
 
 def clear_metadata_for_path(media_path):
     conn = get_library_db_connection()
@@ -464,135 +670,204 @@ def clear_metadata_for_path(media_path):
 
 def get_all_albums():
     conn = get_library_db_connection()
-    cursor = conn.cursor()
-    cursor.execute("""
-        SELECT
-            a.id as album_id, a.name as album_name, a.album_art_path, ar.name as artist_name
-        FROM albums a
-        JOIN artists ar ON a.artist_id = ar.id
-        ORDER BY ar.name, a.name
-    """)
-    albums = cursor.fetchall()
-    conn.close()
-    return albums
+    try:
+        cursor = conn.cursor()
+        cursor.execute("""
+            SELECT
+                a.id as album_id, a.name as album_name, a.album_art_path, ar.name as artist_name
+            FROM albums a
+            JOIN artists ar ON a.artist_id = ar.id
+            ORDER BY ar.name, a.name
+        """)
+        albums = cursor.fetchall()
+        return albums
+    finally:
+        conn.close()
+
+SQL_TRACKS_FOR_ALBUM = """
+    SELECT * FROM tracks
+    WHERE album_id = ?
+    ORDER BY track_number
+"""
 
 def get_tracks_for_album(album_id):
     conn = get_library_db_connection()
-    cursor = conn.cursor()
-    cursor.execute("""
-        SELECT * FROM tracks
-        WHERE album_id = ?
-        ORDER BY track_number
-    """, (album_id,))
-    tracks = cursor.fetchall()
-    conn.close()
-    return tracks
+    try:
+        cursor = conn.cursor()
+        cursor.execute(SQL_TRACKS_FOR_ALBUM, (album_id,))
+        tracks = cursor.fetchall()
+        return tracks
+    finally:
+        conn.close()
 
 def get_album_details(album_id):
     conn = get_library_db_connection()
-    cursor = conn.cursor()
-    cursor.execute("""
-        SELECT a.name as album_name, a.album_art_path, ar.name as artist_name
-        FROM albums a
-        JOIN artists ar ON a.artist_id = ar.id
-        WHERE a.id = ?
-    """, (album_id,))
-    album = cursor.fetchone()
-    conn.close()
-    return album
+    try:
+        cursor = conn.cursor()
+        cursor.execute("""
+            SELECT a.name as album_name, a.album_art_path, ar.name as artist_name
+            FROM albums a
+            JOIN artists ar ON a.artist_id = ar.id
+            WHERE a.id = ?
+        """, (album_id,))
+        album = cursor.fetchone()
+        return album
+    finally:
+        conn.close()
+
+SQL_LIBRARIES_BY_TYPE = "SELECT * FROM libraries WHERE type = ? ORDER BY name"
 
 def get_libraries_by_type(library_type):
     conn = get_library_db_connection()
-    cursor = conn.cursor()
-    cursor.execute(
-        "SELECT * FROM libraries WHERE type = ? ORDER BY name",
-        (library_type,)
-    )
-    libraries = cursor.fetchall()
-    conn.close()
-    return libraries
+    try:
+        cursor = conn.cursor()
+        cursor.execute(SQL_LIBRARIES_BY_TYPE, (library_type,))
+        libraries = cursor.fetchall()
+        return libraries
+    finally:
+        conn.close()
+
+SQL_MEDIA_FILES_BY_LIBRARY_ID = """
+    SELECT
+        mf.file_path, mf.title, meta.poster_path
+    FROM media_files mf
+    JOIN libraries l ON mf.library_id = l.id
+    LEFT JOIN media_metadata meta ON mf.file_path = meta.media_path
+    WHERE l.id = ?
+"""
 
 def get_media_files_by_library_id(library_id):
     conn = get_library_db_connection()
-    cursor = conn.cursor()
-    cursor.execute("""
-        SELECT
-            mf.file_path, mf.title, meta.poster_path
-        FROM media_files mf
-        JOIN libraries l ON mf.library_id = l.id
-        LEFT JOIN media_metadata meta ON mf.file_path = meta.media_path
-        WHERE l.id = ?
-    """, (library_id,))
-    media_files = cursor.fetchall()
-    conn.close()
-    return media_files
+    try:
+        cursor = conn.cursor()
+        cursor.execute(SQL_MEDIA_FILES_BY_LIBRARY_ID, (library_id,))
+        media_files = cursor.fetchall()
+        return media_files
+    finally:
+        conn.close()
+
+SQL_ALBUMS_BY_LIBRARY_ID = """
+    SELECT DISTINCT
+        a.id as album_id, a.name as album_name, a.album_art_path, ar.name as artist_name
+    FROM albums a
+    JOIN artists ar ON a.artist_id = ar.id
+    JOIN tracks t ON a.id = t.album_id
+    WHERE t.library_id = ?
+    ORDER BY ar.name, a.name
+"""
 
 def get_albums_by_library_id(library_id):
     conn = get_library_db_connection()
-    cursor = conn.cursor()
-    cursor.execute("""
-        SELECT DISTINCT
-            a.id as album_id, a.name as album_name, a.album_art_path, ar.name as artist_name
-        FROM albums a
-        JOIN artists ar ON a.artist_id = ar.id
-        JOIN tracks t ON a.id = t.album_id
-        WHERE t.library_id = ?
-        ORDER BY ar.name, a.name
-    """, (library_id,))
-    albums = cursor.fetchall()
-    conn.close()
-    return albums
+    try:
+        cursor = conn.cursor()
+        cursor.execute(SQL_ALBUMS_BY_LIBRARY_ID, (library_id,))
+        albums = cursor.fetchall()
+        return albums
+    finally:
+        conn.close()
 
-def delete_library(library_id):
+SQL_DELETE_ORPHAN_ALBUM = "DELETE FROM albums WHERE id = ? AND NOT EXISTS (SELECT 1 FROM tracks WHERE tracks.album_id = albums.id)"
+SQL_DELETE_ORPHAN_ARTIST = "DELETE FROM artists WHERE id = ? AND NOT EXISTS (SELECT 1 FROM albums WHERE albums.artist_id = artists.id)"
+
+def cleanup_orphan_albums(cursor, album_ids):
+    """
+    Deletes the given albums if they have no tracks left, then their
+    artists if they have no albums left. Only the affected rows are checked,
+    with indexed NOT EXISTS lookups. Returns (albums, artists) deleted.
+    """
+    album_ids = list(set(album_ids))
+    if not album_ids:
+        return 0, 0
+    artist_ids = set()
+    for start in range(0, len(album_ids), 500):
+        chunk = album_ids[start:start + 500]
+        placeholders = ",".join("?" * len(chunk))
+        artist_ids.update(row[0] for row in cursor.execute(
+            f"SELECT DISTINCT artist_id FROM albums WHERE id IN ({placeholders})", chunk))
+    cursor.executemany(SQL_DELETE_ORPHAN_ALBUM, [(album_id,) for album_id in album_ids])
+    albums_deleted = cursor.rowcount
+    cursor.executemany(SQL_DELETE_ORPHAN_ARTIST, [(artist_id,) for artist_id in artist_ids])
+    return albums_deleted, cursor.rowcount
+
+SQL_ALBUM_IDS_BY_LIBRARY_ID = "SELECT DISTINCT album_id FROM tracks WHERE library_id = ?"
+
+def delete_libraries(library_ids):
+    """Deletes several libraries with their tracks and media files in one transaction."""
+    library_ids = list(library_ids)
     conn = get_library_db_connection()
     try:
         with conn:
             cursor = conn.cursor()
-            cursor.execute("DELETE FROM tracks WHERE library_id = ?", (library_id,))
-            logging.info(f"{cursor.rowcount} track records deleted for library (ID: {library_id}).")
-            cursor.execute("DELETE FROM libraries WHERE id = ?", (library_id,))
-            logging.info(f"Library (ID: {library_id}) and associated media files deleted.")
-            cursor.execute("DELETE FROM albums WHERE id NOT IN (SELECT DISTINCT album_id FROM tracks)")
-            logging.info(f"{cursor.rowcount} orphan albums cleaned up.")
-            cursor.execute("DELETE FROM artists WHERE id NOT IN (SELECT DISTINCT artist_id FROM albums)")
-            logging.info(f"{cursor.rowcount} orphan artists cleaned up.")
+            album_ids = []
+            for library_id in library_ids:
+                album_ids.extend(row[0] for row in cursor.execute(SQL_ALBUM_IDS_BY_LIBRARY_ID, (library_id,)))
+            cursor.executemany("DELETE FROM tracks WHERE library_id = ?", [(library_id,) for library_id in library_ids])
+            logging.info(f"{cursor.rowcount} track records deleted for libraries (IDs: {library_ids}).")
+            cursor.executemany("DELETE FROM libraries WHERE id = ?", [(library_id,) for library_id in library_ids])
+            logging.info(f"Libraries (IDs: {library_ids}) and associated media files deleted.")
+            albums_deleted, artists_deleted = cleanup_orphan_albums(cursor, album_ids)
+            logging.info(f"{albums_deleted} orphan albums and {artists_deleted} orphan artists cleaned up.")
         return True
     except sqlite3.Error as e:
-        logging.error(f"Error deleting library (ID: {library_id}): {e}")
+        logging.error(f"Error deleting libraries (IDs: {library_ids}): {e}")
         return False
     finally:
         conn.close()
 
-def delete_media_file_record(file_path):
+def delete_library(library_id):
+    return delete_libraries([library_id])
+
+SQL_DELETE_MEDIA_FILE = "DELETE FROM media_files WHERE file_path = ?"
+
+def delete_media_file_records(file_paths):
+    """Deletes the records of several video/picture files in one transaction."""
+    file_paths = list(file_paths)
     conn = get_library_db_connection()
     try:
         with conn:
-            cursor = conn.cursor()
-            cursor.execute("DELETE FROM media_files WHERE file_path = ?", (file_path,))
-        logging.info(f"Media record deleted: {file_path}")
+            conn.executemany(SQL_DELETE_MEDIA_FILE, [(path,) for path in file_paths])
+        logging.info(f"{len(file_paths)} media record(s) deleted.")
         return True
     except sqlite3.Error as e:
-        logging.error(f"Error deleting media record: {e}")
+        logging.error(f"Error deleting media records: {e}")
         return False
     finally:
         conn.close()
 
-def delete_track_record(file_path):
+def delete_media_file_record(file_path):
+    return delete_media_file_records([file_path])
+
+SQL_ALBUM_IDS_BY_TRACK_PATHS = "SELECT DISTINCT album_id FROM tracks WHERE file_path IN ({placeholders})"
+
+def delete_track_records(file_paths):
+    """
+    Deletes the records of several tracks in one transaction and removes the
+    albums and artists that were left empty by it.
+    """
+    file_paths = list(file_paths)
     conn = get_library_db_connection()
     try:
         with conn:
             cursor = conn.cursor()
-            cursor.execute("DELETE FROM tracks WHERE file_path = ?", (file_path,))
-            cursor.execute("DELETE FROM albums WHERE id NOT IN (SELECT DISTINCT album_id FROM tracks)")
-            cursor.execute("DELETE FROM artists WHERE id NOT IN (SELECT DISTINCT artist_id FROM albums)")
-        logging.info(f"Track record deleted and cleaned up: {file_path}")
+            album_ids = []
+            for start in range(0, len(file_paths), 500):
+                chunk = file_paths[start:start + 500]
+                placeholders = ",".join("?" * len(chunk))
+                album_ids.extend(row[0] for row in cursor.execute(
+                    SQL_ALBUM_IDS_BY_TRACK_PATHS.format(placeholders=placeholders), chunk))
+            cursor.executemany("DELETE FROM tracks WHERE file_path = ?", [(path,) for path in file_paths])
+            cleanup_orphan_albums(cursor, album_ids)
+        logging.info(f"{len(file_paths)} track record(s) deleted and cleaned up.")
         return True
     except sqlite3.Error as e:
-        logging.error(f"Error deleting track record: {e}")
+        logging.error(f"Error deleting track records: {e}")
         return False
     finally:
         conn.close()
 
+def delete_track_record(file_path):
+    return delete_track_records([file_path])
+
 def set_channel_lock_status(channel_url, is_locked):
     conn = get_profile_db_connection()
     try:
@@ -608,21 +883,29 @@ def set_channel_lock_status(channel_url, is_locked):
 
 def get_channel_lock_status(channel_url):
     conn = get_profile_db_connection()
-    props = conn.cursor().execute("SELECT is_locked FROM channel_properties WHERE channel_url = ?", (channel_url,)).fetchone()
-    conn.close()
-    return bool(props["is_locked"]) if props else False
+    try:
+        props = conn.cursor().execute("SELECT is_locked FROM channel_properties WHERE channel_url = ?", (channel_url,)).fetchone()
+        return bool(props["is_locked"]) if props else False
+    finally:
+        conn.close()
+
+SQL_CHANNEL_IN_ANY_FAVORITE = "SELECT 1 FROM favorite_channels WHERE channel_url = ? LIMIT 1"
 
 def is_channel_in_any_favorite(channel_url):
     conn = get_profile_db_connection()
-    result = conn.cursor().execute("SELECT 1 FROM favorite_channels WHERE channel_url = ? LIMIT 1", (channel_url,)).fetchone()
-    conn.close()
-    return result is not None
+    try:
+        result = conn.cursor().execute(SQL_CHANNEL_IN_ANY_FAVORITE, (channel_url,)).fetchone()
+        return result is not None
+    finally:
+        conn.close()
 
 def get_all_favorite_lists():
     conn = get_profile_db_connection()
-    lists = conn.cursor().execute("SELECT list_id, list_name FROM favorite_lists ORDER BY sort_order ASC, list_name ASC").fetchall()
-    conn.close()
-    return lists
+    try:
+        lists = conn.cursor().execute("SELECT list_id, list_name FROM favorite_lists ORDER BY sort_order ASC, list_name ASC").fetchall()
+        return lists
+    finally:
+        conn.close()
 
 def create_favorite_list(list_name):
     conn = get_profile_db_connection()
@@ -641,12 +924,14 @@ def create_favorite_list(list_name):
     finally:
         conn.close()
 
+SQL_MAX_CHANNEL_ORDER_IN_LIST = "SELECT MAX(sort_order) as max_order FROM favorite_channels WHERE list_id = ?"
+
 def add_channel_to_list(channel_url, list_id):
     conn = get_profile_db_connection()
     try:
         with conn:
             cursor = conn.cursor()
-            cursor.execute("SELECT MAX(sort_order) as max_order FROM favorite_channels WHERE list_id = ?", (list_id,))
+            cursor.execute(SQL_MAX_CHANNEL_ORDER_IN_LIST, (list_id,))
             result = cursor.fetchone()
             new_order = (result['max_order'] or 0) + 1
             conn.execute(
@@ -659,14 +944,15 @@ def add_channel_to_list(channel_url, list_id):
     finally:
         conn.close()
 
+SQL_CHANNELS_IN_LIST = "SELECT channel_url FROM favorite_channels WHERE list_id = ? ORDER BY sort_order ASC"
+
 def get_channels_in_list(list_id):
     conn = get_profile_db_connection()
-    urls = conn.execute(
-        "SELECT channel_url FROM favorite_channels WHERE list_id = ? ORDER BY sort_order ASC", 
-        (list_id,)
-    ).fetchall()
-    conn.close()
-    return [row['channel_url'] for row in urls]
+    try:
+        urls = conn.execute(SQL_CHANNELS_IN_LIST, (list_id,)).fetchall()
+        return [row['channel_url'] for row in urls]
+    finally:
+        conn.close()
 
 def set_bouquet_lock_status(bouquet_name, is_locked):
     conn = get_profile_db_connection()
@@ -681,9 +967,11 @@ def set_bouquet_lock_status(bouquet_name, is_locked):
 
 def get_bouquet_lock_status(bouquet_name):
     conn = get_profile_db_connection()
-    props = conn.cursor().execute("SELECT is_locked FROM bouquet_properties WHERE bouquet_name = ?", (bouquet_name,)).fetchone()
-    conn.close()
-    return bool(props["is_locked"]) if props else False
+    try:
+        props = conn.cursor().execute("SELECT is_locked FROM bouquet_properties WHERE bouquet_name = ?", (bouquet_name,)).fetchone()
+        return bool(props["is_locked"]) if props else False
+    finally:
+        conn.close()
 
 def set_favorite_list_lock_status(list_id, is_locked):
     conn = get_profile_db_connection()
@@ -698,9 +986,11 @@ def set_favorite_list_lock_status(list_id, is_locked):
 
 def get_favorite_list_lock_status(list_id):
     conn = get_profile_db_connection()
-    props = conn.cursor().execute("SELECT is_locked FROM favorite_list_properties WHERE list_id = ?", (list_id,)).fetchone()
-    conn.close()
-    return bool(props["is_locked"]) if props else False 
+    try:
+        props = conn.cursor().execute("SELECT is_locked FROM favorite_list_properties WHERE list_id = ?", (list_id,)).fetchone()
+        return bool(props["is_locked"]) if props else False 
+    finally:
+        conn.close()
 
 def remove_channel_from_list(channel_url, list_id):
     conn = get_profile_db_connection()
@@ -725,9 +1015,11 @@ def delete_favorite_list(list_id):
 
 def is_channel_in_list(channel_url, list_id):
     conn = get_profile_db_connection()
-    result = conn.cursor().execute("SELECT 1 FROM favorite_channels WHERE channel_url = ? AND list_id = ? LIMIT 1", (channel_url, list_id)).fetchone()
-    conn.close()
-    return result is not None
+    try:
+        result = conn.cursor().execute("SELECT 1 FROM favorite_channels WHERE channel_url = ? AND list_id = ? LIMIT 1", (channel_url, list_id)).fetchone()
+        return result is not None
+    finally:
+        conn.close()
 
 def add_scheduled_recording(profile_id, channel_name, channel_url, start_time, end_time, program_name=None):
     conn = get_profile_db_connection()
@@ -749,22 +1041,26 @@ def add_scheduled_recording(profile_id, channel_name, channel_url, start_time, e
 
 def get_all_scheduled_recordings():
     conn = get_profile_db_connection()
-    cursor = conn.cursor()
-    cursor.execute("SELECT * FROM scheduled_recordings ORDER BY created_at DESC")
-    recordings = cursor.fetchall()
-    conn.close()
-    return recordings
+    try:
+        cursor = conn.cursor()
+        cursor.execute("SELECT * FROM scheduled_recordings ORDER BY created_at DESC")
+        recordings = cursor.fetchall()
+        return recordings
+    finally:
+        conn.close()
+
+SQL_PENDING_RECORDINGS_DUE = "SELECT * FROM scheduled_recordings WHERE status = 'pending' AND start_time <= ?"
 
 def get_pending_recordings_to_start():
     conn = get_profile_db_connection()
-    cursor = conn.cursor()
-    now = int(time.time())
-    cursor.execute(
-        "SELECT * FROM scheduled_recordings WHERE status = 'pending' AND start_time <= ?", (now,)
-    )
-    recordings = cursor.fetchall()
-    conn.close()
-    return recordings
+    try:
+        cursor = conn.cursor()
+        now = int(time.time())
+        cursor.execute(SQL_PENDING_RECORDINGS_DUE, (now,))
+        recordings = cursor.fetchall()
+        return recordings
+    finally:
+        conn.close()
 
 def update_recording_status(recording_id, status):
     conn = get_profile_db_connection()
@@ -777,6 +1073,26 @@ def update_recording_status(recording_id, status):
     finally:
         conn.close()
 
+def update_recording_end_time(recording_id, end_time):
+    conn = get_profile_db_connection()
+    try:
+        with conn:
+            updated = conn.execute(
+                """UPDATE scheduled_recordings SET end_time = ?
+                   WHERE id = ? AND status IN ('pending', 'recording') AND start_time < ?""",
+                (int(end_time), recording_id, int(end_time))
+            ).rowcount
+        if not updated:
+            logging.warning(f"Recording ID {recording_id} cannot be extended to {end_time}.")
+            return False
+        logging.info(f"Recording ID {recording_id} end time updated: {end_time}")
+        return True
+    except sqlite3.Error as e:
+        logging.error(f"Failed to update recording end time: {e}")
+        return False
+    finally:
+        conn.close()
+
 def delete_scheduled_recording(recording_id):
     conn = get_profile_db_connection()
     try:
@@ -788,29 +1104,72 @@ def delete_scheduled_recording(recording_id):
     finally:
         conn.close()
 
+SQL_ACTIVE_RECORDINGS = "SELECT * FROM scheduled_recordings WHERE status = 'recording'"
+
 def get_active_recordings():
     conn = get_profile_db_connection()
-    cursor = conn.cursor()
-    cursor.execute("SELECT * FROM scheduled_recordings WHERE status = 'recording'")
-    recordings = cursor.fetchall()
-    conn.close()
-    return recordings
+    try:
+        cursor = conn.cursor()
+        cursor.execute(SQL_ACTIVE_RECORDINGS)
+        recordings = cursor.fetchall()
+        return recordings
+    finally:
+        conn.close()
 
 def get_all_favorite_channel_urls():
     conn = get_profile_db_connection()
-    cursor = conn.cursor()
-    cursor.execute("SELECT DISTINCT channel_url FROM favorite_channels")
-    urls = {row['channel_url'] for row in cursor.fetchall()}
-    conn.close()
-    return urls
+    try:
+        cursor = conn.cursor()
+        cursor.execute("SELECT DISTINCT channel_url FROM favorite_channels")
+        urls = {row['channel_url'] for row in cursor.fetchall()}
+        return urls
+    finally:
+        conn.close()
+
+SQL_LOCKED_CHANNEL_URLS = "SELECT channel_url FROM channel_properties WHERE is_locked = 1"
 
 def get_all_locked_channel_urls():
     conn = get_profile_db_connection()
-    cursor = conn.cursor()
-    cursor.execute("SELECT channel_url FROM channel_properties WHERE is_locked = 1")
-    urls = {row['channel_url'] for row in cursor.fetchall()}
-    conn.close()
-    return urls
+    try:
+        cursor = conn.cursor()
+        cursor.execute(SQL_LOCKED_CHANNEL_URLS)
+        urls = {row['channel_url'] for row in cursor.fetchall()}
+        return urls
+    finally:
+        conn.close()
+
+SQL_EPG_CHANNEL_MAP = "SELECT search_key, epg_channel_id FROM epg_channel_map WHERE epg_signature = ?"
+
+def get_epg_channel_map(epg_signature):
+    """
+    Returns the persisted search_key -> EPG channel ID map that was resolved
+    against the EPG store identified by epg_signature. Unmatched keys map to None.
+    """
+    conn = get_profile_db_connection()
+    try:
+        cursor = conn.cursor()
+        cursor.execute(SQL_EPG_CHANNEL_MAP, (epg_signature,))
+        return {row['search_key']: row['epg_channel_id'] for row in cursor.fetchall()}
+    except sqlite3.Error as e:
+        logging.error(f"Failed to load EPG channel map: {e}")
+        return {}
+    finally:
+        conn.close()
+
+def save_epg_channel_map(epg_signature, channel_map):
+    """Stores resolved EPG channel IDs, dropping entries resolved against an older EPG store."""
+    conn = get_profile_db_connection()
+    try:
+        with conn:
+            conn.execute("DELETE FROM epg_channel_map WHERE epg_signature != ?", (epg_signature,))
+            conn.executemany(
+                "INSERT OR REPLACE INTO epg_channel_map (search_key, epg_channel_id, epg_signature) VALUES (?, ?, ?)",
+                ((search_key, epg_channel_id, epg_signature) for search_key, epg_channel_id in channel_map.items())
+            )
+    except sqlite3.Error as e:
+        logging.error(f"Failed to save EPG channel map: {e}")
+    finally:
+        conn.close()
 
 def save_playback_progress(media_path, position, is_finished=0):
     conn = get_profile_db_connection()
@@ -829,12 +1188,16 @@ def save_playback_progress(media_path, position, is_finished=0):
     finally:
         conn.close()
 
+SQL_PLAYBACK_POSITION = "SELECT last_position FROM playback_progress WHERE media_path = ? AND is_finished = 0"
+
 def get_playback_position(media_path):
     conn = get_profile_db_connection()
-    cursor = conn.cursor()
-    cursor.execute("SELECT last_position FROM playback_progress WHERE media_path = ? AND is_finished = 0", (media_path,))
-    data = cursor.fetchone()
-    conn.close()
+    try:
+        cursor = conn.cursor()
+        cursor.execute(SQL_PLAYBACK_POSITION, (media_path,))
+        data = cursor.fetchone()
+    finally:
+        conn.close()
     if data and data['last_position'] > 10:
         return data['last_position']
     return None
@@ -850,6 +1213,8 @@ def delete_playback_position(media_path):
     finally:
         conn.close()
 
+SQL_WATCHED_PATHS = "SELECT media_path FROM playback_progress WHERE media_path IN ({placeholders}) AND is_finished = 1"
+
 def get_watched_status_batch(media_paths):
     """
     Returns a set of media paths from the given list that are marked as
@@ -860,7 +1225,7 @@ def get_watched_status_batch(media_paths):
     conn = get_profile_db_connection()
     cursor = conn.cursor()
     placeholders = ','.join('?' for _ in media_paths)
-    query = f"SELECT media_path FROM playback_progress WHERE media_path IN ({placeholders}) AND is_finished = 1"
+    query = SQL_WATCHED_PATHS.format(placeholders=placeholders)
     try:
         cursor.execute(query, media_paths)
         watched_set = {row['media_path'] for row in cursor.fetchall()}
@@ -965,6 +1330,8 @@ def clear_trakt_token():
     finally:
         conn.close()
 
+SQL_PATHS_FOR_TMDB_IDS = "SELECT media_path FROM media_metadata WHERE tmdb_id IN ({placeholders})"
+
 def get_paths_for_tmdb_ids(tmdb_id_list):
     """Returns the file paths corresponding to the given list of TMDb IDs."""
     if not tmdb_id_list:
@@ -972,7 +1339,7 @@ def get_paths_for_tmdb_ids(tmdb_id_list):
     conn = get_library_db_connection()
     try:
         placeholders = ','.join('?' for _ in tmdb_id_list)
-        query = f"SELECT media_path FROM media_metadata WHERE tmdb_id IN ({placeholders})"
+        query = SQL_PATHS_FOR_TMDB_IDS.format(placeholders=placeholders)
         cursor = conn.cursor()
         cursor.execute(query, tmdb_id_list)
         paths = [row['media_path'] for row in cursor.fetchall()]
@@ -1024,6 +1391,34 @@ def get_notification_timeout():
         return int(val)
     return 3
 
+def get_max_concurrent_recordings():
+    """Returns how many recordings may run at once (default: 4, 0 = no limit)."""
+    val = get_config_value('max_concurrent_recordings')
+    if val and val.isdigit():
+        return int(val)
+    return DEFAULT_MAX_CONCURRENT_RECORDINGS
+
+def get_max_recordings_per_host():
+    """Returns how many recordings may run at once from one provider host (default: 2, 0 = no limit)."""
+    val = get_config_value('max_recordings_per_host')
+    if val and val.isdigit():
+        return int(val)
+    return DEFAULT_MAX_RECORDINGS_PER_HOST
+
+def get_min_free_recording_space_mb():
+    """Returns the free space (MB) the recordings folder needs before a recording starts (default: 1024)."""
+    val = get_config_value('min_free_recording_space_mb')
+    if val and val.isdigit():
+        return int(val)
+    return DEFAULT_MIN_FREE_RECORDING_SPACE_MB
+
+def get_instant_recording_hours():
+    """Returns how long a recording started with the record button runs before it stops (hours, default: 6)."""
+    val = get_config_value('instant_recording_hours')
+    if val and val.isdigit() and int(val) > 0:
+        return int(val)
+    return DEFAULT_INSTANT_RECORDING_HOURS
+
 def swap_favorite_list_order(list_id_1, list_id_2):
     """
     Swaps the sort_order of two favorite lists.
@@ -1108,20 +1503,7 @@ def swap_podcast_order(podcast_id_1, podcast_id_2):
     finally:
         conn.close()
 
-def migrate_podcast_images():
-    conn = get_library_db_connection()
-    try:
-        cursor = conn.cursor()
-        cursor.execute("SELECT image_url FROM podcasts LIMIT 1")
-    except sqlite3.OperationalError:
-        logging.info("Migrating 'podcasts' table: adding 'image_url' column.")
-        conn.execute("ALTER TABLE podcasts ADD COLUMN image_url TEXT")
-        conn.commit()
-    finally:
-        conn.close()
-
 def add_podcast(title, url, image_url=None):
-    migrate_podcast_images()   
     conn = get_library_db_connection()
     try:
         with conn:
@@ -1142,13 +1524,14 @@ def add_podcast(title, url, image_url=None):
         conn.close()
 
 def get_all_podcasts():
-    migrate_podcast_images()    
     conn = get_library_db_connection()
-    cursor = conn.cursor()
-    cursor.execute("SELECT id, title, url, added_at, sort_order, image_url FROM podcasts ORDER BY sort_order ASC, id DESC")
-    podcasts = cursor.fetchall()
-    conn.close()
-    return podcasts
+    try:
+        cursor = conn.cursor()
+        cursor.execute("SELECT id, title, url, added_at, sort_order, image_url FROM podcasts ORDER BY sort_order ASC, id DESC")
+        podcasts = cursor.fetchall()
+        return podcasts
+    finally:
+        conn.close()
     
 def is_content_finished(media_path):
     conn = get_profile_db_connection()
@@ -1184,12 +1567,14 @@ def set_bouquet_hidden_status(bouquet_name, is_hidden):
     finally:
         conn.close()
 
+SQL_HIDDEN_BOUQUETS = "SELECT bouquet_name FROM bouquet_properties WHERE is_hidden = 1"
+
 def get_hidden_bouquets():
     """Returns a set of bouquet names that are marked as hidden."""
     conn = get_profile_db_connection()
     try:
         cursor = conn.cursor()
-        cursor.execute("SELECT bouquet_name FROM bouquet_properties WHERE is_hidden = 1")
+        cursor.execute(SQL_HIDDEN_BOUQUETS)
         rows = cursor.fetchall()
         return {row['bouquet_name'] for row in rows}
     except sqlite3.Error as e:
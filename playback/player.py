@@ -31,9 +31,12 @@ class Player(GObject.Object):
         self.total_bytes = 0
         self.last_bitrate = 0
         self.last_time = time.time()
+        self._font_listener_id = None
 
     def _setup_player(self):
         """Creates a clean player and linked elements each time."""
+        if self._font_listener_id is None:
+            self._font_listener_id = database.connect_config_changed(self._on_subtitle_font_changed, ("subtitle_font",))
         if self.player:
             self.player.set_state(Gst.State.NULL)
             self.player = None
@@ -280,7 +283,13 @@ class Player(GObject.Object):
             new_pos = pos_ns + amount_ns
             self.player.seek_simple(Gst.Format.TIME, Gst.SeekFlags.FLUSH | Gst.SeekFlags.KEY_UNIT, new_pos if new_pos > 0 else 0)
 
+    def _on_subtitle_font_changed(self, key, value):
+        self.apply_subtitle_font(value)
+
     def shutdown(self):
+        if self._font_listener_id is not None:
+            database.disconnect_config_changed(self._font_listener_id)
+            self._font_listener_id = None
         if self.player:
             self.player.set_state(Gst.State.NULL)
             self.player = None
@@ -4,24 +4,85 @@ import logging
 import subprocess
 import signal
 import os
+import re
+import time
 import threading
 from gi.repository import GLib
 
+_PROGRESS_SIZE_RE = re.compile(r'size=\s*(\d+)\s*(kB|KiB|MB|MiB|B)?')
+_PROGRESS_BITRATE_RE = re.compile(r'bitrate=\s*([\d.]+)\s*kbits/s')
+PROGRESS_LOG_INTERVAL = 60
+_SIZE_UNITS = {None: 1, 'B': 1, 'kB': 1024, 'KiB': 1024, 'MB': 1024 * 1024, 'MiB': 1024 * 1024}
+
 class Recorder:
     def __init__(self, stream_url, output_filepath):
         self.stream_url = stream_url
         self.output_filepath = output_filepath
         self.process = None
         self.log_thread = None
+        self.started_at = None
+        self.bytes_written = 0
+        self.bitrate_kbps = 0.0
         logging.info(f"Recorder (FFmpeg Mode) initialized. URL: {self.stream_url}")
 
+    def _parse_progress(self, line):
+        """Picks the written size and the current bitrate out of an FFmpeg progress line."""
+        size_match = _PROGRESS_SIZE_RE.search(line)
+        if size_match:
+            self.bytes_written = int(size_match.group(1)) * _SIZE_UNITS.get(size_match.group(2), 1)
+        bitrate_match = _PROGRESS_BITRATE_RE.search(line)
+        if bitrate_match:
+            self.bitrate_kbps = float(bitrate_match.group(1))
+
+    def get_stats(self):
+        """Returns the live state of the recording as plain data."""
+        process = self.process
+        bytes_written = self.bytes_written
+        try:
+            bytes_written = max(bytes_written, os.path.getsize(self.output_filepath))
+        except OSError:
+            pass
+        elapsed = time.time() - self.started_at if self.started_at else 0.0
+        bitrate_kbps = self.bitrate_kbps
+        if not bitrate_kbps and elapsed > 0:
+            bitrate_kbps = bytes_written * 8 / 1000 / elapsed
+        return {
+            "output_path": self.output_filepath,
+            "pid": process.pid if process else None,
+            "running": bool(process and process.poll() is None),
+            "started_at": self.started_at,
+            "elapsed": elapsed,
+            "bytes_written": bytes_written,
+            "bitrate_kbps": bitrate_kbps,
+        }
+
+    def _log_progress_summary(self):
+        stats = self.get_stats()
+        logging.info(
+            f"(FFmpeg) {os.path.basename(self.output_filepath)}: {stats['bytes_written'] / (1024 * 1024):.1f} MB "
+            f"in {int(stats['elapsed'])}s, {stats['bitrate_kbps']:.0f} kbit/s"
+        )
+
     def _log_reader_thread(self):
+        """
+        Drains FFmpeg's stderr. Progress lines (several per second) only
+        update the live stats and are summarized every PROGRESS_LOG_INTERVAL
+        seconds; everything else is logged as it comes.
+        """
+        last_summary = time.monotonic()
         try:
             for line in self.process.stderr:
-                if 'frame=' in line:
-                    logging.debug(f"(FFmpeg Live) {line.strip()}")
-                else:
-                    logging.info(f"(FFmpeg Live) {line.strip()}")
+                if 'size=' in line or 'frame=' in line:
+                    self._parse_progress(line)
+                    now = time.monotonic()
+                    if now - last_summary >= PROGRESS_LOG_INTERVAL:
+                        last_summary = now
+                        self._log_progress_summary()
+                    continue
+                line = line.strip()
+                if line:
+                    logging.info(f"(FFmpeg Live) {line}")
+            self._log_progress_summary()
         except Exception as e:
             logging.warning(f"Error in FFmpeg log reader thread: {e}")
 
@@ -50,6 +111,7 @@ class Recorder:
                 text=True,
                 errors='ignore'
             )
+            self.started_at = time.time()
             self.log_thread = threading.Thread(target=self._log_reader_thread)
             self.log_thread.daemon = True
             self.log_thread.start()
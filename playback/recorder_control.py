@@ -0,0 +1,153 @@
+# playback/recorder_control.py
+
+import os
+import json
+import socket
+import logging
+import tempfile
+import threading
+import socketserver
+
+CONTROL_SOCKET_NAME = "engplayer-recorder.sock"
+MAX_MESSAGE_SIZE = 1024 * 1024
+LONG_CALL_TIMEOUT = 40.0
+
+def get_control_socket_path():
+    """Path of the recorder daemon's control socket (in the user's runtime directory)."""
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR") or tempfile.gettempdir()
+    return os.path.join(runtime_dir, CONTROL_SOCKET_NAME)
+
+class RecorderUnavailableError(Exception):
+    """The recorder daemon is not running (nothing listens on the control socket)."""
+
+class RecorderCallError(Exception):
+    """The recorder daemon was reached but the call failed or was rejected."""
+
+def call(method, params=None, timeout=2.0):
+    """
+    Sends one JSON-RPC request to the recorder daemon and returns its result.
+    Raises RecorderUnavailableError if the daemon cannot be reached and
+    RecorderCallError (with the daemon's message) if the call fails.
+    """
+    request = {"jsonrpc": "2.0", "id": 1, "method": method, "params": params or {}}
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(timeout)
+        try:
+            sock.connect(get_control_socket_path())
+        except OSError as e:
+            raise RecorderUnavailableError(str(e)) from e
+        try:
+            sock.sendall(json.dumps(request).encode("utf-8") + b"\n")
+            with sock.makefile("rb") as reader:
+                line = reader.readline(MAX_MESSAGE_SIZE)
+        except OSError as e:
+            raise RecorderCallError(str(e)) from e
+    try:
+        response = json.loads(line)
+    except ValueError as e:
+        raise RecorderCallError("Invalid response from recorder daemon.") from e
+    if "error" in response:
+        raise RecorderCallError(response["error"].get("message") or "Unknown error.")
+    return response.get("result")
+
+def send_request(method, params=None, timeout=2.0):
+    """
+    Like call(), but returns None if the daemon is not running or the call
+    failed, so callers can fall back to the shared database.
+    """
+    try:
+        return call(method, params, timeout)
+    except RecorderUnavailableError as e:
+        logging.debug(f"Recorder daemon not reachable for '{method}': {e}")
+    except RecorderCallError as e:
+        logging.warning(f"Recorder daemon call '{method}' failed: {e}")
+    return None
+
+def notify_schedule_changed():
+    """Asks the recorder daemon to re-read the schedule right away."""
+    return send_request("reload", timeout=0.5) is not None
+
+def list_active_recordings():
+    """Running recordings with live bytes_written / bitrate_kbps, or None if the daemon is not reachable."""
+    return send_request("list_active")
+
+def get_daemon_stats():
+    return send_request("stats")
+
+def start_recording_now(profile_db, profile_id, channel_name, channel_url, end_time, program_name=None):
+    """Starts a recording in the daemon right away. Returns its info dict (with 'id'), or None."""
+    return send_request("start_now", {
+        "profile_db": profile_db,
+        "profile_id": profile_id,
+        "channel_name": channel_name,
+        "channel_url": channel_url,
+        "end_time": int(end_time),
+        "program_name": program_name,
+    }, timeout=LONG_CALL_TIMEOUT)
+
+def stop_recording(profile_db, job_id):
+    """
+    Stops a running recording and returns its final status ('completed' or
+    'failed'), or None. Blocks while FFmpeg finalizes the file, so call it
+    from a worker thread.
+    """
+    return send_request("stop", {"profile_db": profile_db, "job_id": job_id}, timeout=LONG_CALL_TIMEOUT)
+
+def extend_recording(profile_db, job_id, end_time):
+    """
+    Moves the end of a pending or running recording. Raises
+    RecorderUnavailableError if the daemon is not running and
+    RecorderCallError if it rejects the new end time.
+    """
+    call("extend_end_time", {"profile_db": profile_db, "job_id": job_id, "end_time": int(end_time)})
+
+class _ControlRequestHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        line = self.rfile.readline(MAX_MESSAGE_SIZE)
+        if not line:
+            return
+        request_id = None
+        try:
+            request = json.loads(line)
+            request_id = request.get("id")
+            handler = self.server.methods.get(request.get("method"))
+            if handler is None:
+                response = {"jsonrpc": "2.0", "id": request_id,
+                            "error": {"code": -32601, "message": f"Unknown method: {request.get('method')}"}}
+            else:
+                response = {"jsonrpc": "2.0", "id": request_id, "result": handler(**(request.get("params") or {}))}
+        except (ValueError, TypeError) as e:
+            response = {"jsonrpc": "2.0", "id": request_id, "error": {"code": -32602, "message": str(e)}}
+        except Exception as e:
+            logging.error(f"Recorder control request failed: {e}")
+            response = {"jsonrpc": "2.0", "id": request_id, "error": {"code": -32603, "message": str(e)}}
+        self.wfile.write(json.dumps(response).encode("utf-8") + b"\n")
+
+class _ControlServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+def start_control_server(methods):
+    """
+    Serves the given {name: callable(**params)} methods on the control socket
+    in a background thread. Returns the server, or None if the socket could
+    not be created.
+    """
+    path = get_control_socket_path()
+    if os.path.exists(path):
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe:
+            try:
+                probe.connect(path)
+                logging.error(f"Another recorder daemon is already listening on {path}.")
+                return None
+            except OSError:
+                os.remove(path)
+    try:
+        server = _ControlServer(path, _ControlRequestHandler)
+    except OSError as e:
+        logging.error(f"Could not create recorder control socket {path}: {e}")
+        return None
+    os.chmod(path, 0o600)
+    server.methods = methods
+    threading.Thread(target=server.serve_forever, daemon=True, name="RecorderControl").start()
+    logging.info(f"Recorder control socket listening on {path}.")
+    return server
@@ -7,10 +7,19 @@ import signal
 from datetime import datetime
 import sqlite3
 import glob
+import heapq
+import threading
+import shutil
 import sys
+from urllib.parse import urlsplit
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 try:
-    from database import APP_CONFIG_DIR, get_recordings_path, get_config_db_connection
+    from database import (APP_CONFIG_DIR, get_recordings_path, get_config_db_connection, invalidate_config_cache,
+                          get_max_concurrent_recordings, get_max_recordings_per_host, get_min_free_recording_space_mb,
+                          PROFILE_MIGRATIONS, _run_migrations)
+
+    def _migrate_profile_db(conn):
+        _run_migrations(conn, PROFILE_MIGRATIONS, "profile")
 except ImportError:
     logging.warning("Failed to import database module, setting paths manually.")
     from gi.repository import GLib
@@ -31,10 +40,47 @@ except ImportError:
             return value[0]
         else:
             return GLib.get_user_special_dir(GLib.UserDirectory.DIRECTORY_VIDEOS)
+
+    def invalidate_config_cache():
+        pass
+
+    def _get_int_config(key, default):
+        conn = get_config_db_connection()
+        value = conn.cursor().execute("SELECT value FROM config WHERE key = ?", (key,)).fetchone()
+        conn.close()
+        if value and str(value[0]).isdigit():
+            return int(value[0])
+        return default
+
+    def get_max_concurrent_recordings():
+        return _get_int_config('max_concurrent_recordings', 4)
+
+    def get_max_recordings_per_host():
+        return _get_int_config('max_recordings_per_host', 2)
+
+    def get_min_free_recording_space_mb():
+        return _get_int_config('min_free_recording_space_mb', 1024)
+
+    def _migrate_profile_db(conn):
+        columns = [row[1] for row in conn.execute("PRAGMA table_info(scheduled_recordings)")]
+        if columns and "status_detail" not in columns:
+            with conn:
+                conn.execute("ALTER TABLE scheduled_recordings ADD COLUMN status_detail TEXT")
 from playback.recorder import Recorder
+from playback import recorder_control
 log_format = '%(asctime)s - %(levelname)s - %(message)s'
 logging.basicConfig(level=logging.INFO, format=log_format)
 active_recordings = {}
+active_jobs = {}
+_stopping_jobs = set()
+_queued_jobs = set()
+_state_lock = threading.RLock()
+_started_at = time.time()
+POLL_INTERVAL = 30
+schedule_heap = []
+_wake_event = threading.Event()
+_schedule_markers = {}
+_migrated_dbs = set()
 
 def find_profile_databases():
     """Finds all profile_*.db files and returns their paths as a list."""
@@ -50,15 +96,123 @@ def _connect_to_profile_db(db_path):
         conn = sqlite3.connect(db_path, timeout=10)
         conn.row_factory = sqlite3.Row
         conn.execute("PRAGMA foreign_keys = ON")
-        return conn
     except sqlite3.Error as e:
         logging.error(f"Failed to connect to profile database: {db_path} | Error: {e}")
         return None
+    _ensure_profile_schema(conn, db_path)
+    return conn
+
+def _ensure_profile_schema(conn, db_path):
+    """
+    Profiles the GUI has not opened since an update still have the old
+    schema; bring them up to date once, before any job status is written.
+    """
+    if db_path in _migrated_dbs:
+        return
+    try:
+        _migrate_profile_db(conn)
+        _migrated_dbs.add(db_path)
+    except sqlite3.Error as e:
+        logging.error(f"Failed to migrate profile database: {db_path} | Error: {e}")
+
+def _update_job_status(cursor, job_id, status, detail=None):
+    columns = [row[1] for row in cursor.execute("PRAGMA table_info(scheduled_recordings)").fetchall()]
+    if "status_detail" in columns:
+        cursor.execute("UPDATE scheduled_recordings SET status = ?, status_detail = ? WHERE id = ?", (status, detail, job_id))
+    else:
+        cursor.execute("UPDATE scheduled_recordings SET status = ? WHERE id = ?", (status, job_id))
+
+def _recording_host(channel_url):
+    return (urlsplit(channel_url or "").hostname or "").lower()
+
+def _check_recording_slot(channel_url, recordings_dir):
+    """
+    The resource governor: returns None if a job for channel_url may start
+    now, otherwise (status, reason). Jobs over the global or per-host limit
+    are queued until a slot frees up; a full disk fails the job.
+    """
+    max_total = get_max_concurrent_recordings()
+    if max_total and len(active_recordings) >= max_total:
+        return 'queued', f"Recording limit reached ({len(active_recordings)}/{max_total} running)"
+    max_per_host = get_max_recordings_per_host()
+    host = _recording_host(channel_url)
+    if max_per_host and host:
+        running = sum(1 for job in active_jobs.values() if _recording_host(job.get('channel_url')) == host)
+        if running >= max_per_host:
+            return 'queued', f"Connection limit for {host} reached ({running}/{max_per_host} running)"
+    min_free_mb = get_min_free_recording_space_mb()
+    if min_free_mb:
+        try:
+            free_mb = shutil.disk_usage(recordings_dir).free // (1024 * 1024)
+        except OSError as e:
+            return 'failed', f"Recordings folder is not accessible: {e}"
+        if free_mb < min_free_mb:
+            return 'failed', f"Not enough free disk space ({free_mb} MB free, {min_free_mb} MB required)"
+    return None
 
-def check_for_due_recordings():
-    """Checks ALL profile databases and starts recordings that are due."""
-    logging.info("Checking for due recordings across all profiles...")
-    profile_dbs = find_profile_databases()
+def _start_job(cursor, db_path, job, recordings_dir, queue_if_busy=True):
+    """
+    Starts the recorder of one job if the governor allows it and records the
+    outcome in its status. Returns the new status ('recording', 'queued' or
+    'failed') and the reason for anything but 'recording'.
+    """
+    job_id = job['id']
+    channel_name = job['channel_name']
+    channel_url = job['channel_url']
+    job_dict = dict(job)
+    program_name = job_dict.get('program_name')
+    _queued_jobs.discard((db_path, job_id))
+    if job['end_time'] <= time.time():
+        reason = "The end time passed before the recording could start"
+        logging.warning(f"Recording for '{channel_name}' (ID: {job_id}) not started: {reason}.")
+        _update_job_status(cursor, job_id, 'failed', reason)
+        return 'failed', reason
+    blocked = _check_recording_slot(channel_url, recordings_dir)
+    if blocked:
+        status, reason = blocked
+        if status == 'queued' and not queue_if_busy:
+            status = 'failed'
+        if status == 'queued':
+            _queued_jobs.add((db_path, job_id))
+        if status != job_dict.get('status') or reason != job_dict.get('status_detail'):
+            logging.warning(f"Recording for '{channel_name}' (ID: {job_id}) {status}: {reason}.")
+            _update_job_status(cursor, job_id, status, reason)
+        return status, reason
+    timestamp = datetime.now().strftime("%d-%m-%Y_%H-%M")
+    if program_name:
+        safe_prog = program_name.replace(" ", "_").replace("/", "-")
+        safe_chan = channel_name.replace(" ", "_").replace("/", "-")
+        file_name = f"{safe_prog}_{safe_chan}_{timestamp}.mkv"
+    else:
+        safe_channel_name = channel_name.replace(" ", "_").replace("/", "-")
+        file_name = f"{safe_channel_name}_{timestamp}.mkv"
+    output_path = os.path.join(recordings_dir, file_name)
+    try:
+        # Committed before ffmpeg is spawned: if the status cannot be written,
+        # nothing is started and the next pass cannot start a second copy.
+        _update_job_status(cursor, job_id, 'recording')
+        cursor.connection.commit()
+    except sqlite3.Error as e:
+        logging.error(f"Could not mark '{channel_name}' (ID: {job_id}) as recording, not starting it: {e}")
+        cursor.connection.rollback()
+        return 'failed', str(e)
+    try:
+        recorder = Recorder(channel_url, output_path)
+        recorder.start()
+    except Exception as e:
+        logging.error(f"ERROR starting recording for '{channel_name}': {e}")
+        _update_job_status(cursor, job_id, 'failed', str(e))
+        return 'failed', str(e)
+    active_recordings[(db_path, job_id)] = recorder
+    active_jobs[(db_path, job_id)] = job_dict
+    logging.info(f"Recording for '{channel_name}' started successfully. File: {file_name}")
+    return 'recording', None
+
+def check_for_due_recordings(profile_dbs=None):
+    """Checks the given (default: ALL) profile databases and starts recordings that are due."""
+    logging.info("Checking for due recordings...")
+    if profile_dbs is None:
+        profile_dbs = find_profile_databases()
     now = int(time.time())
     for db_path in profile_dbs:
         conn = _connect_to_profile_db(db_path)
@@ -68,7 +222,8 @@ def check_for_due_recordings():
         try:
             cursor = conn.cursor()
             cursor.execute(
-                "SELECT * FROM scheduled_recordings WHERE status = 'pending' AND start_time <= ?", (now,)
+                """SELECT * FROM scheduled_recordings
+                   WHERE status IN ('pending', 'queued') AND start_time <= ? ORDER BY start_time""", (now,)
             )
             jobs_to_start = cursor.fetchall()
             if not jobs_to_start:
@@ -78,40 +233,19 @@ def check_for_due_recordings():
             recordings_dir = get_recordings_path()
             os.makedirs(recordings_dir, exist_ok=True)
             for job in jobs_to_start:
-                job_id = job['id']
-                channel_name = job['channel_name']
-                channel_url = job['channel_url']
-                job_dict = dict(job)
-                program_name = job_dict.get('program_name')               
-                timestamp = datetime.now().strftime("%d-%m-%Y_%H-%M")                
-                if program_name:
-                    safe_prog = program_name.replace(" ", "_").replace("/", "-")
-                    safe_chan = channel_name.replace(" ", "_").replace("/", "-")
-                    file_name = f"{safe_prog}_{safe_chan}_{timestamp}.mkv"
-                else:
-                    safe_channel_name = channel_name.replace(" ", "_").replace("/", "-")
-                    file_name = f"{safe_channel_name}_{timestamp}.mkv"
-                output_path = os.path.join(recordings_dir, file_name)
-                try:
-                    recorder = Recorder(channel_url, output_path)
-                    recorder.start()
-                    active_recordings[job_id] = recorder
-                    cursor.execute("UPDATE scheduled_recordings SET status = ? WHERE id = ?", ('recording', job_id))
-                    logging.info(f"Recording for '{channel_name}' started successfully. File: {file_name}")
-                except Exception as e:
-                    logging.error(f"ERROR starting recording for '{channel_name}': {e}")
-                    cursor.execute("UPDATE scheduled_recordings SET status = ? WHERE id = ?", ('failed', job_id))
+                _start_job(cursor, db_path, job, recordings_dir)
             conn.commit()
         except sqlite3.Error as e:
             logging.error(f"Database error while processing {db_path}: {e}")
         finally:
             conn.close()
 
-def check_for_finished_recordings():
-    """Checks active recordings in ALL profile databases and stops those whose end time has come."""
+def check_for_finished_recordings(profile_dbs=None):
+    """Checks active recordings in the given (default: ALL) profile databases and stops those whose end time has come."""
     now = int(time.time())
-    logging.info("Checking for finished recordings across all profiles...")
-    profile_dbs = find_profile_databases()
+    logging.info("Checking for finished recordings...")
+    if profile_dbs is None:
+        profile_dbs = find_profile_databases()
     for db_path in profile_dbs:
         conn = _connect_to_profile_db(db_path)
         if not conn:
@@ -128,20 +262,24 @@ def check_for_finished_recordings():
             for job in active_jobs_from_db:
                 job_id = job['id']
                 end_time = job['end_time']
+                if (db_path, job_id) in _stopping_jobs:
+                    continue
                 if now >= end_time:
                     logging.info(f"Recording time for '{job['channel_name']}' (ID: {job_id}) has expired. Stopping recording...")
-                    recorder_to_stop = active_recordings.get(job_id)
+                    recorder_to_stop = active_recordings.get((db_path, job_id))
                     final_status = 'failed'
                     if recorder_to_stop:
                         was_successful = recorder_to_stop.stop()
                         if was_successful:
                             final_status = 'completed'
-                        del active_recordings[job_id]
+                        del active_recordings[(db_path, job_id)]
+                        active_jobs.pop((db_path, job_id), None)
                         logging.info(f"Recording process with ID {job_id} stopped. Final Status: {final_status}")
                     else:
                         logging.warning(f"No active recording process found for ID {job_id}, but it appears as 'recording' in the database. Correcting status to 'failed'.")
                         final_status = 'failed'
-                    cursor.execute("UPDATE scheduled_recordings SET status = ? WHERE id = ?", (final_status, job_id))
+                    detail = None if recorder_to_stop else "The recording process was lost (was the recorder service restarted?)"
+                    _update_job_status(cursor, job_id, final_status, detail)
                     needs_commit = True
             if needs_commit:
                 conn.commit()
@@ -150,21 +288,295 @@ def check_for_finished_recordings():
         finally:
             conn.close()
 
+def _profile_signature(db_path):
+    """Changes whenever the database or its WAL file is written."""
+    signature = []
+    for path in (db_path, f"{db_path}-wal"):
+        try:
+            stat = os.stat(path)
+            signature.append((stat.st_mtime_ns, stat.st_size))
+        except OSError:
+            signature.append(None)
+    return tuple(signature)
+
+def _schedule_digest(db_path):
+    """The columns of scheduled_recordings that load_schedule() depends on."""
+    conn = _connect_to_profile_db(db_path)
+    if not conn:
+        return None
+    try:
+        return tuple(tuple(row) for row in conn.execute(
+            "SELECT id, status, start_time, end_time FROM scheduled_recordings ORDER BY id"
+        ))
+    except sqlite3.Error as e:
+        logging.error(f"Database error while reading the schedule of {db_path}: {e}")
+        return None
+    finally:
+        conn.close()
+
+def _snapshot_schedule_markers(previous):
+    """
+    Returns {db_path: (file signature, schedule digest)}. The GUI writes the
+    profile database all the time (playback progress, favorites), so a
+    changed file signature only means the schedule is read again and
+    compared; the digest is reused while the file is untouched.
+    """
+    markers = {}
+    for db_path in find_profile_databases():
+        signature = _profile_signature(db_path)
+        marker = previous.get(db_path)
+        if marker is None or marker[0] != signature:
+            marker = (signature, _schedule_digest(db_path))
+        markers[db_path] = marker
+    return markers
+
+def _schedule_changed(old_markers, new_markers):
+    return {db_path: marker[1] for db_path, marker in old_markers.items()} != \
+           {db_path: marker[1] for db_path, marker in new_markers.items()}
+
+def load_schedule():
+    """
+    Rebuilds the timer heap with the next start of every pending job and the
+    end of every running job, across all profile databases.
+    """
+    heap = []
+    for db_path in find_profile_databases():
+        conn = _connect_to_profile_db(db_path)
+        if not conn:
+            continue
+        try:
+            for row in conn.execute("SELECT id, start_time FROM scheduled_recordings WHERE status = 'pending'"):
+                heap.append((row['start_time'], 'start', db_path, row['id']))
+            for row in conn.execute("SELECT id, end_time FROM scheduled_recordings WHERE status IN ('recording', 'queued')"):
+                heap.append((row['end_time'], 'stop', db_path, row['id']))
+        except sqlite3.Error as e:
+            logging.error(f"Database error while loading the schedule of {db_path}: {e}")
+        finally:
+            conn.close()
+    heapq.heapify(heap)
+    schedule_heap[:] = heap
+    if heap:
+        logging.info(f"Schedule loaded: {len(heap)} events, next at {datetime.fromtimestamp(heap[0][0])} ({heap[0][1]}).")
+    else:
+        logging.info("Schedule loaded: no upcoming events.")
+
+def _pop_due_profiles(now):
+    """Pops the events that are due and returns the databases they belong to."""
+    due_dbs = set()
+    while schedule_heap and schedule_heap[0][0] <= now:
+        due_dbs.add(heapq.heappop(schedule_heap)[2])
+    return due_dbs
+
+def request_reload():
+    """Wakes the main loop and makes it re-read the schedule (e.g. after the GUI saved a job)."""
+    _wake_event.set()
+    return True
+
+def _resolve_profile_db(profile_db):
+    """Maps a client supplied path to one of the profile databases the daemon schedules from."""
+    requested = os.path.abspath(profile_db or "")
+    for db_path in find_profile_databases():
+        if os.path.abspath(db_path) == requested:
+            return db_path
+    raise ValueError(f"Unknown profile database: {profile_db}")
+
+def _set_job_status(db_path, job_id, status):
+    conn = _connect_to_profile_db(db_path)
+    if not conn:
+        return
+    try:
+        with conn:
+            _update_job_status(conn, job_id, status)
+    except sqlite3.Error as e:
+        logging.error(f"Failed to update status of recording {job_id} in {db_path}: {e}")
+    finally:
+        conn.close()
+
+def _recording_info(key, recorder):
+    db_path, job_id = key
+    job = active_jobs.get(key, {})
+    info = {
+        "profile_db": db_path,
+        "id": job_id,
+        "channel_name": job.get("channel_name"),
+        "program_name": job.get("program_name"),
+        "start_time": job.get("start_time"),
+        "end_time": job.get("end_time"),
+        "stopping": key in _stopping_jobs,
+    }
+    info.update(recorder.get_stats())
+    return info
+
+def rpc_list_active():
+    """Control method: the running recordings with their live size and bitrate."""
+    with _state_lock:
+        return [_recording_info(key, recorder) for key, recorder in active_recordings.items()]
+
+def rpc_start_now(profile_db, profile_id, channel_name, channel_url, end_time, program_name=None):
+    """
+    Control method: adds a job that starts right away and runs until end_time.
+    It is not queued: if the governor refuses it, the job is marked failed and
+    the returned status/status_detail say why.
+    """
+    db_path = _resolve_profile_db(profile_db)
+    now = int(time.time())
+    end_time = int(end_time)
+    if end_time <= now:
+        raise ValueError("The end time of a recording must be in the future.")
+    conn = _connect_to_profile_db(db_path)
+    if not conn:
+        raise RuntimeError(f"Could not open {db_path}.")
+    try:
+        with _state_lock:
+            cursor = conn.cursor()
+            cursor.execute(
+                """INSERT INTO scheduled_recordings
+                   (profile_id, channel_name, channel_url, start_time, end_time, program_name, created_at)
+                   VALUES (?, ?, ?, ?, ?, ?, ?)""",
+                (profile_id, channel_name, channel_url, now, end_time, program_name, now)
+            )
+            job = cursor.execute("SELECT * FROM scheduled_recordings WHERE id = ?", (cursor.lastrowid,)).fetchone()
+            invalidate_config_cache()
+            recordings_dir = get_recordings_path()
+            os.makedirs(recordings_dir, exist_ok=True)
+            status, reason = _start_job(cursor, db_path, job, recordings_dir, queue_if_busy=False)
+            conn.commit()
+            key = (db_path, job['id'])
+            if status == 'recording':
+                info = _recording_info(key, active_recordings[key])
+            else:
+                info = {"profile_db": db_path, "id": job['id'], "channel_name": channel_name}
+            info.update({"status": status, "status_detail": reason})
+    finally:
+        conn.close()
+    request_reload()
+    return info
+
+def rpc_stop(profile_db, job_id):
+    """Control method: stops a running recording now and returns its final status."""
+    key = (_resolve_profile_db(profile_db), int(job_id))
+    with _state_lock:
+        recorder = active_recordings.get(key)
+        if recorder is None or key in _stopping_jobs:
+            raise ValueError(f"Recording {job_id} is not running.")
+        _stopping_jobs.add(key)
+    logging.info(f"Stop requested for recording {job_id} through the control socket.")
+    final_status = 'failed'
+    try:
+        if recorder.stop():
+            final_status = 'completed'
+    finally:
+        with _state_lock:
+            _set_job_status(key[0], key[1], final_status)
+            active_recordings.pop(key, None)
+            active_jobs.pop(key, None)
+            _stopping_jobs.discard(key)
+    request_reload()
+    return final_status
+
+def rpc_extend_end_time(profile_db, job_id, end_time):
+    """Control method: moves the end of a pending or running job."""
+    db_path = _resolve_profile_db(profile_db)
+    job_id, end_time = int(job_id), int(end_time)
+    conn = _connect_to_profile_db(db_path)
+    if not conn:
+        raise RuntimeError(f"Could not open {db_path}.")
+    try:
+        with _state_lock:
+            with conn:
+                updated = conn.execute(
+                    """UPDATE scheduled_recordings SET end_time = ?
+                       WHERE id = ? AND status IN ('pending', 'recording') AND start_time < ?""",
+                    (end_time, job_id, end_time)
+                ).rowcount
+            if updated and (db_path, job_id) in active_jobs:
+                active_jobs[(db_path, job_id)]['end_time'] = end_time
+    finally:
+        conn.close()
+    if not updated:
+        raise ValueError(f"Recording {job_id} cannot be extended to {end_time}.")
+    logging.info(f"End time of recording {job_id} moved to {datetime.fromtimestamp(end_time)}.")
+    request_reload()
+    return True
+
+def rpc_stats():
+    """Control method: daemon-wide totals plus the per-recording figures of rpc_list_active."""
+    with _state_lock:
+        recordings = rpc_list_active()
+        next_event = schedule_heap[0] if schedule_heap else None
+        scheduled_events = len(schedule_heap)
+    return {
+        "uptime": time.time() - _started_at,
+        "active": len(recordings),
+        "bytes_written": sum(r["bytes_written"] for r in recordings),
+        "bitrate_kbps": sum(r["bitrate_kbps"] for r in recordings),
+        "scheduled_events": scheduled_events,
+        "next_event_time": next_event[0] if next_event else None,
+        "next_event_action": next_event[1] if next_event else None,
+        "recordings": recordings,
+    }
+
+CONTROL_METHODS = {
+    "reload": request_reload,
+    "list_active": rpc_list_active,
+    "start_now": rpc_start_now,
+    "stop": rpc_stop,
+    "extend_end_time": rpc_extend_end_time,
+    "stats": rpc_stats,
+}
+
 def main_loop():
-    """The main working loop of the daemon."""
+    """
+    The main working loop of the daemon. It sleeps until the next start or
+    end in the timer heap, and re-reads the schedule when nudged through the
+    control socket or when the scheduled_recordings rows of a profile
+    database changed on disk. Control calls run on the socket server's
+    threads, so shared state is guarded by _state_lock.
+    """
+    global _schedule_markers
     logging.info("Background Recording Service (Daemon) started.")
+    control_server = recorder_control.start_control_server(CONTROL_METHODS)
+    reload = True
     try:
         while True:
-            check_for_due_recordings()
-            check_for_finished_recordings()
-            logging.info("Next check in 60 seconds.")
-            time.sleep(60)
+            if not reload:
+                markers = _snapshot_schedule_markers(_schedule_markers)
+                reload = _schedule_changed(_schedule_markers, markers)
+                _schedule_markers = markers
+            with _state_lock:
+                due_dbs = _pop_due_profiles(int(time.time()))
+            if reload or due_dbs:
+                with _state_lock:
+                    invalidate_config_cache()
+                    if reload:
+                        profile_dbs = None
+                        _queued_jobs.clear()
+                    else:
+                        profile_dbs = sorted(due_dbs | {db_path for db_path, job_id in _queued_jobs})
+                    check_for_finished_recordings(profile_dbs)
+                    check_for_due_recordings(profile_dbs)
+                    load_schedule()
+                    _schedule_markers = _snapshot_schedule_markers(_schedule_markers)
+            timeout = POLL_INTERVAL
+            with _state_lock:
+                if schedule_heap:
+                    timeout = max(0.0, min(POLL_INTERVAL, schedule_heap[0][0] - time.time()))
+            reload = _wake_event.wait(timeout)
+            _wake_event.clear()
     except KeyboardInterrupt:
         logging.info("Keyboard interrupt detected. Stopping service.")
-        for job_id, recorder in active_recordings.items():
-            logging.info(f"Stopping recording with ID {job_id}...")
-            recorder.stop()
+        with _state_lock:
+            for (db_path, job_id), recorder in list(active_recordings.items()):
+                logging.info(f"Stopping recording with ID {job_id}...")
+                recorder.stop()
         logging.info("All active recordings stopped. Exiting.")
+    finally:
+        if control_server:
+            control_server.shutdown()
+            try:
+                os.remove(recorder_control.get_control_socket_path())
+            except OSError:
+                pass
 
 if __name__ == "__main__":
     main_loop()
@@ -0,0 +1,103 @@
+# tools/bench_batch_delete.py
+
+"""
+Removing tracks from library.db: the previous per-track delete with
+whole-table NOT IN orphan cleanup versus database.delete_track_records.
+
+    python3 tools/bench_batch_delete.py [--tracks 100000] [--albums 10000] [--artists 1000]
+                                        [--remove 10000] [--old-sample 200]
+
+Runs against a fresh library.db in a temporary XDG_CONFIG_HOME. The removed
+tracks are whole albums, so albums and artists are orphaned too. The old
+path is slow enough that it only deletes --old-sample tracks and the total
+is extrapolated. Both paths must leave the expected track, album and
+artist counts.
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+_config_home = tempfile.TemporaryDirectory()
+os.environ["XDG_CONFIG_HOME"] = _config_home.name
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import database
+
+def old_delete_track_record(file_path):
+    """The previous delete_track_record, without its log line."""
+    conn = database.get_library_db_connection()
+    try:
+        with conn:
+            cursor = conn.cursor()
+            cursor.execute("DELETE FROM tracks WHERE file_path = ?", (file_path,))
+            cursor.execute("DELETE FROM albums WHERE id NOT IN (SELECT DISTINCT album_id FROM tracks)")
+            cursor.execute("DELETE FROM artists WHERE id NOT IN (SELECT DISTINCT artist_id FROM albums)")
+    finally:
+        conn.close()
+
+def populate(conn, library_id, track_count, album_count, artist_count):
+    """Track t belongs to album t * album_count // track_count, album a to artist a * artist_count // album_count."""
+    with conn:
+        for table in ("tracks", "albums", "artists"):
+            conn.execute(f"DELETE FROM {table}")
+        conn.executemany("INSERT INTO artists (id, name) VALUES (?, ?)",
+                         [(artist + 1, f"Artist {artist}") for artist in range(artist_count)])
+        conn.executemany("INSERT INTO albums (id, name, artist_id) VALUES (?, ?, ?)",
+                         [(album + 1, f"Album {album}", album * artist_count // album_count + 1)
+                          for album in range(album_count)])
+        conn.executemany(
+            "INSERT INTO tracks (album_id, library_id, title, track_number, file_path) VALUES (?, ?, ?, ?, ?)",
+            [(track * album_count // track_count + 1, library_id, f"Track {track}", 1, f"/music/{track}.mp3")
+             for track in range(track_count)]
+        )
+
+def expected_counts(track_count, album_count, artist_count, removed):
+    tracks = range(removed, track_count)
+    albums = {track * album_count // track_count for track in tracks}
+    artists = {album * artist_count // album_count for album in albums}
+    return len(tracks), len(albums), len(artists)
+
+def _counts(conn):
+    return tuple(conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0] for table in ("tracks", "albums", "artists"))
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--tracks", type=int, default=100000)
+    parser.add_argument("--albums", type=int, default=10000)
+    parser.add_argument("--artists", type=int, default=1000)
+    parser.add_argument("--remove", type=int, default=10000)
+    parser.add_argument("--old-sample", type=int, default=200)
+    args = parser.parse_args()
+    database.initialize_database()
+    database.add_library("/music", "music", "Benchmark")
+    conn = database.get_library_db_connection()
+    library_id = conn.execute("SELECT id FROM libraries WHERE path = '/music'").fetchone()[0]
+    sizes = (args.tracks, args.albums, args.artists)
+    sample = min(args.old_sample, args.remove)
+
+    populate(conn, library_id, *sizes)
+    started = time.perf_counter()
+    for track in range(sample):
+        old_delete_track_record(f"/music/{track}.mp3")
+    old_per_track = (time.perf_counter() - started) / sample
+    if _counts(conn) != expected_counts(*sizes, sample):
+        sys.exit(f"Per-track delete left {_counts(conn)}, expected {expected_counts(*sizes, sample)}")
+
+    populate(conn, library_id, *sizes)
+    started = time.perf_counter()
+    database.delete_track_records([f"/music/{track}.mp3" for track in range(args.remove)])
+    new_seconds = time.perf_counter() - started
+    if _counts(conn) != expected_counts(*sizes, args.remove):
+        sys.exit(f"delete_track_records left {_counts(conn)}, expected {expected_counts(*sizes, args.remove)}")
+
+    print(f"{args.tracks} tracks / {args.albums} albums / {args.artists} artists, remove {args.remove} tracks")
+    print(f"  old per-track delete + anti-joins: {old_per_track * 1000:.1f} ms/track, "
+          f"about {old_per_track * args.remove:.0f} s in total (measured over {sample} tracks)")
+    print(f"  delete_track_records():            {new_seconds:.2f} s")
+    print(f"  remaining {_counts(conn)}, as expected")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+# tools/bench_db_connections.py
+
+"""
+Per-call cost of a config lookup: a fresh sqlite3 connection per call (the
+previous helpers) versus the per-thread pooled connection, and the
+memory-cached get_config_value on top of it.
+
+    python3 tools/bench_db_connections.py [--calls 20000]
+
+Runs against a fresh config.db in a temporary XDG_CONFIG_HOME.
+"""
+
+import argparse
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+
+_config_home = tempfile.TemporaryDirectory()
+os.environ["XDG_CONFIG_HOME"] = _config_home.name
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import database
+
+CONFIG_QUERY = "SELECT value FROM config WHERE key = ?"
+
+def fresh_connection_lookup(key):
+    """The previous get_config_value: connect, query, close."""
+    conn = sqlite3.connect(database.CONFIG_DB_FILE, timeout=10)
+    conn.row_factory = sqlite3.Row
+    value = conn.cursor().execute(CONFIG_QUERY, (key,)).fetchone()
+    conn.close()
+    return value[0] if value else None
+
+def pooled_connection_lookup(key):
+    conn = database.get_config_db_connection()
+    value = conn.cursor().execute(CONFIG_QUERY, (key,)).fetchone()
+    conn.close()
+    return value[0] if value else None
+
+def _time_calls(function, calls):
+    function("use_poster_disk_cache")
+    started = time.perf_counter()
+    for index in range(calls):
+        function("use_poster_disk_cache")
+    return (time.perf_counter() - started) / calls * 1000000
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--calls", type=int, default=20000)
+    args = parser.parse_args()
+    database.initialize_database()
+    database.set_config_value("use_poster_disk_cache", "1")
+    results = [
+        ("fresh connection per call", _time_calls(fresh_connection_lookup, args.calls)),
+        ("pooled connection", _time_calls(pooled_connection_lookup, args.calls)),
+        ("get_config_value (cached)", _time_calls(database.get_config_value, args.calls)),
+    ]
+    print(f"{args.calls} config lookups on config.db")
+    for label, microseconds in results:
+        print(f"  {label + ':':<28} {microseconds:8.1f} us/call")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+# tools/bench_music_scan_ids.py
+
+"""
+Writing scanned music to library.db: the previous per-track artist/album
+lookups versus the scanner's session id cache and batched inserts.
+
+    python3 tools/bench_music_scan_ids.py [--tracks 100000] [--albums 10000] [--artists 100]
+                                          [--without-album-index]
+
+Runs against a fresh library.db in a temporary XDG_CONFIG_HOME. Tag parsing
+and album art extraction are excluded, so only the database work is timed.
+--without-album-index drops idx_albums_artist_id first (the schema before
+library migration 2), where every per-track album lookup scans the table.
+Both paths must leave identical track, album and artist counts.
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+_config_home = tempfile.TemporaryDirectory()
+os.environ["XDG_CONFIG_HOME"] = _config_home.name
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import database
+from data_providers import scanner
+
+TRACK_UPSERT = """
+    INSERT INTO tracks (album_id, library_id, title, track_number, duration, file_path,
+                        file_size, file_mtime, file_inode)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT(file_path) DO UPDATE SET
+        album_id = excluded.album_id, library_id = excluded.library_id, title = excluded.title,
+        track_number = excluded.track_number, duration = excluded.duration,
+        file_size = excluded.file_size, file_mtime = excluded.file_mtime, file_inode = excluded.file_inode
+"""
+
+def old_write_music_batch(conn, library_id, batch):
+    """The previous _write_music_batch, without the album art read."""
+    rows = []
+    with conn:
+        cursor = conn.cursor()
+        for full_path, signature, tags in batch:
+            album_artist_name = tags["artist"] or "Unknown Artist"
+            album_name = tags["album"]
+            cursor.execute("INSERT OR IGNORE INTO artists (name) VALUES (?)", (album_artist_name,))
+            artist_id = cursor.execute("SELECT id FROM artists WHERE name = ?", (album_artist_name,)).fetchone()['id']
+            album_id_row = cursor.execute("SELECT id FROM albums WHERE name = ? AND artist_id = ?", (album_name, artist_id)).fetchone()
+            if not album_id_row:
+                cursor.execute("INSERT INTO albums (name, artist_id, album_art_path) VALUES (?, ?, ?)",
+                               (album_name, artist_id, None))
+                album_id = cursor.lastrowid
+            else:
+                album_id = album_id_row['id']
+            rows.append((album_id, library_id, tags["title"], tags["track_number"], tags["duration"],
+                         full_path) + signature)
+        cursor.executemany(TRACK_UPSERT, rows)
+
+def make_batches(track_count, album_count, artist_count):
+    tracks = []
+    for index in range(track_count):
+        album = index % album_count
+        tags = {
+            "artist": f"Artist {album % artist_count}",
+            "album": f"Album {album}",
+            "title": f"Track {index}",
+            "track_number": index // album_count + 1,
+            "duration": 180,
+        }
+        tracks.append((f"/music/{album}/{index}.mp3", (4000000, 1700000000, index), tags))
+    size = scanner.WRITE_BATCH_SIZE
+    return [tracks[start:start + size] for start in range(0, len(tracks), size)]
+
+def _counts(conn):
+    return tuple(conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0] for table in ("tracks", "albums", "artists"))
+
+def _clear(conn):
+    with conn:
+        for table in ("tracks", "albums", "artists"):
+            conn.execute(f"DELETE FROM {table}")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--tracks", type=int, default=100000)
+    parser.add_argument("--albums", type=int, default=10000)
+    parser.add_argument("--artists", type=int, default=100)
+    parser.add_argument("--without-album-index", action="store_true")
+    args = parser.parse_args()
+    scanner._read_album_art = lambda full_path: None
+    database.initialize_database()
+    database.add_library("/music", "music", "Benchmark")
+    conn = database.get_library_db_connection()
+    if args.without_album_index:
+        conn.execute("DROP INDEX idx_albums_artist_id")
+    library_id = conn.execute("SELECT id FROM libraries WHERE path = '/music'").fetchone()[0]
+    batches = make_batches(args.tracks, args.albums, args.artists)
+
+    started = time.perf_counter()
+    for batch in batches:
+        old_write_music_batch(conn, library_id, batch)
+    old_seconds = time.perf_counter() - started
+    old_counts = _counts(conn)
+    _clear(conn)
+
+    started = time.perf_counter()
+    ids = scanner._MusicIdCache()
+    if args.tracks >= scanner.PROCESS_POOL_THRESHOLD:
+        ids.prefill(conn.cursor())
+    for batch in batches:
+        scanner._write_music_batch(conn, library_id, batch, ids)
+    new_seconds = time.perf_counter() - started
+    new_counts = _counts(conn)
+
+    if old_counts != new_counts:
+        sys.exit(f"Counts differ: per-track {old_counts}, id cache {new_counts}")
+    print(f"{args.tracks} tracks / {args.albums} albums / {args.artists} artists, identical counts {new_counts}")
+    print(f"  per-track queries:  {old_seconds:.1f} s")
+    print(f"  id cache + batches: {new_seconds:.1f} s")
+
+if __name__ == "__main__":
+    main()
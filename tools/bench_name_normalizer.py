@@ -0,0 +1,99 @@
+# tools/bench_name_normalizer.py
+
+"""
+Channel name normalization: the previous per-widget _clean_key versus
+utils.name_normalizer (bulk clean_keys and cached clean_key).
+
+    python3 tools/bench_name_normalizer.py [--count 100000] [--unique 20000]
+
+Names are synthetic but shaped like provider playlists: country prefixes,
+quality tags, bracketed notes and some accented words. All paths must
+return identical keys.
+"""
+
+import argparse
+import os
+import random
+import re
+import sys
+import time
+import unicodedata
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils import name_normalizer
+
+PREFIXES = ("", "TR| ", "UK: ", "DE - ", "US_", "FR ", "XX| ")
+WORDS = ("Sport", "News", "Movie", "Kids", "Müzik", "Café", "Cinéma", "Drama", "Action", "Belgesel", "Haber")
+SUFFIXES = ("", " HD", " FHD", " 4K", " (backup)", " [720p]", " =alt", " SD")
+
+def old_clean_key(text):
+    if not text:
+        return None
+    name = text.lower().strip()
+    match = re.match(r'^([a-z]{2,3})[| \-_]+(.*)', name)
+    if match:
+        lang_code = match.group(1)
+        rest_of_name = match.group(2)
+        common_codes = [
+            "tr", "us", "uk", "fr", "de", "it", "es", "pt", "nl", "be",
+            "ru", "gr", "az", "ch", "at", "pl", "ro", "bg", "hu", "cz",
+            "sk", "al", "rs", "hr", "ba", "mk", "se", "no", "dk", "fi",
+            "ie", "ca", "au", "nz", "br", "ar", "mx", "ae", "sa", "eg",
+            "tur", "usa", "gbr", "fra", "deu", "ita", "esp", "prt", "nld", "bel",
+            "rus", "grc", "aze", "che", "aut", "pol", "rou", "bgr", "hun", "cze"
+        ]
+        if lang_code in common_codes:
+            name = f"{rest_of_name}.{lang_code}"
+    try:
+        name = unicodedata.normalize("NFKD", name)
+        name = "".join([c for c in name if not unicodedata.combining(c)])
+    except Exception:
+        pass
+    name = re.sub(r'(\(.*\))|(\[.*?\])|(".*?")|(\=.*)', ' ', name)
+    name = re.sub(r'\b(HD|FHD|UHD|4K|8K|SD)\b', ' ', name, flags=re.IGNORECASE)
+    name = re.sub(r'[^\w\d\s.]+', ' ', name)
+    name = re.sub(r'\s+', '', name)
+    return name.strip().lower()
+
+def make_names(count, unique):
+    rng = random.Random(8)
+    pool = [
+        f"{rng.choice(PREFIXES)}{rng.choice(WORDS)} {rng.choice(WORDS)} {index}{rng.choice(SUFFIXES)}"
+        for index in range(unique)
+    ]
+    return pool + [rng.choice(pool) for index in range(count - unique)]
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--count", type=int, default=100000)
+    parser.add_argument("--unique", type=int, default=20000)
+    args = parser.parse_args()
+    names = make_names(args.count, min(args.unique, args.count))
+
+    started = time.perf_counter()
+    old_keys = [old_clean_key(name) for name in names]
+    old_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    bulk_keys = name_normalizer.clean_keys(names)
+    bulk_seconds = time.perf_counter() - started
+
+    name_normalizer._cached_normalize.cache_clear()
+    started = time.perf_counter()
+    cold_keys = [name_normalizer.clean_key(name) for name in names]
+    cold_seconds = time.perf_counter() - started
+    started = time.perf_counter()
+    warm_keys = [name_normalizer.clean_key(name) for name in names]
+    warm_seconds = time.perf_counter() - started
+
+    if not old_keys == bulk_keys == cold_keys == warm_keys:
+        sys.exit("Keys differ between the old _clean_key and name_normalizer.")
+    print(f"{args.count} names, {len(set(names))} unique, identical keys")
+    print(f"  old _clean_key:          {old_seconds:.2f} s")
+    print(f"  clean_keys (bulk):       {bulk_seconds:.2f} s")
+    print(f"  clean_key (cold cache):  {cold_seconds:.2f} s")
+    print(f"  clean_key (warm cache):  {warm_seconds:.2f} s")
+
+if __name__ == "__main__":
+    main()
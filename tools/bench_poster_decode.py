@@ -0,0 +1,130 @@
+# tools/bench_poster_decode.py
+
+"""
+Decode time and resident memory of a poster grid: full-size decode plus the
+old 200 px rescale versus decoding at display size
+(utils.image_loader._decode_data).
+
+    python3 tools/bench_poster_decode.py [--count 5000] [--posters DIR]
+
+Without --posters a synthetic 500x750 JPEG (TMDB's w500 size) is used. Each
+mode runs in its own process and keeps every pixbuf alive, like a grid that
+has been scrolled through, so the RSS delta is the memory the posters hold.
+Needs PyGObject with GdkPixbuf.
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import gi
+gi.require_version("GdkPixbuf", "2.0")
+from gi.repository import GLib, GdkPixbuf
+
+POSTER_WIDTH = 160
+POSTER_HEIGHT = 240
+SOURCE_WIDTH = 500
+SOURCE_HEIGHT = 750
+OLD_TARGET_WIDTH = 200
+
+def _rss_kb():
+    with open("/proc/self/statm") as f:
+        return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") // 1024
+
+def _synthetic_poster(directory):
+    """A noisy JPEG, so decoding costs about what a real poster does."""
+    data = GLib.Bytes.new(os.urandom(SOURCE_WIDTH * SOURCE_HEIGHT * 3))
+    pixbuf = GdkPixbuf.Pixbuf.new_from_bytes(
+        data, GdkPixbuf.Colorspace.RGB, False, 8, SOURCE_WIDTH, SOURCE_HEIGHT, SOURCE_WIDTH * 3
+    )
+    path = os.path.join(directory, "poster.jpg")
+    pixbuf.savev(path, "jpeg", ["quality"], ["90"])
+    return [path]
+
+def _decode_full(data):
+    """
+    The previous path: full-size decode, then the grid's rescale to 200 px
+    wide. Only the rescaled pixbuf was kept for the texture.
+    """
+    loader = GdkPixbuf.PixbufLoader.new()
+    loader.write(data)
+    loader.close()
+    pixbuf = loader.get_pixbuf()
+    started = time.perf_counter()
+    width, height = pixbuf.get_width(), pixbuf.get_height()
+    if width > OLD_TARGET_WIDTH:
+        pixbuf = pixbuf.scale_simple(OLD_TARGET_WIDTH, int(height * OLD_TARGET_WIDTH / width), GdkPixbuf.InterpType.BILINEAR)
+    return pixbuf, time.perf_counter() - started
+
+def _decode_scaled(data):
+    from utils.image_loader import _decode_data
+    return _decode_data(data, POSTER_WIDTH, POSTER_HEIGHT), 0.0
+
+def run_mode(mode, paths, count):
+    decode = _decode_full if mode == "full" else _decode_scaled
+    blobs = []
+    for path in paths:
+        with open(path, "rb") as f:
+            blobs.append(f.read())
+    decode(blobs[0])
+    kept = []
+    rss_before = _rss_kb()
+    started = time.perf_counter()
+    main_thread_seconds = 0.0
+    for index in range(count):
+        pixbuf, rescale_seconds = decode(blobs[index % len(blobs)])
+        main_thread_seconds += rescale_seconds
+        kept.append(pixbuf)
+    elapsed = time.perf_counter() - started
+    pixel_bytes = sum(p.get_rowstride() * p.get_height() for p in kept)
+    return {
+        "mode": mode,
+        "posters": count,
+        "decoded_size": f"{kept[0].get_width()}x{kept[0].get_height()}",
+        "decode_ms_per_poster": round(elapsed / count * 1000, 3),
+        "rescale_ms_per_bind": round(main_thread_seconds / count * 1000, 3),
+        "pixel_mb": round(pixel_bytes / 1024 / 1024, 1),
+        "rss_delta_mb": round((_rss_kb() - rss_before) / 1024, 1),
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--count", type=int, default=5000)
+    parser.add_argument("--posters", help="directory of poster images to cycle through")
+    parser.add_argument("--mode", choices=("full", "scaled"), help=argparse.SUPPRESS)
+    parser.add_argument("--paths", nargs="*", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.mode:
+        print(json.dumps(run_mode(args.mode, args.paths, args.count)))
+        return
+    with tempfile.TemporaryDirectory() as temp_dir:
+        if args.posters:
+            paths = sorted(
+                os.path.join(args.posters, name) for name in os.listdir(args.posters)
+                if name.lower().endswith((".jpg", ".jpeg", ".png", ".webp"))
+            )
+        else:
+            paths = _synthetic_poster(temp_dir)
+        if not paths:
+            sys.exit(f"No images in {args.posters}")
+        for mode in ("full", "scaled"):
+            output = subprocess.run(
+                [sys.executable, __file__, "--mode", mode, "--count", str(args.count), "--paths", *paths],
+                check=True, capture_output=True, text=True
+            ).stdout
+            result = json.loads(output.strip().splitlines()[-1])
+            print(
+                f"{result['mode']:>6}: {result['posters']} posters at {result['decoded_size']}, "
+                f"{result['decode_ms_per_poster']} ms/poster decode, "
+                f"{result['rescale_ms_per_bind']} ms/bind main-thread rescale, "
+                f"{result['pixel_mb']} MB pixels, RSS +{result['rss_delta_mb']} MB"
+            )
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+# tools/bench_xmltv_timestamps.py
+
+"""
+XMLTV timestamp decoding: the previous strptime-based parse_time versus
+epg_provider.parse_timestamp.
+
+    python3 tools/bench_xmltv_timestamps.py [--count 1000000]
+
+The timestamps look like a guide's: a two-week window at five-minute steps,
+with a handful of UTC offsets. Both paths must return identical epoch
+seconds, and must reject the same malformed dates.
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+from datetime import datetime, timezone, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from data_providers import epg_provider
+
+OFFSETS = ("+0000", "+0100", "+0200", "+0300", "-0500", "+0530")
+INVALID = ("20230229120000 +0000", "20230431120000 +0000", "20231301120000 +0000",
+           "20230101246000 +0000", "20230101235960 +0000", "00000101000000 +0000")
+
+def old_parse_time(time_str):
+    dt_part = time_str[:-6]
+    tz_part = time_str[-5:]
+    dt_obj = datetime.strptime(dt_part, '%Y%m%d%H%M%S')
+    offset_hours = int(tz_part[1:3])
+    offset_minutes = int(tz_part[3:5])
+    sign = -1 if tz_part[0] == '-' else 1
+    tz_offset = timezone(timedelta(hours=sign * offset_hours, minutes=sign * offset_minutes))
+    return dt_obj.replace(tzinfo=tz_offset)
+
+def make_timestamps(count):
+    rng = random.Random(5)
+    start = datetime(2024, 2, 20, tzinfo=timezone.utc)
+    timestamps = []
+    for index in range(count):
+        moment = start + timedelta(minutes=5 * rng.randrange(14 * 288))
+        offset = rng.choice(OFFSETS)
+        sign = -1 if offset[0] == '-' else 1
+        local = moment + sign * timedelta(hours=int(offset[1:3]), minutes=int(offset[3:5]))
+        timestamps.append(f"{local:%Y%m%d%H%M%S} {offset}")
+    return timestamps
+
+def _rejects(parse, time_str):
+    try:
+        parse(time_str)
+    except ValueError:
+        return True
+    return False
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--count", type=int, default=1000000)
+    args = parser.parse_args()
+    timestamps = make_timestamps(args.count)
+
+    started = time.perf_counter()
+    old_results = [int(old_parse_time(t).timestamp()) for t in timestamps]
+    old_seconds = time.perf_counter() - started
+
+    epg_provider._days_since_epoch.cache_clear()
+    epg_provider._offset_seconds.cache_clear()
+    started = time.perf_counter()
+    new_results = [epg_provider.parse_timestamp(t) for t in timestamps]
+    new_seconds = time.perf_counter() - started
+
+    if old_results != new_results:
+        sys.exit("Epoch results differ between strptime and parse_timestamp.")
+    for time_str in INVALID:
+        if _rejects(old_parse_time, time_str) != _rejects(epg_provider.parse_timestamp, time_str):
+            sys.exit(f"'{time_str}' is not rejected the same way by both paths.")
+    print(f"{args.count} timestamps, identical epoch results, same rejections for {len(INVALID)} invalid dates")
+    print(f"  strptime parse_time: {old_seconds:.2f} s")
+    print(f"  parse_timestamp:     {new_seconds:.2f} s ({old_seconds / new_seconds:.1f}x)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+# tools/check_query_plans.py
+
+"""
+EXPLAIN QUERY PLAN regression check for the hot library and profile queries.
+
+    python3 tools/check_query_plans.py
+
+Builds fresh config, library and profile databases in a temporary
+XDG_CONFIG_HOME through the normal initialization and migrations, then
+asserts that every query below searches with the expected index instead of
+scanning its table. The queries are imported from database.py, so the
+check follows the SQL the app actually runs. Exits non-zero if any fails.
+"""
+
+import os
+import re
+import sys
+import tempfile
+
+_config_home = tempfile.TemporaryDirectory()
+os.environ["XDG_CONFIG_HOME"] = _config_home.name
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import database
+
+# (query from database.py, index the plan has to use)
+TWO_PLACEHOLDERS = "?, ?"
+LIBRARY_QUERIES = [
+    (database.SQL_LIBRARIES_BY_TYPE, "idx_libraries_type"),
+    (database.SQL_MEDIA_FILES_BY_TYPE, "idx_media_files_library_id"),
+    (database.SQL_MEDIA_FILES_BY_LIBRARY_ID, "idx_media_files_library_id"),
+    (database.SQL_METADATA_BY_PATH, "sqlite_autoindex_media_metadata_1"),
+    (database.SQL_PATHS_FOR_TMDB_IDS.format(placeholders=TWO_PLACEHOLDERS), "idx_media_metadata_tmdb_id"),
+    (database.SQL_TRACKS_FOR_ALBUM, "idx_tracks_album_id"),
+    (database.SQL_ALBUMS_BY_LIBRARY_ID, "idx_tracks_library_id"),
+    (database.SQL_ALBUM_IDS_BY_LIBRARY_ID, "idx_tracks_library_id"),
+    (database.SQL_ALBUM_IDS_BY_TRACK_PATHS.format(placeholders=TWO_PLACEHOLDERS), "sqlite_autoindex_tracks_1"),
+    (database.SQL_DELETE_ORPHAN_ALBUM, "idx_tracks_album_id"),
+    (database.SQL_DELETE_ORPHAN_ARTIST, "idx_albums_artist_id"),
+    (database.SQL_DELETE_MEDIA_FILE, "sqlite_autoindex_media_files_1"),
+]
+PROFILE_QUERIES = [
+    (database.SQL_CHANNELS_IN_LIST, "idx_favorite_channels_list"),
+    (database.SQL_MAX_CHANNEL_ORDER_IN_LIST, "idx_favorite_channels_list"),
+    (database.SQL_CHANNEL_IN_ANY_FAVORITE, "sqlite_autoindex_favorite_channels_1"),
+    (database.SQL_PENDING_RECORDINGS_DUE, "idx_scheduled_recordings_status"),
+    (database.SQL_ACTIVE_RECORDINGS, "idx_scheduled_recordings_status"),
+    (database.SQL_LOCKED_CHANNEL_URLS, "idx_channel_properties_locked"),
+    (database.SQL_HIDDEN_BOUQUETS, "idx_bouquet_properties_hidden"),
+    (database.SQL_EPG_CHANNEL_MAP, "idx_epg_channel_map_signature"),
+    (database.SQL_PLAYBACK_POSITION, "sqlite_autoindex_playback_progress_1"),
+    (database.SQL_WATCHED_PATHS.format(placeholders=TWO_PLACEHOLDERS), "sqlite_autoindex_playback_progress_1"),
+]
+_FULL_SCAN_RE = re.compile(r"^SCAN \w+( AS \w+)?$")
+
+def check_queries(conn, queries):
+    failures = 0
+    for query, index in queries:
+        plan = [row[3] for row in conn.execute(f"EXPLAIN QUERY PLAN {query}", (1,) * query.count("?"))]
+        full_scans = [detail for detail in plan if _FULL_SCAN_RE.match(detail)]
+        if full_scans or not any(index in detail for detail in plan):
+            failures += 1
+            print(f"FAIL {query}\n     expected {index}, plan: {plan}")
+        else:
+            print(f"ok   {index}: {' '.join(query.split())[:70]}")
+    return failures
+
+def main():
+    database.initialize_database()
+    database.set_active_profile_db("query-plan-check")
+    library_conn = database.get_library_db_connection()
+    profile_conn = database.get_profile_db_connection()
+    failures = check_queries(library_conn, LIBRARY_QUERIES)
+    failures += check_queries(profile_conn, PROFILE_QUERIES)
+    if failures:
+        sys.exit(f"{failures} query plan check(s) failed.")
+    print("All query plans use their indexes.")
+
+if __name__ == "__main__":
+    main()
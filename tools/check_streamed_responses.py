@@ -0,0 +1,60 @@
+# tools/check_streamed_responses.py
+
+"""
+Finds stream=True requests that are not closed by a with block.
+
+    python3 tools/check_streamed_responses.py
+
+A streamed response keeps its pooled connection (utils.http_client allows
+MAX_CONNECTIONS_PER_HOST per host and blocks when they are all taken) until
+it is read to the end or closed, and an error response skipped by
+raise_for_status() is neither. Every call with stream=True therefore has to
+be the context expression of a with statement. Exits non-zero when one is
+not.
+"""
+
+import ast
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SKIPPED_DIRS = {".git", "__pycache__", "build", ".flatpak-builder"}
+
+def _is_streamed_call(node):
+    return isinstance(node, ast.Call) and any(
+        keyword.arg == "stream" and isinstance(keyword.value, ast.Constant) and keyword.value.value is True
+        for keyword in node.keywords
+    )
+
+def check_file(path):
+    with open(path, encoding="utf-8") as f:
+        tree = ast.parse(f.read(), filename=path)
+    managed = {
+        id(item.context_expr)
+        for node in ast.walk(tree) if isinstance(node, (ast.With, ast.AsyncWith))
+        for item in node.items
+    }
+    return [
+        node.lineno for node in ast.walk(tree)
+        if _is_streamed_call(node) and id(node) not in managed
+    ]
+
+def main():
+    failures = 0
+    checked = 0
+    for directory, subdirs, files in os.walk(ROOT):
+        subdirs[:] = [name for name in subdirs if name not in SKIPPED_DIRS]
+        for name in files:
+            if not name.endswith(".py"):
+                continue
+            path = os.path.join(directory, name)
+            checked += 1
+            for lineno in check_file(path):
+                failures += 1
+                print(f"FAIL {os.path.relpath(path, ROOT)}:{lineno} stream=True response outside a with block")
+    if failures:
+        sys.exit(f"{failures} streamed response(s) can leak a pooled connection.")
+    print(f"All streamed responses in {checked} files are closed by a with block.")
+
+if __name__ == "__main__":
+    main()
@@ -7,18 +7,19 @@ from gi.repository import Gtk, Adw, GObject, GLib
 import gettext
 from datetime import datetime, timedelta, timezone
 import logging
+import time
 _ = gettext.gettext
 class CatchupDialog(Adw.PreferencesWindow):
     __gsignals__ = {
         'program-selected': (GObject.SignalFlags.RUN_FIRST, None, (object,))
     }
 
-    def __init__(self, parent, channel_id, archive_duration_days, all_epg_data):
+    def __init__(self, parent, channel_id, archive_duration_days, epg_store):
         super().__init__(transient_for=parent)
         self.add_css_class("catchup-dialog")
         self.channel_id = channel_id
         self.archive_duration_days = archive_duration_days
-        self.all_epg_data = all_epg_data
+        self.epg_store = epg_store
         self.set_title(_("Past Programs"))
         self.set_default_size(550, 600)
         self.set_modal(True)
@@ -28,8 +29,10 @@ class CatchupDialog(Adw.PreferencesWindow):
         self._populate_programs()
 
     def _populate_programs(self):
-        """Filters EPG data, groups by date, and populates the list."""
-        channel_programs = self.all_epg_data.get(self.channel_id, [])
+        """Queries the archive window from the EPG store, groups by date, and populates the list."""
+        now_ts = int(time.time())
+        window_start_ts = now_ts - int(self.archive_duration_days * 86400)
+        channel_programs = self.epg_store.get_programs(self.channel_id, window_start_ts, now_ts) if self.epg_store else []
         if not channel_programs:
             no_data_group = Adw.PreferencesGroup()
             no_data_label = Gtk.Label(label=_("No EPG data found for this channel."), margin_top=15, margin_bottom=15)
@@ -38,11 +41,9 @@ class CatchupDialog(Adw.PreferencesWindow):
             return
         grouped_programs = {}
         now_local = datetime.now().astimezone()
-        start_date_limit_local = now_local - timedelta(days=self.archive_duration_days)
         for program in channel_programs:
-            program_start_local = program['start'].astimezone()
-            program_stop_local = program['stop'].astimezone()
-            if start_date_limit_local <= program_stop_local < now_local:
+            if window_start_ts <= program['stop_ts'] < now_ts:
+                program_start_local = program['start'].astimezone()
                 date_str = program_start_local.strftime('%Y-%m-%d')
                 if date_str not in grouped_programs:
                     grouped_programs[date_str] = []
@@ -9,40 +9,51 @@ from .password_prompt_dialog import PasswordPromptDialog
 from .password_dialog import PasswordDialog
 from .move_channel_dialog import MoveChannelDialog
 import gettext
-import re
-import unicodedata
+import heapq
 import threading
-import urllib.request
+import time
 import logging
 import os
 import database
-from datetime import datetime, timezone
 from utils.theme_utils import get_icon_theme_folder
+from utils import epg_matcher
+from utils import name_normalizer
+from utils import image_loader
 from background import image_download_pool
-from urllib.parse import urlparse 
-_failed_logo_hosts = set()
-try:
-    from thefuzz import fuzz, process
-    logging.info("Loaded 'thefuzz' library for smart searching.")
-    FUZZ_AVAILABLE = True
-except ImportError:
-    try:
-        from fuzzywuzzy import fuzz, process
-        logging.info("Loaded fallback 'fuzzywuzzy' library for smart searching.")
-        FUZZ_AVAILABLE = True
-    except ImportError:
-        logging.warning("Smart search library ('thefuzz' or 'fuzzywuzzy') not found!")
-        logging.warning("'Fuzzy' search will be skipped for Logo/EPG/TMDb matching.")
-        logging.warning("For better results, install 'python3-thefuzz' (Debian/Ubuntu) or 'python3-fuzzywuzzy' (Fedora) package.")
-        fuzz = None
-        process = None
-        FUZZ_AVAILABLE = False
+LOGO_DECODE_SIZE = 72
 _ = gettext.gettext
 
+class ChannelItem(GObject.Object):
+    __gtype_name__ = "ChannelItem"
+    name = GObject.Property(type=str)
+    is_favorite = GObject.Property(type=bool, default=False)
+    is_locked = GObject.Property(type=bool, default=False)
+    epg_title = GObject.Property(type=str, default=None)
+    epg_progress = GObject.Property(type=float, default=0.0)
+    logo_pixbuf = GObject.Property(type=GdkPixbuf.Pixbuf)
+
+    def __init__(self, channel_data, is_favorite=False, is_locked=False, **kwargs):
+        super().__init__(**kwargs)
+        self.channel_data = channel_data
+        self.props.name = channel_data.get("name") or ""
+        self.props.is_favorite = is_favorite
+        self.props.is_locked = is_locked
+        self.search_name = self.props.name.lower()
+        self.correct_logo_path = None
+        self.logo_resolved = False
+        self.logo_requested = False
+        self.logo_request = None
+        self.epg_checked_at = None
+        self.epg_start_ts = None
+        self.epg_stop_ts = None
+        self.epg_next_change_ts = None
+        self.epg_boundary_queued = None
+
 class ChannelList(Gtk.Box):
     __gsignals__ = {
         'pip-requested': (GObject.SignalFlags.RUN_FIRST, None, (str,)),
-        'back-clicked': (GObject.SignalFlags.RUN_FIRST, None, ())
+        'back-clicked': (GObject.SignalFlags.RUN_FIRST, None, ()),
+        'channel-activated': (GObject.SignalFlags.RUN_FIRST, None, (object,))
     }
 
     def __init__(self, **kwargs):
@@ -71,12 +82,24 @@ class ChannelList(Gtk.Box):
         self.search_entry.connect("search-changed", self._on_search_changed)
         self.append(self.search_entry)
         self.spinner = Gtk.Spinner(halign=Gtk.Align.CENTER, valign=Gtk.Align.CENTER, vexpand=True)
-        self.channel_listbox = Gtk.ListBox()
+        self.model = Gio.ListStore.new(ChannelItem)
+        self.search_text = ""
+        self.custom_filter = Gtk.CustomFilter.new(self._on_filter_item)
+        self.filter_model = Gtk.FilterListModel.new(self.model, self.custom_filter)
+        self.selection_model = Gtk.SingleSelection.new(self.filter_model)
+        self.selection_model.set_autoselect(False)
+        self.selection_model.set_can_unselect(True)
+        factory = Gtk.SignalListItemFactory()
+        factory.connect("setup", self._on_factory_setup)
+        factory.connect("bind", self._on_factory_bind)
+        factory.connect("unbind", self._on_factory_unbind)
+        self.channel_view = Gtk.ListView.new(self.selection_model, factory)
+        self.channel_view.connect("activate", self._on_view_activate)
         scrolled_window = Gtk.ScrolledWindow()
         key_controller = Gtk.EventControllerKey()
         key_controller.connect("key-released", self._on_list_key_released)
-        self.channel_listbox.add_controller(key_controller)
-        scrolled_window.set_child(self.channel_listbox)
+        self.channel_view.add_controller(key_controller)
+        scrolled_window.set_child(self.channel_view)
         scrolled_window.set_policy(Gtk.PolicyType.NEVER, Gtk.PolicyType.AUTOMATIC)
         scrolled_window.set_vexpand(True)
         scrolled_window.set_size_request(300, -1)
@@ -85,130 +108,274 @@ class ChannelList(Gtk.Box):
         self.view_stack.add_named(self.spinner, "loading")
         self.append(self.view_stack)
         self.active_row = None
+        self._populate_generation = 0
+        self._logo_map = {}
+        self._epg_data = None
+        self._epg_resolver = None
+        self._epg_valid_after = 0.0
+        self._bound_items = set()
+        self._epg_boundary_heap = []
+        self._epg_boundary_seq = 0
+        self._epg_boundary_timer_id = None
+        self._epg_boundary_due = None
+        self.epg_update_timer_id = None
 
     def populate_channels_async(self, channels, icon_path=""):
         """
-        Populates the channel list and starts a background timer to refresh EPG status.
+        Populates the channel model in chunks and starts a background timer to refresh EPG status.
+        Row widgets are only created for the visible part of the list.
         """
         self._failed_epg_searches.clear()
-        if hasattr(self, 'epg_update_timer_id') and self.epg_update_timer_id:
+        if self.epg_update_timer_id:
             GLib.source_remove(self.epg_update_timer_id)
             self.epg_update_timer_id = None
-        while (child := self.channel_listbox.get_first_child()):
-            self.channel_listbox.remove(child)
+        self._clear_epg_boundaries()
+        self._populate_generation += 1
+        self.model.remove_all()
         self.view_stack.set_visible_child_name("loading")
         self.spinner.start()
         favorite_urls_set = database.get_all_favorite_channel_urls()
         locked_urls_set = database.get_all_locked_channel_urls()
-        logo_map = {}
-        epg_data = None
-        epg_clean_map = None
+        self._logo_map = {}
+        self._epg_data = None
+        self._epg_resolver = None
         main_window = self.get_ancestor(Gtk.Window)
         if main_window:
             if hasattr(main_window, 'logo_map'):
-                logo_map = main_window.logo_map
+                self._logo_map = main_window.logo_map
             if hasattr(main_window, 'epg_data'):
-                epg_data = main_window.epg_data
-            if hasattr(main_window, 'epg_clean_map'):
-                epg_clean_map = main_window.epg_clean_map
+                self._epg_data = main_window.epg_data
+            if hasattr(main_window, 'resolve_epg_channel_id'):
+                self._epg_resolver = main_window.resolve_epg_channel_id
         channel_generator = (channel for channel in channels)
         GLib.idle_add(
             self._populate_chunk,
             channel_generator,
-            logo_map,
             favorite_urls_set,
             locked_urls_set,
-            epg_data,
-            epg_clean_map
+            self._populate_generation
         )
-        self.epg_update_timer_id = GLib.timeout_add_seconds(60, self._update_all_rows_epg)
+        self.epg_update_timer_id = GLib.timeout_add_seconds(30, self._advance_epg_progress)
 
-    def _populate_chunk(self, channel_generator, logo_map, favorite_urls, locked_urls, epg_data, epg_clean_map):
-        """Processes channel chunks and calculates progress for each current program."""
-        chunk_size = 50
+    def _populate_chunk(self, channel_generator, favorite_urls, locked_urls, generation):
+        """Wraps a chunk of channels into model items and appends them in one splice."""
+        if generation != self._populate_generation:
+            return False
+        chunk_size = 1000
+        items = []
+        finished = False
         try:
             for _ in range(chunk_size):
                 channel = next(channel_generator)              
                 is_fav = False
                 is_locked = False
-                epg_info = None
                 if 'url' in channel:
                     is_fav = channel["url"] in favorite_urls
                     is_locked = channel["url"] in locked_urls
-                    epg_info = self._get_current_program_info(channel, epg_data, epg_clean_map)
                 elif 'is_locked' in channel:
                     is_locked = channel['is_locked']
-                    epg_info = None
-                self._add_row_to_listbox(channel, logo_map, is_fav, is_locked, epg_info)
-            return True
+                items.append(ChannelItem(channel, is_fav, is_locked))
         except StopIteration:
+            finished = True
+        except Exception as e:
+            logging.exception(f"Error in _populate_chunk (ChannelList): {e}")
+        if items:
+            self.model.splice(self.model.get_n_items(), 0, items)
+        if finished:
             self.spinner.stop()
             self.view_stack.set_visible_child_name("list")
-            logging.info("Incremental population of the channel list is complete.")
+            logging.info(f"Incremental population of the channel list is complete ({self.model.get_n_items()} items).")
             return False
-        except Exception as e:
-            logging.exception(f"Error in _populate_chunk (ChannelList): {e}")
-            return True
+        return True
 
-    def _add_row_to_listbox(self, channel, logo_map, is_fav, is_locked, epg_info=None):
-        """Creates a ListBoxRow and stores widget references for dynamic updates."""
-        row = Gtk.ListBoxRow()
+    def _on_factory_setup(self, factory, list_item):
         hbox = Gtk.Box(orientation=Gtk.Orientation.HORIZONTAL, spacing=12)
         hbox.set_margin_start(10); hbox.set_margin_end(10)
-        row.set_child(hbox)
-        if 'url' in channel:
-            placeholder = PlaceholderIcon()
-            placeholder.set_size_request(36, 36)
-            hbox.append(placeholder)           
-            logo_to_load = self._find_logo_path(channel, logo_map)
-            row.correct_logo_path = logo_to_load           
-            if logo_to_load and logo_to_load.strip():
-                self._load_logo_and_replace(logo_to_load, placeholder)
-        else:
-            row.correct_logo_path = None
+        list_item.set_child(hbox)
+        logo_stack = Gtk.Stack()
+        placeholder = PlaceholderIcon()
+        placeholder.set_size_request(36, 36)
+        logo_stack.add_named(placeholder, "placeholder")
+        logo_image = Gtk.Image()
+        logo_image.add_css_class("channel-logo-image")
+        logo_image.set_pixel_size(36)
+        logo_stack.add_named(logo_image, "logo")
+        hbox.append(logo_stack)
         label_vbox = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=2)
         label_vbox.set_hexpand(True)
         label_vbox.set_valign(Gtk.Align.CENTER)
-        name_label = Gtk.Label(label=channel["name"], xalign=0)
+        name_label = Gtk.Label(xalign=0)
         name_label.set_ellipsize(Pango.EllipsizeMode.END)
         label_vbox.append(name_label)
-        row.epg_label = None
-        row.epg_progress = None
-        row.label_vbox = label_vbox
-        row.channel_data = channel
-        if epg_info:
-            row.epg_label = Gtk.Label(label=epg_info['title'], xalign=0)
-            row.epg_label.set_ellipsize(Pango.EllipsizeMode.END)
-            row.epg_label.add_css_class("caption")
-            label_vbox.append(row.epg_label)
-            if epg_info['progress'] is not None:
-                row.epg_progress = Gtk.ProgressBar()
-                row.epg_progress.set_fraction(epg_info['progress'])
-                row.epg_progress.add_css_class("epg-progress-bar")
-                label_vbox.append(row.epg_progress)
+        epg_label = Gtk.Label(xalign=0)
+        epg_label.set_ellipsize(Pango.EllipsizeMode.END)
+        epg_label.add_css_class("caption")
+        label_vbox.append(epg_label)
+        epg_progress = Gtk.ProgressBar()
+        epg_progress.add_css_class("epg-progress-bar")
+        label_vbox.append(epg_progress)
         hbox.append(label_vbox)
         theme_folder = get_icon_theme_folder()
-        row.fav_icon = Gtk.Image.new_from_file(os.path.join("resources", "icons", theme_folder, "favorite-icon.svg"))
-        row.fav_icon.set_pixel_size(16); hbox.append(row.fav_icon)
-        row.lock_icon = Gtk.Image.new_from_file(os.path.join("resources", "icons", theme_folder, "lock-icon.svg"))
-        row.lock_icon.set_pixel_size(16); hbox.append(row.lock_icon)
-        row.fav_icon.set_visible(is_fav)
-        row.lock_icon.set_visible(is_locked)
+        fav_icon = Gtk.Image.new_from_file(os.path.join("resources", "icons", theme_folder, "favorite-icon.svg"))
+        fav_icon.set_pixel_size(16); hbox.append(fav_icon)
+        lock_icon = Gtk.Image.new_from_file(os.path.join("resources", "icons", theme_folder, "lock-icon.svg"))
+        lock_icon.set_pixel_size(16); hbox.append(lock_icon)
+        click_gesture = Gtk.GestureClick.new()
+        click_gesture.connect("pressed", self._on_row_pressed, list_item)
+        hbox.add_controller(click_gesture)
         right_click_gesture = Gtk.GestureClick.new(); right_click_gesture.set_button(3)
-        right_click_gesture.connect("pressed", self._on_row_right_clicked, row)
-        row.add_controller(right_click_gesture)
-        self.channel_listbox.append(row)
+        right_click_gesture.connect("pressed", self._on_row_right_clicked, list_item)
+        hbox.add_controller(right_click_gesture)
+        list_item.logo_stack = logo_stack
+        list_item.logo_image = logo_image
+        list_item.name_label = name_label
+        list_item.epg_label = epg_label
+        list_item.epg_progress = epg_progress
+        list_item.fav_icon = fav_icon
+        list_item.lock_icon = lock_icon
+
+    def _on_factory_bind(self, factory, list_item):
+        """Binds a recycled row to its item. Logo and EPG are only resolved here, for visible rows."""
+        item = list_item.get_item()
+        list_item.name_label.set_text(item.props.name)
+        if 'url' in item.channel_data:
+            self._resolve_logo(item)
+            if item.props.logo_pixbuf is None and item.correct_logo_path and item.correct_logo_path.strip():
+                self._load_logo(item)
+            self._bound_items.add(item)
+            if self._is_item_epg_stale(item):
+                self._refresh_item_epg(item, self._epg_data, self._epg_resolver)
+            else:
+                self._update_item_progress(item, int(time.time()))
+                self._push_epg_boundary(item)
+        list_item.notify_handler_id = item.connect("notify", self._on_item_notify, list_item)
+        self._sync_row_widgets(list_item, item)
+
+    def _on_factory_unbind(self, factory, list_item):
+        self._bound_items.discard(list_item.get_item())
+        self._cancel_logo_request(list_item.get_item())
+        handler_id = getattr(list_item, "notify_handler_id", None)
+        if handler_id:
+            item = list_item.get_item()
+            if item and GObject.signal_handler_is_connected(item, handler_id):
+                item.disconnect(handler_id)
+            delattr(list_item, "notify_handler_id")
+
+    def _on_item_notify(self, item, pspec, list_item):
+        if list_item.get_item() is item:
+            self._sync_row_widgets(list_item, item)
+
+    def _sync_row_widgets(self, list_item, item):
+        has_url = 'url' in item.channel_data
+        list_item.logo_stack.set_visible(has_url)
+        if item.props.logo_pixbuf is not None:
+            list_item.logo_image.set_from_pixbuf(item.props.logo_pixbuf)
+            list_item.logo_stack.set_visible_child_name("logo")
+        else:
+            list_item.logo_image.clear()
+            list_item.logo_stack.set_visible_child_name("placeholder")
+        epg_title = item.props.epg_title
+        list_item.epg_label.set_visible(bool(epg_title))
+        list_item.epg_progress.set_visible(bool(epg_title))
+        if epg_title:
+            list_item.epg_label.set_text(epg_title)
+            list_item.epg_progress.set_fraction(item.props.epg_progress)
+        list_item.fav_icon.set_visible(item.props.is_favorite)
+        list_item.lock_icon.set_visible(item.props.is_locked)
+
+    def _resolve_logo(self, item):
+        if not item.logo_resolved:
+            item.correct_logo_path = self._find_logo_path(item.channel_data, self._logo_map)
+            item.logo_resolved = True
+        return item.correct_logo_path
+
+    def _on_filter_item(self, item):
+        if not self.search_text:
+            return True
+        return self.search_text in item.search_name
+
+    def _position_of(self, item):
+        for position in range(self.filter_model.get_n_items()):
+            if self.filter_model.get_item(position) is item:
+                return position
+        return None
+
+    def _emit_channel_activated(self, item):
+        if item is None:
+            return
+        if 'url' in item.channel_data:
+            self._resolve_logo(item)
+        self.emit("channel-activated", item)
+
+    def _on_row_pressed(self, gesture, n_press, x, y, list_item):
+        gesture.set_state(Gtk.EventSequenceState.CLAIMED)
+        if n_press != 1:
+            return
+        item = list_item.get_item()
+        if not item:
+            return
+        self.selection_model.set_selected(list_item.get_position())
+        self.channel_view.grab_focus()
+        self._emit_channel_activated(item)
+
+    def _on_view_activate(self, list_view, position):
+        self._emit_channel_activated(self.filter_model.get_item(position))
+
+    def get_selected_item(self):
+        """Returns the selected ChannelItem (its 'channel_data' holds the channel dict) or None."""
+        return self.selection_model.get_selected_item()
+
+    def select_position(self, position, grab_focus=False):
+        self.selection_model.set_selected(position)
+        if hasattr(self.channel_view, "scroll_to"):
+            flags = Gtk.ListScrollFlags.FOCUS if grab_focus else Gtk.ListScrollFlags.NONE
+            self.channel_view.scroll_to(position, flags, None)
+        else:
+            self.channel_view.activate_action("list.scroll-to-item", GLib.Variant.new_uint32(position))
+            if grab_focus:
+                self.channel_view.grab_focus()
+
+    def select_channel(self, predicate, grab_focus=False):
+        """Selects and scrolls to the first visible item whose channel data matches predicate."""
+        for position in range(self.filter_model.get_n_items()):
+            item = self.filter_model.get_item(position)
+            if predicate(item.channel_data):
+                self.select_position(position, grab_focus)
+                return item
+        return None
+
+    def select_relative(self, offset):
+        """Moves the selection by offset (wrapping around) and returns the newly selected item."""
+        total_items = self.filter_model.get_n_items()
+        current_position = self.selection_model.get_selected()
+        if total_items == 0 or current_position == Gtk.INVALID_LIST_POSITION:
+            return None
+        new_position = (current_position + offset) % total_items
+        self.select_position(new_position)
+        item = self.filter_model.get_item(new_position)
+        if item and 'url' in item.channel_data:
+            self._resolve_logo(item)
+        return item
 
-    def _on_row_right_clicked(self, gesture, n_press, x, y, listbox_row):
+    def get_item_position(self, item):
+        """Returns the position of item in the unfiltered model, or None."""
+        found, position = self.model.find(item)
+        return position if found else None
+
+    def _on_row_right_clicked(self, gesture, n_press, x, y, list_item):
         if gesture.get_current_button() == 3:
-            self.active_row = listbox_row
-            menu_model = self._build_dynamic_menu_for_channel(listbox_row.channel_data)
+            item = list_item.get_item()
+            if not item:
+                return
+            self.active_row = item
+            row_widget = list_item.get_child()
+            menu_model = self._build_dynamic_menu_for_channel(item.channel_data, row_widget)
             popover = Gtk.PopoverMenu.new_from_model(menu_model)
             popover.add_css_class("channel-action-popover")
-            popover.set_parent(listbox_row)
+            popover.set_parent(row_widget)
             popover.popup()
 
-    def _build_dynamic_menu_for_channel(self, channel_data):
+    def _build_dynamic_menu_for_channel(self, channel_data, row_widget=None):
         main_menu = Gio.Menu()
         if 'url' not in channel_data:
             return main_menu
@@ -251,8 +418,8 @@ class ChannelList(Gtk.Box):
         play_pip_action = Gio.SimpleAction.new("play_pip", None)
         play_pip_action.connect("activate", self._on_play_pip_activated)
         action_group.add_action(play_pip_action)
-        if self.active_row:
-             self.active_row.insert_action_group("row", action_group)
+        if row_widget:
+             row_widget.insert_action_group("row", action_group)
         return main_menu
 
     def _on_play_pip_activated(self, action, value):
@@ -267,63 +434,6 @@ class ChannelList(Gtk.Box):
         else:
             logging.warning("PiP requested but channel URL is missing.")
 
-    def _clean_key(self, text):
-        if not text:
-            return None
-        name = text.lower().strip()
-        match = re.match(r'^([a-z]{2,3})[| \-_]+(.*)', name)
-        if match:
-            lang_code = match.group(1)
-            rest_of_name = match.group(2)
-            common_codes = [
-                "tr", "us", "uk", "fr", "de", "it", "es", "pt", "nl", "be", 
-                "ru", "gr", "az", "ch", "at", "pl", "ro", "bg", "hu", "cz", 
-                "sk", "al", "rs", "hr", "ba", "mk", "se", "no", "dk", "fi", 
-                "ie", "ca", "au", "nz", "br", "ar", "mx", "ae", "sa", "eg",
-                "tur", "usa", "gbr", "fra", "deu", "ita", "esp", "prt", "nld", "bel",
-                "rus", "grc", "aze", "che", "aut", "pol", "rou", "bgr", "hun", "cze"
-            ]           
-            if lang_code in common_codes:
-                name = f"{rest_of_name}.{lang_code}"
-        try:
-            name = unicodedata.normalize("NFKD", name)
-            name = "".join([c for c in name if not unicodedata.combining(c)])
-        except Exception:
-             pass
-        name = re.sub(r'(\(.*\))|(\[.*?\])|(".*?")|(\=.*)', ' ', name)
-        name = re.sub(r'\b(HD|FHD|UHD|4K|8K|SD)\b', ' ', name, flags=re.IGNORECASE)
-        name = re.sub(r'[^\w\d\s.]+', ' ', name)
-        name = re.sub(r'\s+', '', name)       
-        return name.strip().lower()
-        
-    def _check_digits_match(self, str1, str2):
-        d1 = "".join(re.findall(r'\d', str1))
-        d2 = "".join(re.findall(r'\d', str2))
-        return d1 == d2   
-        
-    def _check_country_match(self, key1, key2):
-        if "." in key1 and "." in key2:
-            return key1.split(".")[-1] == key2.split(".")[-1]
-        if "." in key2:
-            epg_suffix = key2.split(".")[-1].lower()
-            if 2 <= len(epg_suffix) <= 3:
-                channel_prefix = key1[:len(epg_suffix)].lower()               
-                if channel_prefix != epg_suffix:
-                    common_iso_codes = [
-                        "tr", "us", "uk", "fr", "de", "it", "es", "pt", "nl", "be", 
-                        "ru", "gr", "az", "de", "ch", "at", "pl", "ro", "bg", "hu", 
-                        "cz", "sk", "al", "rs", "hr", "ba", "mk", "se", "no", "dk", 
-                        "fi", "ie", "ca", "au", "nz", "br", "ar", "mx", "ae", "sa", 
-                        "eg", "in", "cn", "jp", "kr", "za",
-                        "tur", "usa", "gbr", "fra", "deu", "ita", "esp", "prt", "nld", "bel",
-                        "rus", "grc", "aze", "che", "aut", "pol", "rou", "bgr", "hun", "cze",
-                        "svk", "alb", "srb", "hrv", "bih", "mkd", "swe", "nor", "dnk", "fin",
-                        "irl", "can", "aus", "nzl", "bra", "arg", "mex", "are", "sau", "egy"
-                    ]
-                    if channel_prefix in common_iso_codes:
-                        return False               
-        return True             
-
     def _find_logo_path(self, channel_data, logo_map):
         fallback_logo_url = channel_data.get("logo")
         if not logo_map:
@@ -334,21 +444,21 @@ class ChannelList(Gtk.Box):
         search_keys = []
         for raw_val in [t_id, t_name, name]:
             if raw_val:
-                clean = self._clean_key(raw_val)
+                clean = name_normalizer.clean_key(raw_val)
                 if clean and clean not in search_keys:
                     search_keys.append(clean)
         for clean_key in search_keys:
             if clean_key in logo_map:
                 logging.debug(f"Logo found (exact match): '{name}' -> '{clean_key}.png'")
                 return logo_map[clean_key]
-        if FUZZ_AVAILABLE and search_keys:
+        if epg_matcher.FUZZ_AVAILABLE and search_keys:
             primary_key = search_keys[0]
-            best_match_tuple = process.extractOne(primary_key, logo_map.keys())           
+            best_match_tuple = epg_matcher.extract_one(primary_key, logo_map.keys())
             if best_match_tuple:
                 best_match, score = best_match_tuple
-                if score >= 80 and \
-                   self._check_digits_match(primary_key, best_match) and \
-                   self._check_country_match(primary_key, best_match):
+                if score >= epg_matcher.FUZZY_SCORE_CUTOFF and \
+                   epg_matcher.check_digits_match(primary_key, best_match) and \
+                   epg_matcher.check_country_match(primary_key, best_match):
                     len1, len2 = len(primary_key), len(best_match)
                     ratio = max(len1, len2) / min(len1, len2) if min(len1, len2) > 0 else 0
                     first_char_match = primary_key[0] == best_match[0]                   
@@ -361,7 +471,7 @@ class ChannelList(Gtk.Box):
         if not self.active_row: return
         url = self.active_row.channel_data["url"]
         database.add_channel_to_list(url, list_id)
-        self.active_row.fav_icon.set_visible(True)
+        self.active_row.props.is_favorite = True
         main_window = self.get_ancestor(Gtk.Window)
         if main_window and hasattr(main_window, 'favorites_view'):
              main_window.favorites_view.emit("favorites-changed")
@@ -372,11 +482,11 @@ class ChannelList(Gtk.Box):
         url = row_to_remove.channel_data["url"]
         database.remove_channel_from_list(url, list_id)
         if self.active_list_id == list_id:
-            listbox = row_to_remove.get_parent()
-            if listbox:
-                listbox.remove(row_to_remove)
+            position = self.get_item_position(row_to_remove)
+            if position is not None:
+                self.model.remove(position)
         elif not database.is_channel_in_any_favorite(url):
-            row_to_remove.fav_icon.set_visible(False)
+            row_to_remove.props.is_favorite = False
         main_window = self.get_ancestor(Gtk.Window)
         if main_window and hasattr(main_window, 'favorites_view'):
              main_window.favorites_view.emit("favorites-changed")
@@ -409,7 +519,7 @@ class ChannelList(Gtk.Box):
             password_is_set = database.get_config_value('app_password') is not None
             if password_is_set:
                 database.set_channel_lock_status(url, True)
-                self.active_row.lock_icon.set_visible(True)
+                self.active_row.props.is_locked = True
             else:
                 self.show_set_password_dialog()
 
@@ -417,73 +527,59 @@ class ChannelList(Gtk.Box):
         if response_id == "ok":
             if database.check_password(dialog.get_password()):
                 url = self.active_row.channel_data["url"]
-                database.set_channel_lock_status(url, False); self.active_row.lock_icon.set_visible(False)
+                database.set_channel_lock_status(url, False); self.active_row.props.is_locked = False
             else:
                 self.get_root().show_toast(_("Wrong Password!"))
 
-    def _replace_placeholder_with_image(self, placeholder, pixbuf):
-        if not placeholder or not placeholder.get_parent(): return
-        parent = placeholder.get_parent()
-        image = Gtk.Image.new_from_pixbuf(pixbuf); image.set_pixel_size(36)
-        parent.remove(placeholder)
-        parent.insert_child_after(image, None)
-
-    def _load_logo_and_replace(self, url, placeholder_widget):
-        try:
-            host = urlparse(url).netloc
-            if host in _failed_logo_hosts:
+    def _load_logo(self, item):
+        url = item.correct_logo_path
+        if item.logo_requested:
+            return
+        if url.lower().startswith("http"):
+            if image_loader.has_recent_failure(url):
                 return
-        except:
-            pass
-        if not placeholder_widget or not placeholder_widget.get_ancestor(Gtk.ListBoxRow):
-             return
+            item.logo_requested = True
+            item.logo_request = image_loader.load_image_async(
+                url, item,
+                on_success_callback=self._set_item_logo,
+                on_failure=lambda: self._on_logo_failed(item),
+                width=LOGO_DECODE_SIZE, height=LOGO_DECODE_SIZE
+            )
+            return
+        item.logo_requested = True
         def thread_func():
-            try:
-                host = urlparse(url).netloc
-                if host in _failed_logo_hosts:
-                    return
-            except:
-                pass
             pixbuf = None
             try:
-                if url.lower().startswith("http"):
-                    headers = {"User-Agent": "Mozilla/5.0"}
-                    req = urllib.request.Request(url, headers=headers)
-                    with urllib.request.urlopen(req, timeout=3) as resp:
-                        data = resp.read()
-                else:
-                    if os.path.exists(url):
-                         with open(url, "rb") as f: data = f.read()
-                    else: data = None
-                if data:
-                    loader = GdkPixbuf.PixbufLoader.new()
-                    loader.write(data)
-                    loader.close()
-                    pixbuf = loader.get_pixbuf()
-            except Exception as e:
-                 try:
-                     bad_host = urlparse(url).netloc
-                     if bad_host not in _failed_logo_hosts:
-                         _failed_logo_hosts.add(bad_host)
-                         logging.warning(f"🛑 LOGO SERVER BLOCKED: {bad_host} - No more requests will be sent to this address.")
-                 except:
-                     pass
-                 logging.warning(f"Failed to load channel logo '{url}': {e}")
+                if os.path.exists(url):
+                    pixbuf = GdkPixbuf.Pixbuf.new_from_file_at_scale(url, LOGO_DECODE_SIZE, LOGO_DECODE_SIZE, True)
+            except GLib.Error as e:
+                logging.warning(f"Failed to load channel logo '{url}': {e}")
             if pixbuf:
-                GLib.idle_add(self._check_and_replace_placeholder, placeholder_widget, pixbuf)
-        image_download_pool.submit(thread_func)
-
-    def _check_and_replace_placeholder(self, placeholder, pixbuf):
-        if placeholder and placeholder.get_ancestor(Gtk.ListBoxRow):
-            parent = placeholder.get_parent()
-            if parent:
-                image = Gtk.Image.new_from_pixbuf(pixbuf)
-                image.add_css_class("channel-logo-image")
-                image.set_pixel_size(36)
-                parent.remove(placeholder)
-                parent.prepend(image)
-            else: logging.warning("Main thread (logo): Placeholder has no parent!")
-        else: logging.warning("Main thread (logo): Placeholder is not valid, image not replaced.")
+                GLib.idle_add(self._set_item_logo, item, pixbuf)
+        item.logo_request = image_download_pool.submit_with_priority(image_loader.PRIORITY_VISIBLE, thread_func)
+
+    def _cancel_logo_request(self, item):
+        """
+        Called when a row scrolls out of view or is removed: a logo that is
+        still queued is dropped, so the rows on screen do not wait behind it.
+        The next bind requests it again.
+        """
+        if item is None or item.logo_request is None:
+            return
+        request = item.logo_request
+        item.logo_request = None
+        request.cancel()
+        item.logo_requested = False
+
+    def _on_logo_failed(self, item):
+        """Lets the next bind retry once the loader's failure TTL has expired."""
+        item.logo_request = None
+        item.logo_requested = False
+        return GLib.SOURCE_REMOVE
+
+    def _set_item_logo(self, item, pixbuf):
+        item.logo_request = None
+        item.props.logo_pixbuf = pixbuf
         return GLib.SOURCE_REMOVE
 
     def show_set_password_dialog(self):
@@ -507,20 +603,22 @@ class ChannelList(Gtk.Box):
             GLib.idle_add(self._activate_selected_row)
 
     def _activate_selected_row(self):
-        selected_row = self.channel_listbox.get_selected_row()
-        if selected_row:
-            self.channel_listbox.emit("row-activated", selected_row)
+        self._emit_channel_activated(self.get_selected_item())
         return GLib.SOURCE_REMOVE
 
     def _on_search_changed(self, entry):
-        search_text = entry.get_text().lower().strip()
-        current_row = self.channel_listbox.get_first_child()
-        while current_row:
-            if hasattr(current_row, 'channel_data'):
-                channel_name = current_row.channel_data.get("name", "")
-                row_text = channel_name.lower()
-                current_row.set_visible(search_text in row_text)
-            current_row = current_row.get_next_sibling()
+        new_text = entry.get_text().lower().strip()
+        old_text = self.search_text
+        if new_text == old_text:
+            return
+        self.search_text = new_text
+        if old_text in new_text:
+            change = Gtk.FilterChange.MORE_STRICT
+        elif new_text in old_text:
+            change = Gtk.FilterChange.LESS_STRICT
+        else:
+            change = Gtk.FilterChange.DIFFERENT
+        self.custom_filter.changed(change)
 
     def _on_move_interactive_activated(self, action, value):
         """Opens the new dialog when the 'Move...' menu item is selected."""
@@ -529,133 +627,201 @@ class ChannelList(Gtk.Box):
         dialog = MoveChannelDialog(self.get_root(), self.active_row, self)
         dialog.present()
 
-    def move_row_up(self, row_to_move):
-        """Public method called by the dialog, moves the row ONE UP."""
-        if not row_to_move or self.active_list_id is None:
+    def _move_item(self, item_to_move, offset):
+        if not item_to_move or self.active_list_id is None:
             return
-        current_index = row_to_move.get_index()
-        if current_index <= 0:
+        current_index = self.get_item_position(item_to_move)
+        if current_index is None:
             return
-        target_index = current_index - 1
-        target_row = self.channel_listbox.get_row_at_index(target_index)
-        if not target_row:
+        target_index = current_index + offset
+        if target_index < 0 or target_index >= self.model.get_n_items():
             return
+        target_item = self.model.get_item(target_index)
         success = database.swap_favorite_channel_order(
             self.active_list_id,
-            row_to_move.channel_data["url"],
-            target_row.channel_data["url"]
+            item_to_move.channel_data["url"],
+            target_item.channel_data["url"]
         )
         if success:
-            self.channel_listbox.remove(row_to_move)
-            self.channel_listbox.insert(row_to_move, target_index)
-            self.channel_listbox.select_row(row_to_move)
+            self.model.remove(current_index)
+            self.model.insert(target_index, item_to_move)
+            position = self._position_of(item_to_move)
+            if position is not None:
+                self.select_position(position)
         return success
 
-    def move_row_down(self, row_to_move):
-        """Public method called by the dialog, moves the row ONE DOWN."""
-        if not row_to_move or self.active_list_id is None:
-            return
-        current_index = row_to_move.get_index()
-        target_index = current_index + 1
-        target_row = self.channel_listbox.get_row_at_index(target_index)
-        if not target_row:
-            return
-        success = database.swap_favorite_channel_order(
-            self.active_list_id,
-            row_to_move.channel_data["url"],
-            target_row.channel_data["url"]
-        )
-        if success:
-            self.channel_listbox.remove(row_to_move)
-            self.channel_listbox.insert(row_to_move, target_index)
-            self.channel_listbox.select_row(row_to_move)
-        return success
+    def move_row_up(self, item_to_move):
+        """Public method called by the dialog, moves the item ONE UP."""
+        return self._move_item(item_to_move, -1)
+
+    def move_row_down(self, item_to_move):
+        """Public method called by the dialog, moves the item ONE DOWN."""
+        return self._move_item(item_to_move, 1)
 
-    def _get_current_program_info(self, channel, epg_data, epg_clean_map):
-        if not epg_data:
+    def _get_current_program_info(self, channel, epg_data, epg_resolver):
+        """
+        Returns the running programme of a channel with its start/stop epochs,
+        plus 'next_change_ts': the moment the row has to be looked up again
+        (the end of the running programme, or the start of the next one).
+        """
+        if not epg_data or not epg_resolver:
             return None
-        t_id = (channel.get("tvg-id") or "").strip()
-        t_name = (channel.get("tvg-name") or "").strip()
-        name = (channel.get("name") or "").strip()
-        search_key = t_id or t_name or name
+        search_key = epg_matcher.channel_search_key(channel)
         if not search_key:
             return None
         if search_key in self._failed_epg_searches:
             return None    
-        programs = epg_data.get(search_key)
-        if not programs and epg_clean_map:
-            clean_id = self._clean_key(search_key)
-            if clean_id:
-                programs = epg_clean_map.get(clean_id)
-                if not programs and FUZZ_AVAILABLE and process:
-                    best_match_tuple = process.extractOne(clean_id, epg_clean_map.keys())
-                    if best_match_tuple:
-                        best_match, score = best_match_tuple
-                        if score >= 80 and \
-                           self._check_digits_match(clean_id, best_match) and \
-                           self._check_country_match(clean_id, best_match):
-                            len1, len2 = len(clean_id), len(best_match)
-                            ratio = max(len1, len2) / min(len1, len2) if min(len1, len2) > 0 else 0
-                            first_char_match = clean_id[0] == best_match[0] if clean_id and best_match else False
-                            if ratio <= 2.0 and first_char_match:
-                                programs = epg_clean_map[best_match]
-                            else:
-                                reason = "Ratio" if ratio > 2.0 else "First Char"
-                                logging.debug(f"List EPG Rejected ({reason}): '{clean_id}' vs '{best_match}'")
-                if not programs:
-                    soft_id = clean_id.replace("tv.", ".")
-                    programs = epg_clean_map.get(soft_id)    
-        if not programs:
+        epg_channel_id = epg_resolver(search_key)
+        if not epg_channel_id:
             self._failed_epg_searches.add(search_key)
             return None
-        now = datetime.now(timezone.utc)
-        for prog in programs:
-            if prog['start'] <= now <= prog['stop']:
-                total_duration = (prog['stop'] - prog['start']).total_seconds()
-                elapsed_time = (now - prog['start']).total_seconds()
-                fraction = 0.0
-                if total_duration > 0:
-                    fraction = max(0.0, min(1.0, elapsed_time / total_duration))
-                return {
-                    'title': prog['title'],
-                    'progress': fraction
-                }
-        return None
+        now_ts = int(time.time())
+        programs = epg_data.get_programs(epg_channel_id, now_ts, now_ts + 86400, limit=2)
+        prog = None
+        for program in programs:
+            if program['start_ts'] <= now_ts <= program['stop_ts']:
+                prog = program
+                break
+        if not prog:
+            next_start = programs[0]['start_ts'] if programs else None
+            return {'title': None, 'next_change_ts': next_start}
+        return {
+            'title': prog['title'],
+            'start_ts': prog['start_ts'],
+            'stop_ts': prog['stop_ts'],
+            'progress': self._program_fraction(prog['start_ts'], prog['stop_ts'], now_ts),
+            'next_change_ts': prog['stop_ts']
+        }
+
+    @staticmethod
+    def _program_fraction(start_ts, stop_ts, now_ts):
+        total_duration = stop_ts - start_ts
+        if total_duration <= 0:
+            return 0.0
+        return max(0.0, min(1.0, (now_ts - start_ts) / total_duration))
+
+    def _is_item_epg_stale(self, item):
+        if item.epg_checked_at is None or item.epg_checked_at < self._epg_valid_after:
+            return True
+        return item.epg_next_change_ts is not None and item.epg_next_change_ts <= time.time()
+
+    def _refresh_item_epg(self, item, epg_data, epg_resolver):
+        epg_info = self._get_current_program_info(item.channel_data, epg_data, epg_resolver)
+        item.epg_checked_at = time.monotonic()
+        item.epg_start_ts = epg_info.get('start_ts') if epg_info else None
+        item.epg_stop_ts = epg_info.get('stop_ts') if epg_info else None
+        item.epg_next_change_ts = epg_info['next_change_ts'] if epg_info else None
+        if epg_info and epg_info['title'] is not None:
+            item.props.epg_progress = epg_info['progress']
+            item.props.epg_title = epg_info['title']
+        elif item.props.epg_title is not None:
+            item.props.epg_title = None
+        self._push_epg_boundary(item)
+
+    def _update_item_progress(self, item, now_ts):
+        """Moves the progress bar from the cached start/stop epochs, no EPG lookup needed."""
+        if item.epg_start_ts is None or item.props.epg_title is None:
+            return
+        fraction = self._program_fraction(item.epg_start_ts, item.epg_stop_ts, now_ts)
+        if abs(fraction - item.props.epg_progress) >= 0.001:
+            item.props.epg_progress = fraction
+
+    def _push_epg_boundary(self, item):
+        """
+        Queues the next programme change of a bound item and re-arms the boundary
+        timer if needed. An item is queued once per change time, so rebinding it
+        while scrolling does not add entries.
+        """
+        due = item.epg_next_change_ts
+        if due is None or item not in self._bound_items or item.epg_boundary_queued == due:
+            return
+        item.epg_boundary_queued = due
+        self._epg_boundary_seq += 1
+        heapq.heappush(self._epg_boundary_heap, (due, self._epg_boundary_seq, item))
+        if self._epg_boundary_due is None or due < self._epg_boundary_due:
+            self._schedule_epg_boundary()
+
+    def _cancel_epg_boundary_timer(self):
+        if self._epg_boundary_timer_id:
+            GLib.source_remove(self._epg_boundary_timer_id)
+            self._epg_boundary_timer_id = None
+        self._epg_boundary_due = None
+
+    def _clear_epg_boundaries(self):
+        self._cancel_epg_boundary_timer()
+        for _due, _seq, item in self._epg_boundary_heap:
+            item.epg_boundary_queued = None
+        self._epg_boundary_heap = []
+
+    def _pop_epg_boundary(self):
+        """Pops the earliest entry and returns its item if it is still bound and queued for that time."""
+        due, _seq, item = heapq.heappop(self._epg_boundary_heap)
+        if item.epg_boundary_queued != due:
+            return None
+        item.epg_boundary_queued = None
+        return item if item in self._bound_items else None
+
+    def _schedule_epg_boundary(self):
+        """
+        Arms a single timer for the earliest queued programme change.
+        Entries of items that were unbound or re-queued since are dropped here.
+        """
+        self._cancel_epg_boundary_timer()
+        heap = self._epg_boundary_heap
+        while heap:
+            due, _seq, item = heap[0]
+            if item in self._bound_items and item.epg_boundary_queued == due:
+                break
+            self._pop_epg_boundary()
+        if not heap:
+            return
+        due = heap[0][0]
+        delay = max(1, int(due - time.time()) + 1)
+        self._epg_boundary_due = due
+        self._epg_boundary_timer_id = GLib.timeout_add_seconds(delay, self._on_epg_boundary)
+
+    def _on_epg_boundary(self):
+        """Refreshes only the visible rows whose programme has just ended or started."""
+        self._epg_boundary_timer_id = None
+        self._epg_boundary_due = None
+        now_ts = time.time()
+        heap = self._epg_boundary_heap
+        expired = []
+        while heap and heap[0][0] <= now_ts:
+            item = self._pop_epg_boundary()
+            if item is not None:
+                expired.append(item)
+        for item in expired:
+            self._refresh_item_epg(item, self._epg_data, self._epg_resolver)
+        if self._epg_boundary_timer_id is None:
+            self._schedule_epg_boundary()
+        return False
+
+    def _advance_epg_progress(self):
+        """Periodic tick: moves the progress bars of the bound rows without any lookups."""
+        now_ts = int(time.time())
+        for item in self._bound_items:
+            self._update_item_progress(item, now_ts)
+        return True
+
+    def refresh_epg(self):
+        """Forgets failed EPG lookups and updates the visible rows right away."""
+        self._failed_epg_searches.clear()
+        self._epg_valid_after = time.monotonic()
+        self._update_all_rows_epg()
 
     def _update_all_rows_epg(self):
         """
-        Iterates through all visible rows and updates EPG titles and progress bars.
+        Looks up EPG titles and progress bars of the rows that are currently
+        bound. Off-screen items are refreshed when they scroll into view.
         """
         main_window = self.get_ancestor(Gtk.Window)
-        if not main_window or not hasattr(main_window, 'epg_data'):
-            return True
-        epg_data = main_window.epg_data
-        epg_clean_map = getattr(main_window, 'epg_clean_map', None)
-        row = self.channel_listbox.get_first_child()
-        while row:
-            if hasattr(row, 'channel_data'):
-                epg_info = self._get_current_program_info(row.channel_data, epg_data, epg_clean_map)
-                if epg_info:
-                    if not row.epg_label:
-                        row.epg_label = Gtk.Label(xalign=0, ellipsize=Pango.EllipsizeMode.END)
-                        row.epg_label.add_css_class("caption")
-                        row.label_vbox.append(row.epg_label)
-                    row.epg_label.set_text(epg_info['title'])
-                    if epg_info['progress'] is not None:
-                        if not row.epg_progress:
-                            row.epg_progress = Gtk.ProgressBar()
-                            row.epg_progress.add_css_class("epg-progress-bar")
-                            row.label_vbox.append(row.epg_progress)
-                        row.epg_progress.set_fraction(epg_info['progress'])
-                else:
-                    if row.epg_label:
-                        row.label_vbox.remove(row.epg_label)
-                        row.epg_label = None
-                    if row.epg_progress:
-                        row.label_vbox.remove(row.epg_progress)
-                        row.epg_progress = None
-            row = row.get_next_sibling()
-        return True
+        if main_window and hasattr(main_window, 'epg_data'):
+            self._epg_data = main_window.epg_data
+            self._epg_resolver = getattr(main_window, 'resolve_epg_channel_id', None)
+        self._clear_epg_boundaries()
+        for item in list(self._bound_items):
+            self._refresh_item_epg(item, self._epg_data, self._epg_resolver)
 
     def _on_back_clicked(self, button):
         self.emit("back-clicked")
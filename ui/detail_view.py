@@ -11,12 +11,15 @@ import threading
 import json
 import re
 from utils.theme_utils import get_icon_theme_folder
-from utils.image_loader import load_image_async
+from utils.image_loader import load_image_async, PRIORITY_PREFETCH
 from utils import title_parser
 from data_providers import tmdb_client, xtream_client
 from core.config import get_fallback_tmdb_key
 import database
 IMAGE_BASE_URL_PROFILE = "https://image.tmdb.org/t/p/w185"
+POSTER_WIDTH = 200
+POSTER_HEIGHT = 300
+CAST_IMAGE_SIZE = 138
 class DetailView(Gtk.Box):
     __gsignals__ = {
         "play-requested": (GObject.SignalFlags.RUN_FIRST, None, (str, str,)),
@@ -137,8 +140,10 @@ class DetailView(Gtk.Box):
         self.cast_flowbox.append(loading_cast)
         provider_poster = item.props.poster_path or ""
         if provider_poster.startswith("http"):
+             scale = self.poster_image.get_scale_factor()
              load_image_async(provider_poster, self.poster_image,
                               on_success_callback=lambda w, p: w.set_paintable(Gdk.Texture.new_for_pixbuf(p)),
+                              width=POSTER_WIDTH * scale, height=POSTER_HEIGHT * scale,
                               on_failure=None)
         rating = item.props.provider_rating
         self.rating_label.set_markup(f"<b>{_('Rating')}:</b> {rating:.1f}" if rating > 0.01 else "")
@@ -363,6 +368,7 @@ class DetailView(Gtk.Box):
                 self.cast_flowbox.remove(child)
             if cast_list:
                 logging.debug(f"Creating boxes for {len(cast_list)} cast members...")
+                scale = self.get_scale_factor()
                 for actor in cast_list:
                     actor_box = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=4, margin_bottom=6)
                     actor_box.set_size_request(100, -1)
@@ -374,7 +380,9 @@ class DetailView(Gtk.Box):
                         full_image_url = IMAGE_BASE_URL_PROFILE + profile_path
                         load_image_async(
                             full_image_url, actor_image,
-                            on_success_callback=lambda widget, pixbuf: widget.set_from_pixbuf(pixbuf)
+                            on_success_callback=lambda widget, pixbuf: widget.set_from_pixbuf(pixbuf),
+                            width=CAST_IMAGE_SIZE * scale, height=CAST_IMAGE_SIZE * scale,
+                            priority=PRIORITY_PREFETCH
                         )
                     actor_name_label = Gtk.Label(label=actor.get('name', 'N/A'), wrap=True, justify=Gtk.Justification.CENTER, xalign=0.5)
                     actor_name_label.set_size_request(100, -1)
@@ -389,9 +397,11 @@ class DetailView(Gtk.Box):
             if poster_key:
                 full_poster_url = tmdb_client.get_poster_url(poster_key)
                 if full_poster_url:
+                    scale = self.poster_image.get_scale_factor()
                     load_image_async(
                         full_poster_url, self.poster_image,
-                        on_success_callback=lambda widget, pixbuf: widget.set_paintable(Gdk.Texture.new_for_pixbuf(pixbuf))
+                        on_success_callback=lambda widget, pixbuf: widget.set_paintable(Gdk.Texture.new_for_pixbuf(pixbuf)),
+                        width=POSTER_WIDTH * scale, height=POSTER_HEIGHT * scale
                     )
             trailer_key = tmdb_api_or_db_data.get("trailer_key")
             logging.info(f"UI Update DEBUG: Found trailer_key = {trailer_key}")
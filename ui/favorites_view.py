@@ -43,7 +43,7 @@ class FavoritesView(Gtk.Box):
         self.favorites_stack.set_visible_child_name("lists")
 
     def get_favorite_channels_list_widget(self):
-        return self.favorite_channels_list.channel_listbox
+        return self.favorite_channels_list
 
     def reset_view(self):
         """Resets the view to the initial state showing the favorite lists."""
@@ -10,12 +10,14 @@ import database
 gi.require_version("Gtk", "4.0")
 from gi.repository import Gtk, Gio, GObject, Pango, GLib, GdkPixbuf, Gdk
 from datetime import datetime
-from utils.image_loader import load_image_async
+from utils.image_loader import load_image_async, PRIORITY_VISIBLE
 from data_providers import tmdb_client
 from background import image_download_pool
 
 import gettext
 _ = gettext.gettext
+POSTER_WIDTH = 160
+POSTER_HEIGHT = 240
 
 class MediaItem(GObject.Object):
     __gtype_name__ = "MediaItem"
@@ -249,29 +251,27 @@ class MediaGridView(Gtk.ScrolledWindow):
                 watched_button.set_visible(True)
 
         def _replace_image_widget(widget, pixbuf):
+            # Every source is already decoded at display size, so the pixbuf is used as is.
             if widget and pixbuf:
                 try:
-                    original_width = pixbuf.get_width()
-                    original_height = pixbuf.get_height()
-                    target_width = 200
-                    if original_width > target_width:
-                        scale_factor = target_width / original_width
-                        target_height = int(original_height * scale_factor)
-                        scaled_pixbuf = pixbuf.scale_simple(target_width, target_height, GdkPixbuf.InterpType.BILINEAR)
-                        texture = Gdk.Texture.new_for_pixbuf(scaled_pixbuf)
-                    else:
-                        texture = Gdk.Texture.new_for_pixbuf(pixbuf)
-                    widget.set_paintable(texture)
+                    widget.set_paintable(Gdk.Texture.new_for_pixbuf(pixbuf))
                 except Exception as e:
                     logging.error(f"Texture conversion failed: {e}")
 
+        def _replace_if_current(widget, pixbuf, generation):
+            # A job that was already running when the cell was recycled still finishes.
+            if list_item.image_generation == generation:
+                _replace_image_widget(widget, pixbuf)
+            return GLib.SOURCE_REMOVE
+
         def load_poster_or_thumbnail(media_item, _=None):
+            self._cancel_image_request(list_item)
             picture_widget.set_paintable(None)
             path = media_item.props.path_or_url
             poster = media_item.props.poster_path
             if self.current_media_type == "picture":
                 box.set_size_request(160, 240)
-                def _load_picture_in_thread(p, widget):
+                def _load_picture_in_thread(p, widget, generation):
                     base_cache_dir = database.get_cache_path()
                     cache_dir = os.path.join(base_cache_dir, "grid_thumbnails")
                     os.makedirs(cache_dir, exist_ok=True)
@@ -298,30 +298,35 @@ class MediaGridView(Gtk.ScrolledWindow):
                         except GLib.Error as e:
                             logging.warning(f"Thumbnail creation failed: {e}")
                     if final_pixbuf:
-                        GLib.idle_add(_replace_image_widget, widget, final_pixbuf)
-                image_download_pool.submit(_load_picture_in_thread, path, picture_widget)
+                        GLib.idle_add(_replace_if_current, widget, final_pixbuf, generation)
+                list_item.image_request = image_download_pool.submit_with_priority(
+                    PRIORITY_VISIBLE, _load_picture_in_thread, path, picture_widget, list_item.image_generation
+                )
                 return
             if poster:
-                box.set_size_request(160, 240)
+                box.set_size_request(POSTER_WIDTH, POSTER_HEIGHT)
+                scale = picture_widget.get_scale_factor()
                 if os.path.isabs(poster):
                     try:
-                        pixbuf = GdkPixbuf.Pixbuf.new_from_file(poster)
+                        pixbuf = GdkPixbuf.Pixbuf.new_from_file_at_scale(poster, POSTER_WIDTH * scale, POSTER_HEIGHT * scale, True)
                         _replace_image_widget(picture_widget, pixbuf)
                     except GLib.Error:
                         self._on_poster_load_failed(media_item)
                 elif poster.startswith("http"):
-                    load_image_async(
+                    list_item.image_request = load_image_async(
                         poster, picture_widget,
                         on_success_callback=_replace_image_widget,
-                        on_failure=lambda: self._on_poster_load_failed(media_item)
+                        on_failure=lambda: self._on_poster_load_failed(media_item),
+                        width=POSTER_WIDTH * scale, height=POSTER_HEIGHT * scale
                     )
                 else:
                     full_poster_url = tmdb_client.get_poster_url(poster)
                     if full_poster_url:
-                        load_image_async(
+                        list_item.image_request = load_image_async(
                             full_poster_url, picture_widget,
                             on_success_callback=_replace_image_widget,
-                            on_failure=lambda: self._on_poster_load_failed(media_item)
+                            on_failure=lambda: self._on_poster_load_failed(media_item),
+                            width=POSTER_WIDTH * scale, height=POSTER_HEIGHT * scale
                         )
         load_poster_or_thumbnail(item)
         handler_id = item.connect("notify::poster-path", load_poster_or_thumbnail)
@@ -330,6 +335,7 @@ class MediaGridView(Gtk.ScrolledWindow):
             load_poster_or_thumbnail(item)
 
     def _on_factory_unbind(self, factory, list_item):
+        self._cancel_image_request(list_item)
         handler_id = getattr(list_item, "notify_handler_id", None)
         if handler_id:
             item = list_item.get_item()
@@ -337,6 +343,18 @@ class MediaGridView(Gtk.ScrolledWindow):
                 item.disconnect(handler_id)
             delattr(list_item, "notify_handler_id")
 
+    def _cancel_image_request(self, list_item):
+        """
+        Drops the pending poster load of a recycled cell, so a fast scroll does
+        not leave thousands of off-screen posters queued in front of the
+        visible ones (and a late result cannot land on the wrong item).
+        """
+        list_item.image_generation = getattr(list_item, "image_generation", 0) + 1
+        request = getattr(list_item, "image_request", None)
+        if request is not None:
+            list_item.image_request = None
+            request.cancel()
+
     def _on_filter_item(self, item):
         if not self.search_text:
             return True
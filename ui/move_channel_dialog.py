@@ -49,8 +49,12 @@ class MoveChannelDialog(Adw.MessageDialog):
             self.update_button_sensitivity()
 
     def update_button_sensitivity(self):
-        """Enables/disables buttons based on the row's current position."""
-        current_index = self.row_to_move.get_index()
-        is_last_row = self.row_to_move.get_next_sibling() is None
+        """Enables/disables buttons based on the item's current position."""
+        current_index = self.channel_list_widget.get_item_position(self.row_to_move)
+        if current_index is None:
+            self.up_button.set_sensitive(False)
+            self.down_button.set_sensitive(False)
+            return
+        is_last_row = current_index >= self.channel_list_widget.model.get_n_items() - 1
         self.up_button.set_sensitive(current_index > 0)
         self.down_button.set_sensitive(not is_last_row)
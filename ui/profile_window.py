@@ -6,7 +6,6 @@ gi.require_version("Adw", "1")
 from gi.repository import Gtk, Adw, GLib, Gdk
 
 import threading
-import requests
 import time
 import logging
 import uuid
@@ -14,12 +13,13 @@ import gettext
 import os
 import hashlib
 import database
-import json
+import sqlite3
 from datetime import datetime
 from utils.profile_manager import load_profiles, save_profiles, update_profile_dates
-from data_providers.m3u_provider import load_from_file, parse_m3u_content
+from data_providers.m3u_provider import iter_m3u_entries
 from core.window import MainWindow
-from data_providers import epg_provider, xtream_client
+from data_providers import epg_provider, epg_store, xtream_client, playlist_cache
+from utils import http_client
 _ = gettext.gettext
 
 class ProfileWindow(Gtk.ApplicationWindow):
@@ -108,7 +108,8 @@ class ProfileWindow(Gtk.ApplicationWindow):
         self.toast_overlay.add_toast(toast)
 
     def _get_cache_path(self, profile_id, cache_type):
-        extension = 'm3u' if cache_type == 'm3u_cache' else 'xml'
+        extensions = {'m3u_cache': 'm3u', 'playlist_cache': 'db', 'epg_store': 'db'}
+        extension = extensions.get(cache_type, 'xml')
         safe_id = hashlib.md5(profile_id.encode()).hexdigest()
         base_cache_dir = database.get_cache_path()
         cache_dir = os.path.join(base_cache_dir, cache_type)
@@ -159,9 +160,8 @@ class ProfileWindow(Gtk.ApplicationWindow):
     def _master_load_thread(self, profile):
         """Loads data from the selected profile, including EPG."""
 
-        def _transform_streams_to_bouquets(streams, categories, stream_type='live'):
+        def _iter_stream_entries(streams, categories, kind, stream_type='live'):
             category_map = {cat['category_id']: cat['category_name'] for cat in categories}
-            bouquets = {}
             base_url = f"{profile.get('host')}/{stream_type}/{profile.get('username')}/{profile.get('password')}"
             for stream in streams:
                 cat_id = str(stream.get('category_id'))
@@ -184,19 +184,42 @@ class ProfileWindow(Gtk.ApplicationWindow):
                     stream_data["tv_archive"] = str(tv_archive_val)
                 if tv_archive_duration_val is not None:
                     stream_data["tv_archive_duration"] = str(tv_archive_duration_val)
-                if cat_name not in bouquets:
-                    bouquets[cat_name] = []
-                bouquets[cat_name].append(stream_data)
-            return bouquets
+                yield kind, cat_name, stream_data
+
+        def _iter_xtream_entries(previous, missing_parts):
+            """
+            Live and VOD share one cache file. A part the provider did not
+            return is carried over from the previous cache and reported in
+            missing_parts, so the cache is not marked fresh without it.
+            """
+            parts = (
+                (playlist_cache.LIVE, 'live', xtream_client.get_live_categories, xtream_client.get_live_streams),
+                (playlist_cache.VOD, 'movie', xtream_client.get_vod_categories, xtream_client.get_vod_streams),
+            )
+            for kind, stream_type, get_categories, get_streams in parts:
+                categories = get_categories(profile)
+                streams = get_streams(profile)
+                if streams is not None and categories is not None:
+                    yield from _iter_stream_entries(streams, categories, kind, stream_type)
+                    continue
+                missing_parts.append(kind)
+                if previous is not None:
+                    logging.warning(f"Xtream {kind} list could not be fetched, keeping the cached one.")
+                    yield from previous.iter_entries(kind)
+
+        def _iter_m3u_entries(lines):
+            for group_title, item_data, is_vod in iter_m3u_entries(lines):
+                kind = playlist_cache.VOD if is_vod else playlist_cache.LIVE
+                yield kind, group_title, item_data
         try:
             profile_type = profile.get("type")
             channels = {}
             vod = {}
-            epg_data = {}
+            epg_data = None
+            playlist_path = self._get_cache_path(profile['id'], 'playlist_cache')
+            playlist = None
             if profile_type == "xtream":
                 logging.info("Profile type is Xtream. Checking cache...")
-                channels_cache_path = self._get_xtream_cache_path(profile['id'], 'channels')
-                vod_cache_path = self._get_xtream_cache_path(profile['id'], 'vod')
                 xtream_ttl = 86400
                 last_xtream_update = profile.get('last_xtream_update', 0)
                 xtream_is_stale = (time.time() - last_xtream_update) > xtream_ttl
@@ -209,69 +232,52 @@ class ProfileWindow(Gtk.ApplicationWindow):
                         exp_ts = user_info.get("exp_date")
                         if (start_ts and str(start_ts).isdigit()) or (exp_ts and str(exp_ts).isdigit()):
                             update_profile_dates(profile['id'], start_ts, exp_ts)
-                if os.path.exists(channels_cache_path) and os.path.exists(vod_cache_path) and not xtream_is_stale:
-                    logging.info("Fresh Xtream cache found. Reading from disk.")
+                if not xtream_is_stale:
+                    playlist = playlist_cache.PlaylistCache.open(playlist_path)
+                    if playlist:
+                        logging.info("Fresh Xtream playlist cache found. Opening it.")
+                if playlist is None:
+                    previous = playlist_cache.PlaylistCache.open(playlist_path)
+                    missing_parts = []
                     try:
-                        with open(channels_cache_path, 'r', encoding='utf-8') as f:
-                            channels = json.load(f)
-                        with open(vod_cache_path, 'r', encoding='utf-8') as f:
-                            vod = json.load(f)
-                    except (json.JSONDecodeError, IOError):
-                        channels, vod = {}, {}
-                if not channels or not vod:
-                    live_categories = xtream_client.get_live_categories(profile)
-                    live_streams = xtream_client.get_live_streams(profile)
-                    if live_streams is not None and live_categories is not None:
-                         channels = _transform_streams_to_bouquets(live_streams, live_categories, 'live')
-                    vod_categories = xtream_client.get_vod_categories(profile)
-                    vod_streams = xtream_client.get_vod_streams(profile)
-                    if vod_streams is not None and vod_categories is not None:
-                         vod = _transform_streams_to_bouquets(vod_streams, vod_categories, 'movie')
-                    if channels or vod:
-                        try:
-                            if channels:
-                                with open(channels_cache_path, 'w', encoding='utf-8') as f:
-                                    json.dump(channels, f, ensure_ascii=False)
-                            if vod:
-                                with open(vod_cache_path, 'w', encoding='utf-8') as f:
-                                    json.dump(vod, f, ensure_ascii=False)
-                            if channels or vod:
-                                 self._update_profile_timestamp(profile['id'], 'last_xtream_update')
-                        except IOError as e:
-                            logging.error(f"Could not write Xtream cache to disk: {e}")
+                        written = playlist_cache.write_playlist_cache(playlist_path, _iter_xtream_entries(previous, missing_parts))
+                        if written and not missing_parts:
+                            self._update_profile_timestamp(profile['id'], 'last_xtream_update')
+                    except (sqlite3.Error, OSError) as e:
+                        logging.error(f"Could not write Xtream playlist cache to disk: {e}")
+                    finally:
+                        if previous is not None:
+                            previous.close()
             else:
                 logging.info("Profile type is M3U. Fetching data from file/URL.")
-                m3u_cache_path = self._get_cache_path(profile['id'], 'm3u_cache')
                 m3u_ttl = 86400
                 last_m3u_update = profile.get('last_m3u_update', 0)
                 m3u_is_stale = (time.time() - last_m3u_update) > m3u_ttl
-                m3u_content = ""
-                if os.path.exists(m3u_cache_path) and not m3u_is_stale:
-                    try:
-                        with open(m3u_cache_path, 'r', encoding='utf-8', errors='ignore') as f:
-                            m3u_content = f.read()
-                    except IOError:
-                         m3u_content = ""
-                else:
+                if not m3u_is_stale:
+                    playlist = playlist_cache.PlaylistCache.open(playlist_path)
+                if playlist is None:
                     headers = {"User-Agent": "Mozilla/5.0"}
-                    downloaded_text = ""
                     try:
+                        written = 0
                         if profile_type == "m3u_file":
                             with open(profile["path"], 'r', encoding='utf-8', errors='ignore') as f:
-                                downloaded_text = f.read()
+                                written = playlist_cache.write_playlist_cache(playlist_path, _iter_m3u_entries(f))
                         elif profile_type == "m3u_url":
-                            response = requests.get(profile["url"], timeout=30, headers=headers)
-                            response.raise_for_status()
-                            downloaded_text = response.text
-                        if downloaded_text:
-                            with open(m3u_cache_path, 'w', encoding='utf-8') as f:
-                                f.write(downloaded_text)
+                            with http_client.get(profile["url"], timeout=30, headers=headers, stream=True) as response:
+                                response.raise_for_status()
+                                if response.encoding is None:
+                                    response.encoding = 'utf-8'
+                                lines = response.iter_lines(chunk_size=65536, decode_unicode=True)
+                                written = playlist_cache.write_playlist_cache(playlist_path, _iter_m3u_entries(lines))
+                        if written:
                             self._update_profile_timestamp(profile['id'], 'last_m3u_update')
-                            m3u_content = downloaded_text
                     except Exception as e:
                          logging.error(f"M3U load error: {e}")
-                if m3u_content:
-                    channels, vod = parse_m3u_content(m3u_content.splitlines())
+            if playlist is None:
+                playlist = playlist_cache.PlaylistCache.open(playlist_path)
+            if playlist:
+                channels = playlist.bouquets(playlist_cache.LIVE)
+                vod = playlist.bouquets(playlist_cache.VOD)
             epg_url_or_path = profile.get("epg_url")
             if not epg_url_or_path and profile_type == "xtream":
                 host = profile.get("host")
@@ -284,31 +290,28 @@ class ProfileWindow(Gtk.ApplicationWindow):
                 epg_ttl = 21600
                 last_epg_update = profile.get('last_epg_update', 0)
                 epg_is_stale = (time.time() - last_epg_update) > epg_ttl
-                epg_content = ""
-                if os.path.exists(epg_cache_path) and not epg_is_stale:
-                    logging.info(f"Fresh EPG cache found: {epg_cache_path}")
+                epg_store_path = self._get_cache_path(profile['id'], 'epg_store')
+                if not epg_is_stale:
+                    epg_data = epg_store.EpgStore.open(epg_store_path)
+                    if epg_data is not None:
+                        logging.info(f"Fresh EPG store found: {epg_store_path}")
+                if epg_data is None:
+                    logging.info("EPG store missing or stale. Downloading...")
                     try:
-                        with open(epg_cache_path, 'r', encoding='utf-8', errors='ignore') as f:
-                            epg_content = f.read()
-                    except IOError:
-                         epg_content = ""
-                if not epg_content:
-                    logging.info("EPG cache missing or stale. Downloading...")
-                    epg_content = epg_provider.load_epg_data(epg_url_or_path)
-                    if epg_content:
-                        try:
-                             with open(epg_cache_path, 'w', encoding='utf-8') as f:
-                                 f.write(epg_content)
-                             self._update_profile_timestamp(profile['id'], 'last_epg_update')
-                        except IOError:
-                             pass
-                if epg_content:
-                    epg_data = epg_provider.parse_epg_data(epg_content)
+                        if epg_provider.fetch_epg_to_file(epg_url_or_path, epg_cache_path):
+                            if epg_store.import_xmltv(epg_store_path, epg_cache_path):
+                                self._update_profile_timestamp(profile['id'], 'last_epg_update')
+                    except (sqlite3.Error, OSError) as e:
+                        logging.error(f"Could not import EPG into the local store: {e}")
+                    finally:
+                        if os.path.exists(epg_cache_path):
+                            os.remove(epg_cache_path)
+                    epg_data = epg_store.EpgStore.open(epg_store_path)
             GLib.idle_add(self._on_loading_complete, profile, channels, vod, epg_data, None)
         except Exception as e:
             error_message = _("An unexpected error occurred while loading profile '{}'.\n\nReason: {}").format(profile['name'], e)
             logging.exception(f"Critical error while loading profile: {profile['name']}")
-            GLib.idle_add(self._on_loading_complete, profile, {}, {}, {}, error_message)
+            GLib.idle_add(self._on_loading_complete, profile, {}, {}, None, error_message)
 
     def _on_loading_complete(self, profile, channels, vod, epg_data, error):
         self.spinner.stop()
@@ -435,12 +438,17 @@ class ProfileWindow(Gtk.ApplicationWindow):
                 safe_id = hashlib.md5(profile_id.encode()).hexdigest()
                 profile_db_path = os.path.join(database.APP_CONFIG_DIR, f"profile_{safe_id}.db")
                 logging.info(f"Deleting database and cache files for profile '{profile_name}'...")
+                database.discard_pooled_connections(profile_db_path)
                 files_to_delete = [
+                    self._get_cache_path(profile_id, 'playlist_cache'),
                     self._get_cache_path(profile_id, 'm3u_cache'),
                     self._get_cache_path(profile_id, 'epg_cache'),
+                    self._get_cache_path(profile_id, 'epg_store'),
                     self._get_xtream_cache_path(profile_id, 'channels'),
                     self._get_xtream_cache_path(profile_id, 'vod'),
-                    profile_db_path
+                    profile_db_path,
+                    f"{profile_db_path}-wal",
+                    f"{profile_db_path}-shm"
                 ]
                 deleted_count = 0
                 for file_path in files_to_delete:
@@ -5,13 +5,20 @@ gi.require_version("Gtk", "4.0")
 gi.require_version("Adw", "1")
 from gi.repository import Gtk, Adw, GObject, GLib, Pango
 import gettext
+import os
+import threading
 from datetime import datetime, time, timedelta
 import database
+from playback import recorder_control
 _ = gettext.gettext
+LIVE_STATS_INTERVAL_SECONDS = 2
+EXTEND_STEP_SECONDS = 15 * 60
 class SchedulerWindow(Adw.PreferencesWindow):
     __gsignals__ = {
         'schedule-saved': (GObject.SignalFlags.RUN_FIRST, None, (str, str, str, int, int, str)), 
-        'schedule-deleted': (GObject.SignalFlags.RUN_FIRST, None, (int,))
+        'schedule-deleted': (GObject.SignalFlags.RUN_FIRST, None, (int,)),
+        'recording-stop-requested': (GObject.SignalFlags.RUN_FIRST, None, (int,)),
+        'recording-extend-requested': (GObject.SignalFlags.RUN_FIRST, None, (int, int))
     }
 
     def __init__(self, parent, bouquets_data):
@@ -70,16 +77,22 @@ class SchedulerWindow(Adw.PreferencesWindow):
         self.tasks_listbox = Gtk.ListBox()
         self.tasks_listbox.add_css_class("boxed-list")
         list_group.add(self.tasks_listbox)
+        self.live_labels = {}
+        self.is_fetching_live_stats = False
         self.refresh_tasks_list()
+        self.last_running_ids = set(self.live_labels)
+        self.live_stats_timer_id = GLib.timeout_add_seconds(LIVE_STATS_INTERVAL_SECONDS, self._poll_live_stats)
+        self.connect("close-request", self.on_close)
 
     def refresh_tasks_list(self):
         while (child := self.tasks_listbox.get_first_child()):
             self.tasks_listbox.remove(child)        
+        self.live_labels = {}
         all_tasks = database.get_all_scheduled_recordings()       
         if not all_tasks:
             self.tasks_listbox.append(Gtk.Label(label=_("No scheduled recordings found.")))
             return        
-        status_map = {'pending': _("Pending"), 'recording': _("Recording"), 'completed': _("Completed"), 'failed': _("Failed")}       
+        status_map = {'pending': _("Pending"), 'queued': _("Queued"), 'recording': _("Recording"), 'completed': _("Completed"), 'failed': _("Failed")}       
         for task in all_tasks:
             start_dt = datetime.fromtimestamp(task['start_time'])
             end_dt = datetime.fromtimestamp(task['end_time'])
@@ -95,7 +108,22 @@ class SchedulerWindow(Adw.PreferencesWindow):
             raw_status = task['status']
             translated_status = status_map.get(raw_status, raw_status)
             subtitle_text += f"  |  {translated_status}"
+            status_detail = task_dict.get('status_detail')
+            if status_detail and raw_status in ('queued', 'failed'):
+                subtitle_text += f"\n{status_detail}"
             row = Adw.ActionRow(title=title_text, subtitle=subtitle_text)
+            if raw_status == 'recording':
+                live_label = Gtk.Label(valign=Gtk.Align.CENTER, css_classes=["caption", "dim-label"])
+                row.add_suffix(live_label)
+                self.live_labels[task['id']] = live_label
+                extend_button = Gtk.Button(icon_name="list-add-symbolic", valign=Gtk.Align.CENTER)
+                extend_button.set_tooltip_text(_("Extend by 15 minutes"))
+                extend_button.connect("clicked", self.on_extend_clicked, task['id'], task['end_time'])
+                row.add_suffix(extend_button)
+                stop_button = Gtk.Button(icon_name="media-playback-stop-symbolic", valign=Gtk.Align.CENTER)
+                stop_button.set_tooltip_text(_("Stop Recording"))
+                stop_button.connect("clicked", self.on_stop_clicked, task['id'])
+                row.add_suffix(stop_button)
             delete_button = Gtk.Button(icon_name="user-trash-symbolic", valign=Gtk.Align.CENTER)
             delete_button.add_css_class("destructive-action")
             delete_button.connect("clicked", self.on_delete_clicked, task['id'])
@@ -106,6 +134,49 @@ class SchedulerWindow(Adw.PreferencesWindow):
         """Emits a signal to delete the corresponding task when the delete button is pressed."""
         self.emit("schedule-deleted", task_id)
 
+    def on_stop_clicked(self, button, task_id):
+        button.set_sensitive(False)
+        self.emit("recording-stop-requested", task_id)
+
+    def on_extend_clicked(self, button, task_id, end_time):
+        self.emit("recording-extend-requested", task_id, end_time + EXTEND_STEP_SECONDS)
+
+    def _poll_live_stats(self):
+        """Asks the recorder daemon for the live figures of the running recordings (in a thread)."""
+        if not self.is_fetching_live_stats:
+            self.is_fetching_live_stats = True
+            threading.Thread(target=self._fetch_live_stats_thread, daemon=True).start()
+        return True
+
+    def _fetch_live_stats_thread(self):
+        recordings = recorder_control.list_active_recordings()
+        GLib.idle_add(self._apply_live_stats, recordings)
+
+    def _apply_live_stats(self, recordings):
+        self.is_fetching_live_stats = False
+        if recordings is None or self.live_stats_timer_id is None:
+            return False
+        profile_db = os.path.abspath(database.CURRENT_PROFILE_DB_FILE or "")
+        running = {r["id"]: r for r in recordings if os.path.abspath(r["profile_db"]) == profile_db}
+        # Rebuild only when the daemon's set changes between polls: rows the daemon
+        # no longer runs stay 'recording' in the database until their end time.
+        if set(running) != self.last_running_ids:
+            self.last_running_ids = set(running)
+            self.refresh_tasks_list()
+        for task_id, label in self.live_labels.items():
+            info = running.get(task_id)
+            if not info:
+                label.set_text(_("Not running"))
+                continue
+            size_text = GLib.format_size(info["bytes_written"])
+            label.set_text(f"{size_text}  |  {info['bitrate_kbps'] / 1000:.2f} Mbps")
+        return False
+
+    def on_close(self, *args):
+        if self.live_stats_timer_id:
+            GLib.source_remove(self.live_stats_timer_id)
+            self.live_stats_timer_id = None
+
     def on_save_clicked(self, button):
         if not self.selected_channel_data:
             self.get_transient_for().show_toast(_("Please select a valid channel!"))
@@ -10,12 +10,15 @@ import threading
 import os
 import json
 import re
-from utils.image_loader import load_image_async
+from utils.image_loader import load_image_async, PRIORITY_PREFETCH
 from data_providers import tmdb_client
 from core.config import get_fallback_tmdb_key
 import database
 from utils.theme_utils import get_icon_theme_folder
 IMAGE_BASE_URL_PROFILE = "https://image.tmdb.org/t/p/w185"
+POSTER_WIDTH = 200
+POSTER_HEIGHT = 300
+CAST_IMAGE_SIZE = 138
 class SeriesDetailView(Gtk.Box):
     __gsignals__ = {
         "back-requested": (GObject.SignalFlags.RUN_FIRST, None, ()),
@@ -149,8 +152,10 @@ class SeriesDetailView(Gtk.Box):
         self.trailer_button.set_sensitive(False)
         poster_url = info.get('cover') or info.get('backdrop_path')
         if poster_url and isinstance(poster_url, str) and poster_url.startswith("http"):
+            scale = self.poster_image.get_scale_factor()
             load_image_async(poster_url, self.poster_image,
-                             on_success_callback=lambda w, p: w.set_paintable(Gdk.Texture.new_for_pixbuf(p)))
+                             on_success_callback=lambda w, p: w.set_paintable(Gdk.Texture.new_for_pixbuf(p)),
+                             width=POSTER_WIDTH * scale, height=POSTER_HEIGHT * scale)
         user_key = database.get_config_value("tmdb_api_key")
         api_key = user_key if user_key else get_fallback_tmdb_key()
         use_tmdb = database.get_use_tmdb_status()
@@ -276,6 +281,7 @@ class SeriesDetailView(Gtk.Box):
                 self.cast_flowbox.remove(child)
              if cast_list:
                 logging.debug(f"SERIES DETAIL: Creating boxes for {len(cast_list)} cast members...")
+                scale = self.get_scale_factor()
                 for actor in cast_list:
                     actor_box = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=4, margin_bottom=6)
                     actor_box.set_size_request(100, -1)
@@ -285,7 +291,9 @@ class SeriesDetailView(Gtk.Box):
                         full_image_url = IMAGE_BASE_URL_PROFILE + profile_path
                         load_image_async(
                             full_image_url, actor_image,
-                            on_success_callback=lambda widget, pixbuf: widget.set_from_pixbuf(pixbuf)
+                            on_success_callback=lambda widget, pixbuf: widget.set_from_pixbuf(pixbuf),
+                            width=CAST_IMAGE_SIZE * scale, height=CAST_IMAGE_SIZE * scale,
+                            priority=PRIORITY_PREFETCH
                         )
                     actor_name_label = Gtk.Label(label=actor.get('name', 'N/A'), wrap=True, justify=Gtk.Justification.CENTER, xalign=0.5)
                     actor_name_label.set_size_request(100, -1)
@@ -300,9 +308,11 @@ class SeriesDetailView(Gtk.Box):
              if poster_key:
                  full_poster_url = tmdb_client.get_poster_url(poster_key)
                  if full_poster_url:
+                     scale = self.poster_image.get_scale_factor()
                      load_image_async(
                          full_poster_url, self.poster_image,
-                         on_success_callback=lambda widget, pixbuf: widget.set_paintable(Gdk.Texture.new_for_pixbuf(pixbuf))
+                         on_success_callback=lambda widget, pixbuf: widget.set_paintable(Gdk.Texture.new_for_pixbuf(pixbuf)),
+                         width=POSTER_WIDTH * scale, height=POSTER_HEIGHT * scale
                      )
              trailer_key = tmdb_api_or_db_data.get("trailer_key")
              logging.info(f"SERIES DETAIL UI Update: Found trailer_key = {trailer_key}")
@@ -81,9 +81,6 @@ class SubtitleSettingsDialog(Adw.PreferencesWindow):
             database.set_config_value("subtitle_font", new_font_name)
             self.font_setting_str = new_font_name
             self.font_row.set_subtitle(self.font_setting_str)
-            main_window = self.get_transient_for()
-            if main_window and hasattr(main_window, 'player'):
-                main_window.player.apply_subtitle_font(new_font_name)
             self._show_toast(_("Subtitle font set!"))
         dialog.destroy()
 
@@ -34,17 +34,31 @@ def _clean_directory(cache_dir, max_age_days):
         logging.error(f"Cache Cleaner: Error while cleaning '{cache_dir}': {e}")
         return 0
 
+def _clean_poster_cache(max_age_days):
+    """
+    The poster cache keeps an index with the last access of every file, so
+    it is cleaned by last use (not by mtime) and without listing the folder.
+    """
+    from utils.image_loader import disk_cache
+    try:
+        deleted_count = disk_cache.evict_unused(max_age_days)
+    except Exception as e:
+        logging.error(f"Cache Cleaner: Error while cleaning the poster cache: {e}")
+        return 0
+    if deleted_count > 0:
+        logging.info(f"Cache Cleaner: {deleted_count} unused posters deleted.")
+    return deleted_count
+
 def clean_all_caches(max_age_days=30):
     """
     Cleans all known image caches in the application.
     """
     logging.info(f"Cache cleanup started (files older than {max_age_days} days will be deleted)...")
     base_cache_dir = database.get_cache_path()
-    poster_cache_dir = os.path.join(base_cache_dir, "poster_cache")
     grid_cache_dir = os.path.join(base_cache_dir, "grid_thumbnails")
     album_art_cache_dir = os.path.join(base_cache_dir, "album_art")
     total_deleted = 0
-    total_deleted += _clean_directory(poster_cache_dir, max_age_days)
+    total_deleted += _clean_poster_cache(max_age_days)
     total_deleted += _clean_directory(grid_cache_dir, max_age_days)
     total_deleted += _clean_directory(album_art_cache_dir, max_age_days)
     logging.info(f"Cache cleanup finished. Total {total_deleted} old files deleted.")
@@ -0,0 +1,260 @@
+# utils/epg_matcher.py
+
+import re
+import logging
+import time
+import importlib.util
+from utils import name_normalizer
+
+try:
+    from rapidfuzz import process as rf_process, fuzz as rf_fuzz, utils as rf_utils
+    RAPIDFUZZ_AVAILABLE = True
+except ImportError:
+    rf_process = None
+    RAPIDFUZZ_AVAILABLE = False
+# rapidfuzz's cdist() returns a numpy array, but rapidfuzz does not depend on numpy
+CDIST_AVAILABLE = RAPIDFUZZ_AVAILABLE and importlib.util.find_spec("numpy") is not None
+try:
+    from thefuzz import process
+    FUZZ_AVAILABLE = True
+except ImportError:
+    try:
+        from fuzzywuzzy import process
+        FUZZ_AVAILABLE = True
+    except ImportError:
+        process = None
+        FUZZ_AVAILABLE = RAPIDFUZZ_AVAILABLE
+        if not FUZZ_AVAILABLE:
+            logging.warning("Smart search library ('rapidfuzz', 'thefuzz' or 'fuzzywuzzy') not found! Fuzzy EPG matching will be skipped.")
+
+FUZZY_SCORE_CUTOFF = 80
+MAX_LENGTH_RATIO = 2.0
+_DIGITS_RE = re.compile(r'\d')
+
+COMMON_ISO_CODES = frozenset([
+    "tr", "us", "uk", "fr", "de", "it", "es", "pt", "nl", "be",
+    "ru", "gr", "az", "ch", "at", "pl", "ro", "bg", "hu",
+    "cz", "sk", "al", "rs", "hr", "ba", "mk", "se", "no", "dk",
+    "fi", "ie", "ca", "au", "nz", "br", "ar", "mx", "ae", "sa",
+    "eg", "in", "cn", "jp", "kr", "za",
+    "tur", "usa", "gbr", "fra", "deu", "ita", "esp", "prt", "nld", "bel",
+    "rus", "grc", "aze", "che", "aut", "pol", "rou", "bgr", "hun", "cze",
+    "svk", "alb", "srb", "hrv", "bih", "mkd", "swe", "nor", "dnk", "fin",
+    "irl", "can", "aus", "nzl", "bra", "arg", "mex", "are", "sau", "egy"
+])
+
+def channel_search_key(channel):
+    """Returns the identifier used for EPG lookups: tvg-id, then tvg-name, then the display name."""
+    t_id = (channel.get("tvg-id") or "").strip()
+    t_name = (channel.get("tvg-name") or "").strip()
+    name = (channel.get("name") or "").strip()
+    return t_id or t_name or name or None
+
+def _digit_signature(text):
+    return "".join(_DIGITS_RE.findall(text))
+
+def _country_suffix(key):
+    return key.rsplit(".", 1)[-1] if "." in key else None
+
+def _length_ratio(key1, key2):
+    len1, len2 = len(key1), len(key2)
+    return max(len1, len2) / min(len1, len2) if min(len1, len2) > 0 else 0
+
+def check_digits_match(str1, str2):
+    return _digit_signature(str1) == _digit_signature(str2)
+
+def check_country_match(key1, key2):
+    if "." in key1 and "." in key2:
+        return key1.split(".")[-1] == key2.split(".")[-1]
+    if "." in key2:
+        epg_suffix = key2.split(".")[-1].lower()
+        if 2 <= len(epg_suffix) <= 3:
+            channel_prefix = key1[:len(epg_suffix)].lower()
+            if channel_prefix != epg_suffix:
+                if channel_prefix in COMMON_ISO_CODES:
+                    return False
+    return True
+
+def extract_one(query, choices, score_cutoff=0):
+    """
+    Returns the (choice, score) pair that scores best against query, with
+    the same scorer as the EPG fuzzy step, or None without a fuzzy library
+    or a choice reaching score_cutoff.
+    """
+    if RAPIDFUZZ_AVAILABLE:
+        result = rf_process.extractOne(query, choices, scorer=rf_fuzz.WRatio,
+                                       processor=rf_utils.default_process, score_cutoff=score_cutoff)
+        return (result[0], result[1]) if result else None
+    if process is not None:
+        return process.extractOne(query, choices, score_cutoff=score_cutoff)
+    return None
+
+class EpgMatcher:
+    """
+    Resolves provider channel identifiers to EPG channel IDs with the
+    direct -> clean key -> fuzzy -> soft match cascade.
+
+    Guide keys are blocked into buckets by leading character and digit
+    signature, and split by country suffix inside each bucket. A fuzzy
+    candidate has to pass those checks anyway, so only the keys of the
+    same bucket and a compatible country are ever scored.
+    """
+
+    def __init__(self, epg_channel_ids):
+        epg_channel_ids = list(epg_channel_ids)
+        self.epg_channel_ids = set(epg_channel_ids)
+        self.clean_map = {}
+        for epg_id, key in zip(epg_channel_ids, name_normalizer.clean_keys(epg_channel_ids)):
+            if key:
+                self.clean_map[key] = epg_id
+        self._buckets = {}
+        for key in self.clean_map:
+            bucket = self._buckets.setdefault(self._bucket_key(key), {})
+            bucket.setdefault(_country_suffix(key), []).append(key)
+        self.last_stats = None
+
+    @staticmethod
+    def _bucket_key(clean_key):
+        return clean_key[0], _digit_signature(clean_key)
+
+    def _choice_groups(self, bucket_key, clean_key):
+        """
+        Country suffix groups of the bucket that can pass check_country_match
+        for clean_key: a key with a suffix only sees its own group and the
+        keys without one; a key without a suffix skips the groups its
+        country prefix rules out.
+        """
+        bucket = self._buckets.get(bucket_key)
+        if not bucket:
+            return ()
+        suffix = _country_suffix(clean_key)
+        if suffix is not None:
+            return tuple(group for group in (suffix, None) if group in bucket)
+        return tuple(group for group in bucket if group is None or check_country_match(clean_key, f".{group}"))
+
+    def _is_candidate(self, clean_key, guide_key):
+        return _length_ratio(clean_key, guide_key) <= MAX_LENGTH_RATIO and \
+               check_country_match(clean_key, guide_key)
+
+    def _fuzzy_match_many(self, clean_keys):
+        """
+        Scores each clean key against the guide keys of its bucket and
+        returns clean_key -> best guide key for the accepted matches,
+        plus the number of comparisons made.
+        """
+        matches = {}
+        comparisons = 0
+        if not FUZZ_AVAILABLE or not clean_keys:
+            return matches, comparisons
+        grouped = {}
+        for clean_key in clean_keys:
+            bucket_key = self._bucket_key(clean_key)
+            groups = self._choice_groups(bucket_key, clean_key)
+            if groups:
+                grouped.setdefault((bucket_key, groups), []).append(clean_key)
+        for (bucket_key, groups), queries in grouped.items():
+            bucket = self._buckets[bucket_key]
+            choices = [key for group in groups for key in bucket[group]]
+            comparisons += len(queries) * len(choices)
+            if CDIST_AVAILABLE:
+                scores = rf_process.cdist(
+                    queries, choices,
+                    scorer=rf_fuzz.WRatio,
+                    processor=rf_utils.default_process,
+                    score_cutoff=FUZZY_SCORE_CUTOFF,
+                    workers=-1
+                )
+                for query, row in zip(queries, scores):
+                    best_match, best_score = None, 0
+                    for guide_key, score in zip(choices, row):
+                        if score > best_score and self._is_candidate(query, guide_key):
+                            best_match, best_score = guide_key, score
+                    if best_match is not None:
+                        matches[query] = best_match
+            else:
+                for query in queries:
+                    candidates = [key for key in choices if self._is_candidate(query, key)]
+                    if not candidates:
+                        continue
+                    best_match_tuple = extract_one(query, candidates, score_cutoff=FUZZY_SCORE_CUTOFF)
+                    if best_match_tuple:
+                        matches[query] = best_match_tuple[0]
+        return matches, comparisons
+
+    def _resolve_exact(self, search_key):
+        """Runs the direct and clean key steps. Returns (step, epg_id, clean_key)."""
+        if search_key in self.epg_channel_ids:
+            return "direct", search_key, None
+        clean_key = name_normalizer.clean_key(search_key)
+        if not clean_key:
+            return "unmatched", None, None
+        if clean_key in self.clean_map:
+            return "clean", self.clean_map[clean_key], clean_key
+        return None, None, clean_key
+
+    def _resolve_soft(self, clean_key):
+        soft_key = clean_key.replace("tv.", ".")
+        return self.clean_map.get(soft_key)
+
+    def resolve(self, search_key):
+        """Returns the EPG channel ID for search_key, or None."""
+        if not search_key:
+            return None
+        step, epg_id, clean_key = self._resolve_exact(search_key)
+        if step:
+            logging.debug(f"EPG lookup '{search_key}': {step} -> {epg_id}")
+            return epg_id
+        matches, _ = self._fuzzy_match_many([clean_key])
+        if clean_key in matches:
+            logging.debug(f"EPG Found (Fuzzy): '{search_key}' -> '{matches[clean_key]}'")
+            return self.clean_map[matches[clean_key]]
+        epg_id = self._resolve_soft(clean_key)
+        logging.debug(f"EPG lookup '{search_key}': {'soft' if epg_id else 'unmatched'} -> {epg_id}")
+        return epg_id
+
+    def resolve_all(self, search_keys, known=None):
+        """
+        Resolves every key that is not already in 'known' and returns the
+        new search_key -> EPG channel ID (or None) entries. Fuzzy scoring is
+        batched per bucket. Match-rate and timing figures are logged and
+        kept in last_stats.
+        """
+        known = known or {}
+        started = time.monotonic()
+        stats = {"direct": 0, "clean": 0, "fuzzy": 0, "soft": 0, "unmatched": 0}
+        resolved = {}
+        pending = {}
+        for search_key in search_keys:
+            if search_key in known or search_key in resolved or search_key in pending:
+                continue
+            step, epg_id, clean_key = self._resolve_exact(search_key)
+            if step:
+                resolved[search_key] = epg_id
+                stats[step] += 1
+            else:
+                pending[search_key] = clean_key
+        exact_elapsed = time.monotonic() - started
+        matches, comparisons = self._fuzzy_match_many(list(set(pending.values())))
+        for search_key, clean_key in pending.items():
+            if clean_key in matches:
+                resolved[search_key] = self.clean_map[matches[clean_key]]
+                stats["fuzzy"] += 1
+                continue
+            epg_id = self._resolve_soft(clean_key)
+            resolved[search_key] = epg_id
+            stats["soft" if epg_id else "unmatched"] += 1
+        total = len(resolved)
+        stats["total"] = total
+        stats["match_rate"] = (total - stats["unmatched"]) / total if total else 0.0
+        stats["comparisons"] = comparisons
+        stats["naive_comparisons"] = len(set(pending.values())) * len(self.clean_map)
+        stats["exact_seconds"] = exact_elapsed
+        stats["total_seconds"] = time.monotonic() - started
+        self.last_stats = stats
+        logging.info(
+            f"EPG matcher resolved {total} channel keys in {stats['total_seconds']:.2f}s "
+            f"(match rate {stats['match_rate']:.1%}: direct {stats['direct']}, clean {stats['clean']}, "
+            f"fuzzy {stats['fuzzy']}, soft {stats['soft']}, unmatched {stats['unmatched']}; "
+            f"{comparisons} fuzzy comparisons instead of {stats['naive_comparisons']})."
+        )
+        return resolved
@@ -0,0 +1,161 @@
+# utils/http_client.py
+
+import atexit
+import logging
+import threading
+import time
+from urllib.parse import urlsplit
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3 import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.exceptions import EmptyPoolError
+from urllib3.util import Retry, make_headers
+
+MAX_CONNECTIONS_PER_HOST = 6
+MAX_POOLED_HOSTS = 32
+POOL_TIMEOUT_SECONDS = 30
+RETRY_TOTAL = 2
+RETRY_CONNECT = 1
+RETRY_BACKOFF_FACTOR = 0.5
+RETRY_STATUS_CODES = (500, 502, 503, 504)
+LATENCY_BUCKETS_MS = (50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+_session = None
+_session_lock = threading.Lock()
+_stats_lock = threading.Lock()
+_host_stats = {}
+
+class _BoundedWaitMixin:
+    """Waits at most POOL_TIMEOUT_SECONDS for a free connection of a full per-host pool."""
+
+    def _get_conn(self, timeout=None):
+        return super()._get_conn(timeout=POOL_TIMEOUT_SECONDS if timeout is None else timeout)
+
+class _HTTPConnectionPool(_BoundedWaitMixin, HTTPConnectionPool):
+    pass
+
+class _HTTPSConnectionPool(_BoundedWaitMixin, HTTPSConnectionPool):
+    pass
+
+class _PooledAdapter(HTTPAdapter):
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {"http": _HTTPConnectionPool, "https": _HTTPSConnectionPool}
+
+def _create_session():
+    """
+    One Session for the whole app: connections are kept alive in a pool per
+    host, and pool_block makes MAX_CONNECTIONS_PER_HOST a hard per-host
+    concurrency limit (a caller waits at most POOL_TIMEOUT_SECONDS for a
+    free connection). A failed connect is retried once; idempotent requests
+    are also retried with exponential backoff on 5xx responses. Read
+    timeouts are never retried, so a request takes at most about twice its
+    timeout. The last response is returned as is, so callers keep using
+    raise_for_status().
+    """
+    retry = Retry(
+        total=RETRY_TOTAL,
+        connect=RETRY_CONNECT,
+        read=False,
+        status=RETRY_TOTAL,
+        backoff_factor=RETRY_BACKOFF_FACTOR,
+        status_forcelist=RETRY_STATUS_CODES,
+        allowed_methods=frozenset({"GET", "HEAD"}),
+        raise_on_status=False,
+        respect_retry_after_header=False
+    )
+    adapter = _PooledAdapter(
+        pool_connections=MAX_POOLED_HOSTS,
+        pool_maxsize=MAX_CONNECTIONS_PER_HOST,
+        pool_block=True,
+        max_retries=retry
+    )
+    session = requests.Session()
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    # gzip/deflate always; br (and zstd) when urllib3 can decode them.
+    session.headers["Accept-Encoding"] = make_headers(accept_encoding=True)["accept-encoding"]
+    return session
+
+def get_session():
+    global _session
+    with _session_lock:
+        if _session is None:
+            _session = _create_session()
+        return _session
+
+def _record(host, elapsed, failed):
+    elapsed_ms = elapsed * 1000
+    with _stats_lock:
+        stats = _host_stats.get(host)
+        if stats is None:
+            stats = _host_stats[host] = {
+                "requests": 0,
+                "errors": 0,
+                "total_ms": 0.0,
+                "buckets": [0] * (len(LATENCY_BUCKETS_MS) + 1),
+            }
+        stats["requests"] += 1
+        stats["total_ms"] += elapsed_ms
+        if failed:
+            stats["errors"] += 1
+        for index, limit in enumerate(LATENCY_BUCKETS_MS):
+            if elapsed_ms <= limit:
+                break
+        else:
+            index = len(LATENCY_BUCKETS_MS)
+        stats["buckets"][index] += 1
+
+def request(method, url, **kwargs):
+    """
+    Sends a request through the shared session. Takes the same arguments and
+    raises the same exceptions as requests.request(); the time until the
+    response (or the error) is recorded per host.
+
+    With stream=True the response holds one of the host's
+    MAX_CONNECTIONS_PER_HOST pooled connections until it is read to the end
+    or closed, also when it is an error response. Use it as a context
+    manager ("with http_client.get(..., stream=True) as response:");
+    tools/check_streamed_responses.py finds call sites that don't.
+    """
+    host = urlsplit(url).hostname or ""
+    started = time.monotonic()
+    try:
+        response = get_session().request(method, url, **kwargs)
+    except EmptyPoolError as e:
+        _record(host, time.monotonic() - started, failed=True)
+        raise requests.exceptions.ConnectionError(f"No free connection to {host} after {POOL_TIMEOUT_SECONDS}s") from e
+    except requests.exceptions.RequestException:
+        _record(host, time.monotonic() - started, failed=True)
+        raise
+    _record(host, time.monotonic() - started, failed=response.status_code >= 500)
+    return response
+
+def get(url, **kwargs):
+    return request("GET", url, **kwargs)
+
+def post(url, **kwargs):
+    return request("POST", url, **kwargs)
+
+def get_host_stats():
+    """Request and error counts, mean latency and a latency histogram (ms bucket -> count) per host."""
+    labels = [f"<={limit}ms" for limit in LATENCY_BUCKETS_MS] + [f">{LATENCY_BUCKETS_MS[-1]}ms"]
+    with _stats_lock:
+        return {
+            host: {
+                "requests": stats["requests"],
+                "errors": stats["errors"],
+                "avg_ms": round(stats["total_ms"] / stats["requests"], 1),
+                "histogram": dict(zip(labels, stats["buckets"])),
+            }
+            for host, stats in _host_stats.items()
+        }
+
+def _log_host_stats():
+    for host, stats in sorted(get_host_stats().items()):
+        histogram = ", ".join(f"{label}: {count}" for label, count in stats["histogram"].items() if count)
+        logging.info(
+            f"HTTP {host}: {stats['requests']} requests, {stats['errors']} errors, "
+            f"avg {stats['avg_ms']} ms ({histogram})"
+        )
+atexit.register(_log_host_stats)
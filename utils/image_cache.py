@@ -0,0 +1,288 @@
+# utils/image_cache.py
+
+import os
+import time
+import sqlite3
+import logging
+import threading
+from collections import OrderedDict
+import database
+
+MEMORY_CACHE_BUDGET_BYTES = 128 * 1024 * 1024
+INDEX_FILE_NAME = "index.db"
+INDEX_FLUSH_THRESHOLD = 64
+DISK_EVICTION_TARGET = 0.9
+
+class MemoryImageCache:
+    """
+    LRU of decoded pixbufs keyed by (url, width, height). The budget is the
+    size of the pixel data, so a few full-size backdrops cannot hide behind
+    a small entry count. Safe to use from the pool threads and the UI thread.
+    """
+
+    def __init__(self, budget_bytes=MEMORY_CACHE_BUDGET_BYTES):
+        self.budget_bytes = budget_bytes
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key, pixbuf):
+        size = pixbuf.get_byte_length()
+        if size > self.budget_bytes:
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.total_bytes -= old[1]
+            self._entries[key] = (pixbuf, size)
+            self.total_bytes += size
+            while self.total_bytes > self.budget_bytes:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self.total_bytes -= evicted_size
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.total_bytes = 0
+
+    def stats(self):
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self.total_bytes,
+                "budget_bytes": self.budget_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+class DiskImageCache:
+    """
+    The poster_cache folder with an index of file name -> (size, last access).
+    The index lives in memory and is persisted to poster_cache/index.db in
+    batches, so lookups, touches and LRU eviction never list the folder.
+    Existing cache folders are imported once, the first time the index is
+    created.
+    """
+
+    def __init__(self, folder_name="poster_cache"):
+        self.folder_name = folder_name
+        self._lock = threading.RLock()
+        self._cache_dir = None
+        self._conn = None
+        self._entries = {}
+        self._dirty = {}
+        self._removed = set()
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _current_dir(self):
+        return os.path.join(database.get_cache_path(), self.folder_name)
+
+    def _ensure_open(self):
+        """Opens (or re-opens, after the cache folder moved) the index. Caller holds the lock."""
+        cache_dir = self._current_dir()
+        if self._conn is not None and cache_dir == self._cache_dir:
+            return cache_dir
+        self._close_index()
+        os.makedirs(cache_dir, exist_ok=True)
+        index_path = os.path.join(cache_dir, INDEX_FILE_NAME)
+        is_new = not os.path.exists(index_path)
+        self._conn = sqlite3.connect(index_path, timeout=10, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS entries (
+                name TEXT PRIMARY KEY,
+                size INTEGER NOT NULL,
+                last_access INTEGER NOT NULL
+            )
+        """)
+        self._cache_dir = cache_dir
+        if is_new:
+            self._import_existing_files(cache_dir)
+        self._entries = {
+            name: [size, last_access]
+            for name, size, last_access in self._conn.execute("SELECT name, size, last_access FROM entries")
+        }
+        self.total_bytes = sum(entry[0] for entry in self._entries.values())
+        logging.debug(f"Image disk cache: {len(self._entries)} entries, {self.total_bytes // 1024} KB in '{cache_dir}'.")
+        return cache_dir
+
+    def _import_existing_files(self, cache_dir):
+        rows = []
+        with os.scandir(cache_dir) as it:
+            for entry in it:
+                if entry.is_file() and not entry.name.startswith(INDEX_FILE_NAME):
+                    stat = entry.stat()
+                    rows.append((entry.name, stat.st_size, int(stat.st_mtime)))
+        with self._conn:
+            self._conn.executemany("INSERT OR REPLACE INTO entries (name, size, last_access) VALUES (?, ?, ?)", rows)
+        if rows:
+            logging.info(f"Image disk cache: indexed {len(rows)} existing files in '{cache_dir}'.")
+
+    def _close_index(self, flush=True):
+        if self._conn is None:
+            return
+        try:
+            if flush:
+                self._flush()
+            self._conn.close()
+        except sqlite3.Error as e:
+            logging.warning(f"Image disk cache: could not close the index: {e}")
+        self._conn = None
+        self._cache_dir = None
+        self._entries = {}
+        self._dirty = {}
+        self._removed = set()
+        self.total_bytes = 0
+
+    def _flush(self):
+        if not self._dirty and not self._removed:
+            return
+        with self._conn:
+            if self._removed:
+                self._conn.executemany("DELETE FROM entries WHERE name = ?", [(name,) for name in self._removed])
+            if self._dirty:
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO entries (name, size, last_access) VALUES (?, ?, ?)",
+                    [(name, size, last_access) for name, (size, last_access) in self._dirty.items()]
+                )
+        self._dirty = {}
+        self._removed = set()
+
+    def _mark_dirty(self, name, entry):
+        self._removed.discard(name)
+        self._dirty[name] = tuple(entry)
+        if len(self._dirty) >= INDEX_FLUSH_THRESHOLD:
+            self._flush()
+
+    def _drop(self, name):
+        entry = self._entries.pop(name, None)
+        if entry is not None:
+            self.total_bytes -= entry[0]
+        self._dirty.pop(name, None)
+        self._removed.add(name)
+
+    def lookup(self, name):
+        """Returns the path of a cached file and marks it as used, or None."""
+        with self._lock:
+            cache_dir = self._ensure_open()
+            entry = self._entries.get(name)
+            if entry is None:
+                self.misses += 1
+                return None
+            path = os.path.join(cache_dir, name)
+            if not os.path.exists(path):
+                self._drop(name)
+                self.misses += 1
+                return None
+            entry[1] = int(time.time())
+            self._mark_dirty(name, entry)
+            self.hits += 1
+            return path
+
+    def path_for(self, name):
+        with self._lock:
+            return os.path.join(self._ensure_open(), name)
+
+    def add(self, name):
+        """Indexes a file that was just written to path_for(name) and evicts if over budget."""
+        with self._lock:
+            cache_dir = self._ensure_open()
+            try:
+                size = os.path.getsize(os.path.join(cache_dir, name))
+            except OSError:
+                return
+            old = self._entries.get(name)
+            if old is not None:
+                self.total_bytes -= old[0]
+            entry = [size, int(time.time())]
+            self._entries[name] = entry
+            self.total_bytes += size
+            self._mark_dirty(name, entry)
+            budget = database.get_poster_cache_limit_mb() * 1024 * 1024
+            if budget and self.total_bytes > budget:
+                self._evict_until(int(budget * DISK_EVICTION_TARGET), cache_dir)
+
+    def discard(self, name):
+        """Forgets (and deletes) a cached file, e.g. one that could not be decoded."""
+        with self._lock:
+            cache_dir = self._ensure_open()
+            self._drop(name)
+            try:
+                os.remove(os.path.join(cache_dir, name))
+            except OSError:
+                pass
+
+    def _evict(self, names, cache_dir):
+        for name in names:
+            self._drop(name)
+            try:
+                os.remove(os.path.join(cache_dir, name))
+            except OSError:
+                pass
+            self.evictions += 1
+        self._flush()
+
+    def _evict_until(self, target_bytes, cache_dir):
+        by_age = sorted(self._entries.items(), key=lambda item: item[1][1])
+        victims = []
+        remaining = self.total_bytes
+        for name, (size, _last_access) in by_age:
+            if remaining <= target_bytes:
+                break
+            victims.append(name)
+            remaining -= size
+        self._evict(victims, cache_dir)
+        logging.info(f"Image disk cache: evicted {len(victims)} files, {self.total_bytes // (1024 * 1024)} MB left.")
+
+    def evict_unused(self, max_age_days):
+        """Deletes entries that were not used for max_age_days. Returns the number of deleted files."""
+        with self._lock:
+            cache_dir = self._ensure_open()
+            cutoff = time.time() - max_age_days * 86400
+            victims = [name for name, (_size, last_access) in self._entries.items() if last_access < cutoff]
+            self._evict(victims, cache_dir)
+            return len(victims)
+
+    def flush(self):
+        with self._lock:
+            if self._conn is not None:
+                self._flush()
+
+    def close(self):
+        """Writes pending index updates and closes the index (e.g. before the cache folder is moved)."""
+        with self._lock:
+            self._close_index()
+
+    def reset(self):
+        """Drops the open index (after the cache folder was deleted or moved)."""
+        with self._lock:
+            self._close_index(flush=False)
+
+    def stats(self):
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self.total_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
@@ -1,76 +1,284 @@
 # utils/image_loader.py
 
+import atexit
 import threading
-import urllib.request
 import logging
 import os
+import time
 import hashlib
+from urllib.parse import urlsplit
+import requests
 from gi.repository import GLib, GdkPixbuf
 import database
 from background import image_download_pool
+from utils import http_client
+from utils.image_cache import MemoryImageCache, DiskImageCache
+from utils.priority_pool import PRIORITY_VISIBLE, PRIORITY_NORMAL
 
-_failed_urls_memory = set()
-_downloading_urls = set()
+FAILURE_TTL_SECONDS = 300
+HOST_FAILURE_THRESHOLD = 3
+_registry_lock = threading.RLock()
+_in_flight = {}
+_failed_urls = {}
+_failed_hosts = {}
+_host_errors = {}
+memory_cache = MemoryImageCache()
+disk_cache = DiskImageCache("poster_cache")
 
-def load_image_async(url, widget, on_success_callback=None, on_failure=None):
+def get_cache_stats():
+    """Hit, miss and eviction counters of both cache tiers (for tuning the budgets)."""
+    return {"memory": memory_cache.stats(), "disk": disk_cache.stats()}
+
+def get_queue_stats():
+    """Queue depth per priority and wait times of the image download pool."""
+    return image_download_pool.stats()
+
+def _shutdown_caches():
+    # atexit runs this before background's shutdown_image_pool (registered
+    # first), so wait for running loads here; their disk_cache.add() calls
+    # must land before the final index flush.
+    image_download_pool.shutdown(wait=True, cancel_futures=True)
+    disk_cache.flush()
+    logging.info(f"Image cache stats: {get_cache_stats()}")
+atexit.register(_shutdown_caches)
+
+def reset_caches(flush=False):
     """
-    Downloads an image from a URL, using a local disk cache to avoid
-    re-downloading. Implements blacklist and race-condition prevention.
+    Forgets everything cached. Call it with flush=True before the cache
+    folder is moved, and without after it was deleted.
     """
-    if not url or not widget:
-        return
-    if url in _failed_urls_memory:
-        return
-    if url in _downloading_urls:
-        return
-    _downloading_urls.add(url)
-
-    def thread_func():
-        try:
-            base_cache_dir = database.get_cache_path()
-            cache_dir = os.path.join(base_cache_dir, "poster_cache")
-            os.makedirs(cache_dir, exist_ok=True)
+    memory_cache.clear()
+    if flush:
+        disk_cache.close()
+    else:
+        disk_cache.reset()
+
+def _cache_key(url, width=None, height=None):
+    return (url, width, height)
+
+def _cache_file_name(url, width=None, height=None):
+    hash_name = hashlib.md5(url.encode()).hexdigest()
+    if width and height:
+        return f"{hash_name}_{width}x{height}.jpg"
+    return f"{hash_name}.jpg"
+
+def _scaled_size(image_width, image_height, width, height):
+    """
+    The smallest size with the image's aspect ratio that still covers
+    width x height, so Gtk.ContentFit.COVER never has to upscale.
+    Images are never enlarged.
+    """
+    scale = min(1.0, max(width / image_width, height / image_height))
+    return max(1, round(image_width * scale)), max(1, round(image_height * scale))
+
+def _decode_file(path, width, height):
+    if not (width and height):
+        return GdkPixbuf.Pixbuf.new_from_file(path)
+    file_info = GdkPixbuf.Pixbuf.get_file_info(path)
+    if not file_info or not file_info[0]:
+        raise GLib.Error("Unknown image format")
+    target_width, target_height = _scaled_size(file_info[1], file_info[2], width, height)
+    return GdkPixbuf.Pixbuf.new_from_file_at_scale(path, target_width, target_height, True)
+
+def _decode_data(data, width, height):
+    """Decodes downloaded bytes; with a size, the loader scales while decoding."""
+    loader = GdkPixbuf.PixbufLoader.new()
+    if width and height:
+        loader.connect("size-prepared", lambda l, w, h: l.set_size(*_scaled_size(w, h, width, height)))
+    loader.write(data)
+    loader.close()
+    return loader.get_pixbuf()
+
+def _save_to_disk_cache(pixbuf, file_name):
+    final_path = disk_cache.path_for(file_name)
+    temp_path = final_path + ".part"
+    try:
+        pixbuf.savev(temp_path, "jpeg", ["quality"], ["90"])
+        os.replace(temp_path, final_path)
+        disk_cache.add(file_name)
+    except (GLib.Error, OSError):
+        pass
+
+def _load_pixbuf(url, width, height):
+    """
+    (Pool thread) Produces the pixbuf for one request: indexed disk cache
+    first, then the network. Raises on failure.
+    """
+    key = _cache_key(url, width, height)
+    use_disk_cache = database.get_use_poster_disk_cache_status()
+    file_name = _cache_file_name(url, width, height)
+    if use_disk_cache:
+        sources = [file_name]
+        if width and height:
+            sources.append(_cache_file_name(url))
+        for source_name in sources:
+            cache_path = disk_cache.lookup(source_name)
+            if not cache_path:
+                continue
             try:
-                hash_name = hashlib.md5(url.encode()).hexdigest()
-            except Exception:
-                return
-            cache_path = os.path.join(cache_dir, f"{hash_name}.jpg")
-            if database.get_use_poster_disk_cache_status():
-                if os.path.exists(cache_path):
-                    try:
-                        pixbuf = GdkPixbuf.Pixbuf.new_from_file(cache_path)
-                        if pixbuf and on_success_callback:
-                            GLib.idle_add(on_success_callback, widget, pixbuf)
-                        return
-                    except GLib.Error:
-                        try: os.remove(cache_path)
-                        except OSError: pass
-            headers = {"User-Agent": "Mozilla/5.0"}
-            req = urllib.request.Request(url, headers=headers)
-            with urllib.request.urlopen(req, timeout=6) as resp:
-                data = resp.read()
-            if data:
-                loader = GdkPixbuf.PixbufLoader.new()
-                loader.write(data)
-                loader.close()
-                pixbuf = loader.get_pixbuf()
-                if pixbuf:
-                    if database.get_use_poster_disk_cache_status():
-                        try:
-                            pixbuf.savev(cache_path, "jpeg", ["quality"], ["90"])
-                        except GLib.Error:
-                            pass
-                    if on_success_callback:
-                        GLib.idle_add(on_success_callback, widget, pixbuf)
-                else:
-                    raise Exception("Pixbuf error")
-            else:
-                raise Exception("Empty data")
-        except Exception:
-            _failed_urls_memory.add(url)
-            if on_failure:
-                GLib.idle_add(on_failure)
-        finally:
-            if url in _downloading_urls:
-                _downloading_urls.remove(url)
-    image_download_pool.submit(thread_func)
+                pixbuf = _decode_file(cache_path, width, height)
+            except GLib.Error:
+                disk_cache.discard(source_name)
+                continue
+            if pixbuf:
+                memory_cache.put(key, pixbuf)
+                if source_name != file_name:
+                    _save_to_disk_cache(pixbuf, file_name)
+                    disk_cache.discard(source_name)
+                return pixbuf
+    headers = {"User-Agent": "Mozilla/5.0"}
+    try:
+        response = http_client.get(url, headers=headers, timeout=6)
+        response.raise_for_status()
+        data = response.content
+    except requests.exceptions.HTTPError:
+        raise
+    except requests.exceptions.RequestException:
+        _record_host_error(urlsplit(url).netloc)
+        raise
+    with _registry_lock:
+        _host_errors.pop(urlsplit(url).netloc, None)
+    if not data:
+        raise ValueError("Empty data")
+    pixbuf = _decode_data(data, width, height)
+    if not pixbuf:
+        raise ValueError("Pixbuf error")
+    memory_cache.put(key, pixbuf)
+    if use_disk_cache:
+        _save_to_disk_cache(pixbuf, file_name)
+    return pixbuf
+
+def _remember_failure(registry, name):
+    if name:
+        with _registry_lock:
+            registry[name] = time.monotonic() + FAILURE_TTL_SECONDS
+
+def _record_host_error(host):
+    """A host is skipped for FAILURE_TTL_SECONDS after HOST_FAILURE_THRESHOLD connection errors in a row."""
+    with _registry_lock:
+        errors = _host_errors.get(host, 0) + 1
+        _host_errors[host] = errors
+    if errors >= HOST_FAILURE_THRESHOLD:
+        _remember_failure(_failed_hosts, host)
+        logging.warning(f"Image host '{host}' is not reachable, skipping it for {FAILURE_TTL_SECONDS}s.")
+
+def has_recent_failure(url):
+    """True while the URL (or its whole host) failed less than FAILURE_TTL_SECONDS ago."""
+    now = time.monotonic()
+    with _registry_lock:
+        for registry, name in ((_failed_urls, url), (_failed_hosts, urlsplit(url).netloc)):
+            expires = registry.get(name)
+            if expires is None:
+                continue
+            if expires > now:
+                return True
+            del registry[name]
+    return False
+
+def _run_request(key):
+    url, width, height = key
+    try:
+        return _load_pixbuf(url, width, height)
+    except Exception as e:
+        _remember_failure(_failed_urls, url)
+        logging.debug(f"Image load failed for '{url}': {e}")
+        raise
+
+class ImageRequest:
+    """One waiter on a (possibly shared) image load."""
+
+    __slots__ = ("key", "future", "cancelled")
+
+    def __init__(self, key, future):
+        self.key = key
+        self.future = future
+        self.cancelled = False
+
+    def cancel(self):
+        """
+        Detaches this waiter, so its callbacks will not run. The load itself
+        is cancelled when no other waiter needs it and it has not started
+        yet. Returns True if the load was cancelled.
+        """
+        if self.cancelled:
+            return False
+        self.cancelled = True
+        with _registry_lock:
+            entry = _in_flight.get(self.key)
+            if entry is None or entry[0] is not self.future:
+                return False
+            entry[1] -= 1
+            if entry[1] > 0:
+                return False
+            return self.future.cancel()
+
+def request_image(url, width=None, height=None, priority=PRIORITY_NORMAL):
+    """
+    Returns an ImageRequest whose future gives the pixbuf of url at the
+    given size. Concurrent requests for the same image share one Future,
+    so the image is only downloaded and decoded once however many widgets
+    wait for it. A more urgent request moves a queued load forward.
+    """
+    key = _cache_key(url, width, height)
+    with _registry_lock:
+        entry = _in_flight.get(key)
+        is_new = entry is None
+        if is_new:
+            future = image_download_pool.submit_with_priority(priority, _run_request, key)
+            entry = _in_flight[key] = [future, 0, priority]
+        elif priority < entry[2]:
+            image_download_pool.set_priority(entry[0], priority)
+            entry[2] = priority
+        entry[1] += 1
+        request = ImageRequest(key, entry[0])
+    if is_new:
+        request.future.add_done_callback(lambda f: _forget_request(key, f))
+    return request
+
+def _forget_request(key, future):
+    with _registry_lock:
+        entry = _in_flight.get(key)
+        if entry is not None and entry[0] is future:
+            del _in_flight[key]
+
+def _deliver(request, widget, on_success_callback, on_failure):
+    """(Main thread) Hands a finished request to one waiter, unless it was cancelled."""
+    if request.cancelled:
+        return False
+    future = request.future
+    if future.cancelled() or future.exception() is not None:
+        if on_failure:
+            on_failure()
+    elif on_success_callback:
+        on_success_callback(widget, future.result())
+    return False
+
+def load_image_async(url, widget, on_success_callback=None, on_failure=None, width=None, height=None,
+                     priority=PRIORITY_VISIBLE):
+    """
+    Loads an image for a widget: decoded pixbufs come from the memory LRU,
+    then from the indexed poster_cache on disk, and only then from the
+    network. With width and height the image is decoded (and cached) at
+    the smallest size that covers that box instead of at full resolution.
+    Every caller gets the result, also when the same image is already
+    being loaded for another widget. Failed URLs (and unreachable hosts)
+    are not retried for FAILURE_TTL_SECONDS.
+    Loads are queued by priority (on-screen widgets first, PRIORITY_PREFETCH
+    last). Returns the ImageRequest while the load is pending, so a widget
+    that goes off screen can cancel() it; None when it was answered (or
+    skipped) right away.
+    """
+    if not url or not widget:
+        return None
+    pixbuf = memory_cache.get(_cache_key(url, width, height))
+    if pixbuf is not None:
+        if on_success_callback:
+            on_success_callback(widget, pixbuf)
+        return None
+    if has_recent_failure(url):
+        return None
+    request = request_image(url, width, height, priority)
+    request.future.add_done_callback(
+        lambda f: GLib.idle_add(_deliver, request, widget, on_success_callback, on_failure)
+    )
+    return request
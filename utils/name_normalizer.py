@@ -0,0 +1,67 @@
+# utils/name_normalizer.py
+
+import re
+import unicodedata
+from functools import lru_cache
+
+LANGUAGE_PREFIX_CODES = frozenset([
+    "tr", "us", "uk", "fr", "de", "it", "es", "pt", "nl", "be",
+    "ru", "gr", "az", "ch", "at", "pl", "ro", "bg", "hu", "cz",
+    "sk", "al", "rs", "hr", "ba", "mk", "se", "no", "dk", "fi",
+    "ie", "ca", "au", "nz", "br", "ar", "mx", "ae", "sa", "eg",
+    "tur", "usa", "gbr", "fra", "deu", "ita", "esp", "prt", "nld", "bel",
+    "rus", "grc", "aze", "che", "aut", "pol", "rou", "bgr", "hun", "cze"
+])
+_LANGUAGE_PREFIX_RE = re.compile(r'^([a-z]{2,3})[| \-_]+(.*)')
+_BRACKETED_RE = re.compile(r'(\(.*\))|(\[.*?\])|(".*?")|(\=.*)')
+_QUALITY_TAG_RE = re.compile(r'\b(HD|FHD|UHD|4K|8K|SD)\b', re.IGNORECASE)
+_SYMBOLS_RE = re.compile(r'[^\w\d\s.]+')
+_WHITESPACE_RE = re.compile(r'\s+')
+
+def _normalize(text):
+    name = text.lower().strip()
+    match = _LANGUAGE_PREFIX_RE.match(name)
+    if match and match.group(1) in LANGUAGE_PREFIX_CODES:
+        name = f"{match.group(2)}.{match.group(1)}"
+    if not name.isascii():
+        name = unicodedata.normalize("NFKD", name)
+        name = "".join([c for c in name if not unicodedata.combining(c)])
+    name = _BRACKETED_RE.sub(' ', name)
+    name = _QUALITY_TAG_RE.sub(' ', name)
+    name = _SYMBOLS_RE.sub(' ', name)
+    name = _WHITESPACE_RE.sub('', name)
+    return name.strip().lower()
+
+@lru_cache(maxsize=65536)
+def _cached_normalize(text):
+    return _normalize(text)
+
+def clean_key(text):
+    """
+    Normalizes a channel, logo or EPG name into a comparison key:
+    a known language prefix becomes a '.xx' suffix, accents, bracketed
+    parts, quality tags, symbols and whitespace are removed.
+    Results are memoized, so repeated names are only normalized once.
+    """
+    if not text:
+        return None
+    return _cached_normalize(text)
+
+def clean_keys(texts):
+    """
+    Normalizes a whole list of names in one pass and returns the keys in the
+    same order. Duplicates inside the batch are normalized once and bypass
+    the shared LRU cache, so a large batch does not evict everything else.
+    """
+    seen = {}
+    keys = []
+    for text in texts:
+        if not text:
+            keys.append(None)
+            continue
+        key = seen.get(text)
+        if key is None:
+            key = _normalize(text)
+            seen[text] = key
+        keys.append(key)
+    return keys
@@ -0,0 +1,161 @@
+# utils/priority_pool.py
+
+import heapq
+import itertools
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+
+PRIORITY_VISIBLE = 0
+PRIORITY_NORMAL = 1
+PRIORITY_PREFETCH = 2
+PRIORITY_NAMES = {PRIORITY_VISIBLE: "visible", PRIORITY_NORMAL: "normal", PRIORITY_PREFETCH: "prefetch"}
+WAIT_SAMPLE_COUNT = 512
+
+class PriorityThreadPool:
+    """
+    Drop-in replacement for ThreadPoolExecutor whose queue is ordered by
+    priority (lower runs first, FIFO within a priority) instead of by
+    submission. Jobs that have not started yet can be cancelled through
+    their Future or moved to another priority with set_priority().
+    stats() reports the queue depth per priority and how long jobs waited.
+    """
+
+    def __init__(self, max_workers=8, thread_name_prefix="PriorityPool"):
+        self.max_workers = max_workers
+        self.thread_name_prefix = thread_name_prefix
+        self._heap = []
+        self._jobs = {}
+        self._counter = itertools.count()
+        self._condition = threading.Condition()
+        self._threads = []
+        self._idle_workers = 0
+        self._shutdown = False
+        self._running = 0
+        self._completed = 0
+        self._cancelled = 0
+        self._waits = {priority: deque(maxlen=WAIT_SAMPLE_COUNT) for priority in PRIORITY_NAMES}
+
+    def submit(self, fn, *args, **kwargs):
+        return self.submit_with_priority(PRIORITY_NORMAL, fn, *args, **kwargs)
+
+    def submit_with_priority(self, priority, fn, *args, **kwargs):
+        future = Future()
+        with self._condition:
+            if self._shutdown:
+                raise RuntimeError("cannot schedule new futures after shutdown")
+            job = [priority, next(self._counter), future, fn, args, kwargs, time.monotonic()]
+            self._jobs[future] = job
+            heapq.heappush(self._heap, job)
+            if self._idle_workers:
+                self._condition.notify()
+            elif len(self._threads) < self.max_workers:
+                self._start_worker()
+        future.add_done_callback(self._on_future_done)
+        return future
+
+    def set_priority(self, future, priority):
+        """Moves a queued job to another priority. Returns False once it has started."""
+        with self._condition:
+            job = self._jobs.get(future)
+            if job is None:
+                return False
+            if job[0] != priority:
+                job[2] = None
+                moved = [priority, next(self._counter), future, job[3], job[4], job[5], job[6]]
+                self._jobs[future] = moved
+                heapq.heappush(self._heap, moved)
+            return True
+
+    def _on_future_done(self, future):
+        if not future.cancelled():
+            return
+        with self._condition:
+            job = self._jobs.pop(future, None)
+            if job is not None:
+                job[2] = None
+                self._cancelled += 1
+
+    def _start_worker(self):
+        thread = threading.Thread(
+            target=self._worker,
+            name=f"{self.thread_name_prefix}_{len(self._threads)}",
+            daemon=True
+        )
+        self._threads.append(thread)
+        thread.start()
+
+    def _next_job(self):
+        """Blocks until a live job is queued; returns None on shutdown. Stale heap entries are skipped."""
+        with self._condition:
+            while True:
+                while self._heap:
+                    job = heapq.heappop(self._heap)
+                    future = job[2]
+                    if future is None or self._jobs.get(future) is not job:
+                        continue
+                    del self._jobs[future]
+                    self._running += 1
+                    self._waits.setdefault(job[0], deque(maxlen=WAIT_SAMPLE_COUNT)).append(time.monotonic() - job[6])
+                    return job
+                if self._shutdown:
+                    return None
+                self._idle_workers += 1
+                self._condition.wait()
+                self._idle_workers -= 1
+
+    def _worker(self):
+        while True:
+            job = self._next_job()
+            if job is None:
+                return
+            _priority, _seq, future, fn, args, kwargs, _queued_at = job
+            if future.set_running_or_notify_cancel():
+                try:
+                    result = fn(*args, **kwargs)
+                except BaseException as e:
+                    future.set_exception(e)
+                else:
+                    future.set_result(result)
+            with self._condition:
+                self._running -= 1
+                self._completed += 1
+
+    def shutdown(self, wait=True, cancel_futures=False):
+        with self._condition:
+            self._shutdown = True
+            pending = list(self._jobs) if cancel_futures else []
+            self._condition.notify_all()
+        for future in pending:
+            future.cancel()
+        if wait:
+            for thread in list(self._threads):
+                thread.join()
+
+    def stats(self):
+        """Queue depth per priority, running/completed/cancelled counters and wait times in ms."""
+        with self._condition:
+            queued = {name: 0 for name in PRIORITY_NAMES.values()}
+            for job in self._jobs.values():
+                name = PRIORITY_NAMES.get(job[0], str(job[0]))
+                queued[name] = queued.get(name, 0) + 1
+            waits = {}
+            for priority, samples in self._waits.items():
+                if not samples:
+                    continue
+                ordered = sorted(samples)
+                waits[PRIORITY_NAMES.get(priority, str(priority))] = {
+                    "avg_ms": round(sum(ordered) / len(ordered) * 1000, 1),
+                    "p95_ms": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))] * 1000, 1),
+                    "max_ms": round(ordered[-1] * 1000, 1),
+                }
+            return {
+                "queued": queued,
+                "queue_depth": len(self._jobs),
+                "running": self._running,
+                "workers": len(self._threads),
+                "completed": self._completed,
+                "cancelled": self._cancelled,
+                "wait": waits,
+            }
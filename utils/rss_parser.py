@@ -1,8 +1,9 @@
-import urllib.request
 import xml.etree.ElementTree as ET
 import logging
-import ssl
+import warnings
+from urllib3.exceptions import InsecureRequestWarning
 from core.config import VERSION 
+from utils import http_client
 
 def parse_podcast_feed(rss_url):
     """
@@ -10,12 +11,12 @@ def parse_podcast_feed(rss_url):
     Returns a dictionary (dict).
     """
     try:
-        ctx = ssl.create_default_context()
-        ctx.check_hostname = False
-        ctx.verify_mode = ssl.CERT_NONE
-        req = urllib.request.Request(rss_url, headers={'User-Agent': f'EngPlayer/{VERSION}'})       
-        with urllib.request.urlopen(req, context=ctx, timeout=10) as response:
-            xml_data = response.read()
+        with warnings.catch_warnings():
+            # Feeds are fetched without certificate checks (as before); don't warn on every refresh.
+            warnings.simplefilter("ignore", InsecureRequestWarning)
+            response = http_client.get(rss_url, headers={'User-Agent': f'EngPlayer/{VERSION}'}, timeout=10, verify=False)
+        response.raise_for_status()
+        xml_data = response.content
         root = ET.fromstring(xml_data)
         channel = root.find("channel")       
         if channel is None:
@@ -6,6 +6,8 @@ import database
 import gettext
 _ = gettext.gettext
 
+SUBTITLE_STYLE_KEYS = ("subtitle_font", "subtitle_color", "subtitle_bgcolor", "subtitle_bgopacity")
+
 def parse_srt(srt_content):
     subs = []
     try:
@@ -50,6 +52,8 @@ class SubtitleManager:
         self.last_markup = None
         self.delay_ms = 0
         self._debug_counter = 0
+        self._style = None
+        self._config_listener_id = None
 
     def load_from_file(self, filepath):
         self.clear()
@@ -89,6 +93,11 @@ class SubtitleManager:
         self.stop()
         if self.subtitles:
             logging.debug("Starting SubtitleManager timer.")
+            if self._config_listener_id is None:
+                self._config_listener_id = database.connect_config_changed(self._on_style_changed, SUBTITLE_STYLE_KEYS)
+                # Changes made while stopped were not heard; rebuild the style.
+                self._style = None
+                self.last_markup = None
             self.timer_id = GLib.timeout_add(100, self._update)
         else:
              logging.warning("Subtitle list is empty, timer not started.")
@@ -98,6 +107,30 @@ class SubtitleManager:
             logging.debug("Stopping SubtitleManager timer.")
             GLib.source_remove(self.timer_id)
             self.timer_id = None
+        if self._config_listener_id is not None:
+            database.disconnect_config_changed(self._config_listener_id)
+            self._config_listener_id = None
+
+    def _on_style_changed(self, key, value):
+        """Subtitle settings changed: rebuild the style on the next tick."""
+        self._style = None
+        self.last_markup = None
+
+    def _get_style(self):
+        """Returns (font_desc, foreground hex, background hex), built once per settings change."""
+        if self._style is None:
+            font_desc = database.get_config_value("subtitle_font") or "Sans 12"
+            color_str = database.get_config_value("subtitle_color") or "rgba(255,255,255,1.0)"
+            bgcolor_str = database.get_config_value("subtitle_bgcolor") or "rgba(0,0,0,0.6)"
+            bgopacity_str = database.get_config_value("subtitle_bgopacity") or "0.6"
+            fg_rgba = Gdk.RGBA(); fg_rgba.parse(color_str)
+            font_color_hex = f'#{int(fg_rgba.red*255):02x}{int(fg_rgba.green*255):02x}{int(fg_rgba.blue*255):02x}'
+            bg_rgba = Gdk.RGBA(); bg_rgba.parse(bgcolor_str)
+            try: bg_alpha_val = max(0.1, min(1.0, float(bgopacity_str)))
+            except ValueError: bg_alpha_val = 0.6
+            bg_color_hex = f'#{int(bg_rgba.red*255):02x}{int(bg_rgba.green*255):02x}{int(bg_rgba.blue*255):02x}{int(bg_alpha_val*255):02x}'
+            self._style = (font_desc, font_color_hex, bg_color_hex)
+        return self._style
 
     def _update(self):
         self._debug_counter = (self._debug_counter + 1) % 10
@@ -123,16 +156,7 @@ class SubtitleManager:
             logging.debug(f"  -> Sub Not Found for AdjustedPos={adjusted_pos_ms:.0f}ms")
         if found_sub:
             try:
-                font_desc = database.get_config_value("subtitle_font") or "Sans 12"
-                color_str = database.get_config_value("subtitle_color") or "rgba(255,255,255,1.0)"
-                bgcolor_str = database.get_config_value("subtitle_bgcolor") or "rgba(0,0,0,0.6)"
-                bgopacity_str = database.get_config_value("subtitle_bgopacity") or "0.6"
-                fg_rgba = Gdk.RGBA(); fg_rgba.parse(color_str)
-                font_color_hex = f'#{int(fg_rgba.red*255):02x}{int(fg_rgba.green*255):02x}{int(fg_rgba.blue*255):02x}'
-                bg_rgba = Gdk.RGBA(); bg_rgba.parse(bgcolor_str)
-                try: bg_alpha_val = max(0.1, min(1.0, float(bgopacity_str)))
-                except ValueError: bg_alpha_val = 0.6
-                bg_color_hex = f'#{int(bg_rgba.red*255):02x}{int(bg_rgba.green*255):02x}{int(bg_rgba.blue*255):02x}{int(bg_alpha_val*255):02x}'
+                font_desc, font_color_hex, bg_color_hex = self._get_style()
                 escaped_text = GLib.markup_escape_text(found_sub['text'])
                 markup = (f"<span font_desc='{font_desc}' "
                           f"foreground='{font_color_hex}' "
@@ -2,6 +2,7 @@
 
 import requests
 import logging
+from utils import http_client
 import os
 from gi.repository import GLib
 import zipfile
@@ -57,7 +58,7 @@ def search_subtitles_online(file_path, title_for_search, api_key, callback_on_ma
         logging.info(f"Parameter(s) being used for search: {search_mode_log}")
         logging.info(f"Languages being searched for subtitles: {params['languages']}")
         logging.debug(f"Sending OpenSubtitles API request. URL: {API_SEARCH_URL}, Parameters: {params}")
-        response = requests.get(API_SEARCH_URL, headers=search_headers, params=params, timeout=20)
+        response = http_client.get(API_SEARCH_URL, headers=search_headers, params=params, timeout=20)
         response.raise_for_status()
         data = response.json()
         logging.debug(f"OpenSubtitles API response received: {len(data.get('data', []))} results found.")
@@ -128,7 +129,7 @@ def download_subtitle_file(file_id, api_key, callback_on_main_thread):
         download_headers['Api-Key'] = api_key
         payload = {'file_id': file_id}
         logging.debug(f"Requesting download link: URL={API_DOWNLOAD_URL}, Payload={payload}")
-        response_link = requests.post(API_DOWNLOAD_URL, headers=download_headers, json=payload, timeout=15)
+        response_link = http_client.post(API_DOWNLOAD_URL, headers=download_headers, json=payload, timeout=15)
         response_link.raise_for_status()
         link_data = response_link.json()
         download_link = link_data.get('link')
@@ -140,10 +141,10 @@ def download_subtitle_file(file_id, api_key, callback_on_main_thread):
             error = _("Could not retrieve subtitle download link.")
             raise ValueError("No download link found")
         logging.info(f"Download link received: {download_link}")
-        response_file = requests.get(download_link, headers={'User-Agent': HEADERS['User-Agent']}, timeout=30, stream=True)
-        response_file.raise_for_status()
-        content_type = response_file.headers.get('Content-Type', '').lower()
-        content = response_file.content
+        with http_client.get(download_link, headers={'User-Agent': HEADERS['User-Agent']}, timeout=30, stream=True) as response_file:
+            response_file.raise_for_status()
+            content_type = response_file.headers.get('Content-Type', '').lower()
+            content = response_file.content
         logging.debug(f"File downloaded. Content-Type: {content_type}, Size: {len(content)} bytes")
         srt_content = None
         if 'zip' in content_type or download_link.lower().endswith('.zip'):